@@ -0,0 +1,157 @@
+import json
+
+from django.core.management import BaseCommand, CommandError
+from django.test.utils import (
+    override_settings,
+    setup_databases,
+    teardown_databases,
+)
+
+from benchmarks.micro import MICROBENCHMARKS, run_microbenchmarks
+from benchmarks.runner import SCENARIOS, compare, run_scenarios, seed, unseed
+
+
+class Command(BaseCommand):
+    """Django command to benchmark the API against a seeded test database"""
+
+    def add_arguments(self, parser):
+        parser.add_argument("--books", type=int, default=1000)
+        parser.add_argument("--users", type=int, default=20)
+        parser.add_argument("--borrowings", type=int, default=10000)
+        parser.add_argument(
+            "--requests", type=int, default=50, help="Requests per thread"
+        )
+        parser.add_argument("--concurrency", type=int, default=4)
+        parser.add_argument(
+            "--endpoints",
+            nargs="+",
+            choices=SCENARIOS,
+            default=list(SCENARIOS),
+        )
+        parser.add_argument(
+            "--micro",
+            nargs="*",
+            choices=MICROBENCHMARKS,
+            help="Also run microbenchmarks (all of them without names)",
+        )
+        parser.add_argument("--save-baseline", metavar="PATH")
+        parser.add_argument(
+            "--compare",
+            metavar="PATH",
+            help="Fail when results regress against this baseline file",
+        )
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=0.25,
+            help="Allowed latency slowdown against the baseline (0.25 = 25%%)",
+        )
+        parser.add_argument("--keepdb", action="store_true")
+        parser.add_argument(
+            "--base-url",
+            help="Send requests to the server running at this URL, which must "
+            "share the configured database and DJANGO_SECRET_KEY",
+        )
+        parser.add_argument(
+            "--seed",
+            action="store_true",
+            help="Confirm that the dataset may be seeded into (and removed "
+            "from) the configured database, required with --base-url",
+        )
+
+    def handle(self, *args, **options):
+        if options["base_url"] and not options["seed"]:
+            raise CommandError(
+                "--base-url seeds the configured database instead of a test "
+                "one, pass --seed if it is a disposable database"
+            )
+
+        if options["base_url"]:
+            report = self.run_benchmark(options)
+        else:
+            old_config = setup_databases(
+                verbosity=0, interactive=False, keepdb=options["keepdb"]
+            )
+
+            try:
+                with override_settings(
+                    ALLOWED_HOSTS=["testserver"],
+                    DISABLE_THROTTLING=True,
+                    TELEGRAM_TRANSPORT="telegram_helper.transports.FakeTransport",
+                ):
+                    report = self.run_benchmark(options)
+            finally:
+                teardown_databases(old_config, verbosity=0, keepdb=options["keepdb"])
+
+        self.print_report(report)
+
+        if options["save_baseline"]:
+            with open(options["save_baseline"], "w") as file:
+                json.dump(report, file, indent=2)
+                file.write("\n")
+
+        if options["compare"]:
+            with open(options["compare"]) as file:
+                baseline = json.load(file)
+
+            if baseline.get("settings") != report["settings"]:
+                self.stdout.write(
+                    self.style.WARNING(
+                        f"Baseline was recorded with {baseline.get('settings')}"
+                    )
+                )
+
+            regressions = compare(report, baseline, options["tolerance"])
+            if regressions:
+                raise CommandError("Regressions found:\n" + "\n".join(regressions))
+
+            self.stdout.write(self.style.SUCCESS("No regressions"))
+
+    def run_benchmark(self, options) -> dict:
+        self.stdout.write("Seeding...")
+        dataset = seed(options["books"], options["users"], options["borrowings"])
+
+        self.stdout.write("Running endpoints...")
+        try:
+            endpoints = run_scenarios(
+                dataset,
+                options["endpoints"],
+                options["requests"],
+                options["concurrency"],
+                options["base_url"],
+            )
+        finally:
+            if options["base_url"]:
+                unseed(dataset)
+
+        report = {
+            "settings": {
+                name: options[name]
+                for name in ("books", "users", "borrowings", "requests", "concurrency")
+            },
+            "endpoints": endpoints,
+        }
+
+        if options["micro"] is not None:
+            self.stdout.write("Running microbenchmarks...")
+            report["micro"] = run_microbenchmarks(options["micro"] or None)
+
+        return report
+
+    def print_report(self, report: dict):
+        self.stdout.write(
+            f"{'endpoint':<28}{'requests':>9}{'errors':>8}{'p50 ms':>10}"
+            f"{'p95 ms':>10}{'p99 ms':>10}{'req/s':>9}{'queries':>9}"
+        )
+        for name, result in report["endpoints"].items():
+            self.stdout.write(
+                f"{name:<28}{result['requests']:>9}{result['errors']:>8}"
+                f"{result['p50_ms']:>10}{result['p95_ms']:>10}{result['p99_ms']:>10}"
+                f"{result['throughput']:>9}{result['queries'] or '-':>9}"
+            )
+
+        for name, result in report.get("micro", {}).items():
+            self.stdout.write(
+                f"{name:<32}mean {result['mean_us']} us, "
+                f"median {result['median_us']} us ({result['rounds']} rounds)"
+            )
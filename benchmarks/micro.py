@@ -0,0 +1,114 @@
+"""Microbenchmarks of the CPU-bound parts of the list endpoints.
+
+Each benchmark is a setup function that prepares its data and returns
+the callable to time, in the spirit of pytest-benchmark.
+"""
+import statistics
+import time
+from dataclasses import asdict, dataclass
+
+from rest_framework.renderers import JSONRenderer
+
+from book.models import Book
+from book.serializers import BookSerializer
+from borrowing.models import Borrowing
+from borrowing.serializers import BorrowingListSerializer
+from library_api_service.fast_list import get_values_serializer
+from library_api_service.renderers import ORJSONRenderer
+
+MICROBENCHMARKS = {}
+
+PAGE = 100
+
+
+@dataclass
+class MicroResult:
+    rounds: int
+    min_us: float
+    mean_us: float
+    median_us: float
+    stddev_us: float
+
+
+def microbenchmark(name: str):
+    def decorator(setup):
+        MICROBENCHMARKS[name] = setup
+        return setup
+
+    return decorator
+
+
+def run_microbenchmark(setup, min_rounds=20, max_rounds=1000, min_time=0.5) -> dict:
+    func = setup()
+    func()
+
+    timings = []
+    start = time.perf_counter()
+    while len(timings) < max_rounds and (
+        len(timings) < min_rounds or time.perf_counter() - start < min_time
+    ):
+        round_start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - round_start) * 1_000_000)
+
+    return asdict(
+        MicroResult(
+            rounds=len(timings),
+            min_us=round(min(timings), 1),
+            mean_us=round(statistics.mean(timings), 1),
+            median_us=round(statistics.median(timings), 1),
+            stddev_us=round(statistics.stdev(timings), 1),
+        )
+    )
+
+
+def borrowings_page() -> list:
+    return list(Borrowing.objects.select_related("book")[:PAGE])
+
+
+@microbenchmark("borrowing-list-serializer")
+def borrowing_list_serializer():
+    borrowings = borrowings_page()
+    return lambda: BorrowingListSerializer(borrowings, many=True).data
+
+
+@microbenchmark("borrowing-list-values")
+def borrowing_list_values():
+    serializer = get_values_serializer(BorrowingListSerializer)
+    rows = list(serializer.values(Borrowing.objects.all()[:PAGE]))
+    return lambda: serializer.to_representation(rows)
+
+
+@microbenchmark("borrowing-list-render")
+def borrowing_list_render():
+    data = BorrowingListSerializer(borrowings_page(), many=True).data
+    renderer = JSONRenderer()
+    return lambda: renderer.render(data)
+
+
+@microbenchmark("borrowing-list-orjson-render")
+def borrowing_list_orjson_render():
+    data = BorrowingListSerializer(borrowings_page(), many=True).data
+    renderer = ORJSONRenderer()
+    return lambda: renderer.render(data)
+
+
+@microbenchmark("book-serializer")
+def book_serializer():
+    books = list(Book.objects.all()[:PAGE])
+    return lambda: BookSerializer(books, many=True).data
+
+
+@microbenchmark("book-values")
+def book_values():
+    serializer = get_values_serializer(BookSerializer)
+    rows = list(serializer.values(Book.objects.all()[:PAGE]))
+    return lambda: serializer.to_representation(rows)
+
+
+def run_microbenchmarks(names=None) -> dict:
+    return {
+        name: run_microbenchmark(setup)
+        for name, setup in MICROBENCHMARKS.items()
+        if names is None or name in names
+    }
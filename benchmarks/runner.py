@@ -0,0 +1,338 @@
+"""Seed a dataset and drive the API endpoints concurrently.
+
+By default requests go through the full Django/DRF stack in process with
+``django.test.Client`` from a pool of threads, so the numbers measure the
+application (views, serializers, queries) rather than a web server.
+Given a base URL they are sent over HTTP to a running server instead,
+which measures the server setup as well (queries are not counted then).
+"""
+import datetime
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+
+import requests
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import connection
+from django.test import Client
+from django.urls import reverse
+
+from book.models import Book
+from borrowing.models import Borrowing
+from library_api_service.middleware import QueryCounter
+from user.serializers import TokenObtainPairWithClaimsSerializer
+
+PASSWORD = "benchmark-password"
+EMAIL = "benchmark{}@example.com"
+
+
+@dataclass
+class Dataset:
+    user_ids: list
+    book_ids: list
+    borrowing_ids: dict
+
+
+@dataclass
+class EndpointResult:
+    requests: int = 0
+    errors: int = 0
+    p50_ms: float = 0.0
+    p95_ms: float = 0.0
+    p99_ms: float = 0.0
+    throughput: float = 0.0
+    queries: float | None = 0.0
+
+
+class HttpClient:
+    """The part of the test client API used by the scenarios, over HTTP"""
+
+    def __init__(self, base_url: str, **headers):
+        self.base_url = base_url.rstrip("/")
+        self.session = requests.Session()
+        self.session.headers.update(headers)
+
+    def get(self, path: str, data: dict = None):
+        return self.session.get(self.base_url + path, params=data)
+
+    def post(self, path: str, data: dict = None, content_type: str = None):
+        return self.session.post(self.base_url + path, json=data)
+
+
+@dataclass
+class WorkerState:
+    client: Client | HttpClient
+    user_id: int
+    created_ids: list = field(default_factory=list)
+
+
+def seed(books: int, users: int, borrowings: int) -> Dataset:
+    """Insert the dataset with bulk_create, hashing the password only once"""
+    password = make_password(PASSWORD)
+    created_users = get_user_model().objects.bulk_create(
+        get_user_model()(email=EMAIL.format(number), password=password)
+        for number in range(users)
+    )
+    created_books = Book.objects.bulk_create(
+        Book(
+            title=f"Benchmark book {number}",
+            author=f"Author {number % 100}",
+            cover="hard" if number % 2 else "soft",
+            inventory=1_000_000,
+            daily_fee="0.50",
+        )
+        for number in range(books)
+    )
+
+    today = datetime.date.today()
+    created_borrowings = Borrowing.objects.bulk_create(
+        Borrowing(
+            expected_return_date=today + datetime.timedelta(days=14),
+            actual_return_date=today if number % 2 else None,
+            book=created_books[number % books],
+            user=created_users[number % users],
+        )
+        for number in range(borrowings)
+    )
+
+    borrowing_ids = {}
+    for borrowing in created_borrowings:
+        borrowing_ids.setdefault(borrowing.user_id, []).append(borrowing.id)
+
+    return Dataset(
+        user_ids=[user.id for user in created_users],
+        book_ids=[book.id for book in created_books],
+        borrowing_ids=borrowing_ids,
+    )
+
+
+def unseed(dataset: Dataset):
+    """Delete a dataset seeded outside a test database, with its borrowings"""
+    Book.objects.filter(id__in=dataset.book_ids).delete()
+    get_user_model().objects.filter(id__in=dataset.user_ids).delete()
+
+
+def obtain_token(state, dataset, number):
+    email = EMAIL.format(dataset.user_ids.index(state.user_id))
+    return state.client.post(
+        reverse("user:token_obtain_pair"),
+        {"email": email, "password": PASSWORD},
+        content_type="application/json",
+    )
+
+
+def list_books(state, dataset, number):
+    return state.client.get(reverse("book:book-list"))
+
+
+def retrieve_book(state, dataset, number):
+    book_id = dataset.book_ids[number % len(dataset.book_ids)]
+    return state.client.get(reverse("book:book-detail", args=[book_id]))
+
+
+def list_borrowings(state, dataset, number):
+    return state.client.get(reverse("borrowing:borrowing-list"))
+
+
+def list_borrowings_large(state, dataset, number):
+    return state.client.get(reverse("borrowing:borrowing-list"), {"page_size": 100})
+
+
+def retrieve_borrowing(state, dataset, number):
+    borrowing_ids = dataset.borrowing_ids[state.user_id]
+    borrowing_id = borrowing_ids[number % len(borrowing_ids)]
+    return state.client.get(reverse("borrowing:borrowing-detail", args=[borrowing_id]))
+
+
+def retrieve_borrowing_sparse(state, dataset, number):
+    borrowing_ids = dataset.borrowing_ids[state.user_id]
+    borrowing_id = borrowing_ids[number % len(borrowing_ids)]
+    return state.client.get(
+        reverse("borrowing:borrowing-detail", args=[borrowing_id]),
+        {"fields": "id,borrow_date,expected_return_date"},
+    )
+
+
+def create_borrowing(state, dataset, number):
+    book_id = dataset.book_ids[number % len(dataset.book_ids)]
+    response = state.client.post(
+        reverse("borrowing:borrowing-list"),
+        {
+            "book": book_id,
+            "expected_return_date": str(
+                datetime.date.today() + datetime.timedelta(days=14)
+            ),
+        },
+        content_type="application/json",
+    )
+
+    if response.status_code == 201:
+        state.created_ids.append(response.json()["id"])
+
+    return response
+
+
+def return_borrowing(state, dataset, number):
+    borrowing_id = state.created_ids.pop()
+    return state.client.post(
+        reverse("borrowing:borrowing-return-borrowing", args=[borrowing_id])
+    )
+
+
+def list_books_async(state, dataset, number):
+    return state.client.get(reverse("async:book-list"))
+
+
+def retrieve_book_async(state, dataset, number):
+    book_id = dataset.book_ids[number % len(dataset.book_ids)]
+    return state.client.get(reverse("async:book-detail", args=[book_id]))
+
+
+def list_borrowings_async(state, dataset, number):
+    return state.client.get(reverse("async:borrowing-list"))
+
+
+def retrieve_borrowing_async(state, dataset, number):
+    borrowing_ids = dataset.borrowing_ids[state.user_id]
+    borrowing_id = borrowing_ids[number % len(borrowing_ids)]
+    return state.client.get(reverse("async:borrowing-detail", args=[borrowing_id]))
+
+
+SCENARIOS = {
+    "token": obtain_token,
+    "books-list": list_books,
+    "books-retrieve": retrieve_book,
+    "borrowings-list": list_borrowings,
+    "borrowings-list-large": list_borrowings_large,
+    "borrowings-retrieve": retrieve_borrowing,
+    "borrowings-retrieve-sparse": retrieve_borrowing_sparse,
+    "borrowings-create": create_borrowing,
+    "borrowings-return": return_borrowing,
+    "books-list-async": list_books_async,
+    "books-retrieve-async": retrieve_book_async,
+    "borrowings-list-async": list_borrowings_async,
+    "borrowings-retrieve-async": retrieve_borrowing_async,
+}
+
+
+def percentile(values: list, percent: int) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method="inclusive")[percent - 1]
+
+
+def run_worker(scenario, state, dataset, request_count, barrier):
+    latencies = []
+    queries = []
+    errors = 0
+    barrier.wait()
+
+    try:
+        for number in range(request_count):
+            counter = QueryCounter()
+            start = time.perf_counter()
+
+            with connection.execute_wrapper(counter):
+                try:
+                    response = scenario(state, dataset, number)
+                except IndexError:
+                    response = None
+
+            latencies.append(time.perf_counter() - start)
+            queries.append(counter.count)
+            if response is None or response.status_code >= 400:
+                errors += 1
+    finally:
+        connection.close()
+
+    return latencies, queries, errors
+
+
+def run_scenarios(
+    dataset: Dataset,
+    names,
+    request_count: int,
+    concurrency: int,
+    base_url: str = None,
+) -> dict:
+    """Run each scenario with ``concurrency`` threads, one user per thread"""
+    states = []
+    for number in range(concurrency):
+        user_id = dataset.user_ids[number % len(dataset.user_ids)]
+        token = TokenObtainPairWithClaimsSerializer.get_token(
+            get_user_model()(id=user_id)
+        ).access_token
+        if base_url:
+            client = HttpClient(base_url, Authorize=f"Bearer {token}")
+        else:
+            client = Client(HTTP_AUTHORIZE=f"Bearer {token}")
+        states.append(WorkerState(client=client, user_id=user_id))
+
+    results = {}
+    for name in names:
+        barrier = threading.Barrier(concurrency)
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            start = time.perf_counter()
+            futures = [
+                executor.submit(
+                    run_worker,
+                    SCENARIOS[name],
+                    state,
+                    dataset,
+                    request_count,
+                    barrier,
+                )
+                for state in states
+            ]
+            outcomes = [future.result() for future in futures]
+            elapsed = time.perf_counter() - start
+
+        latencies = [value for outcome in outcomes for value in outcome[0]]
+        queries = [value for outcome in outcomes for value in outcome[1]]
+        results[name] = EndpointResult(
+            requests=len(latencies),
+            errors=sum(outcome[2] for outcome in outcomes),
+            p50_ms=round(percentile(latencies, 50) * 1000, 3),
+            p95_ms=round(percentile(latencies, 95) * 1000, 3),
+            p99_ms=round(percentile(latencies, 99) * 1000, 3),
+            throughput=round(len(latencies) / elapsed, 1),
+            queries=None if base_url else round(statistics.mean(queries), 2),
+        )
+
+    return {name: asdict(result) for name, result in results.items()}
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> list:
+    """List regressions: slower p95 beyond ``tolerance`` or more queries"""
+    regressions = []
+
+    for name, expected in baseline.get("endpoints", {}).items():
+        actual = report["endpoints"].get(name)
+        if actual is None:
+            continue
+
+        if None not in (actual["queries"], expected["queries"]) and (
+            actual["queries"] > expected["queries"]
+        ):
+            regressions.append(
+                f"{name}: {actual['queries']} queries per request, "
+                f"baseline {expected['queries']}"
+            )
+        if actual["p95_ms"] > expected["p95_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: p95 {actual['p95_ms']} ms, baseline {expected['p95_ms']} ms"
+            )
+
+    for name, expected in baseline.get("micro", {}).items():
+        actual = report.get("micro", {}).get(name)
+        if actual and actual["mean_us"] > expected["mean_us"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: mean {actual['mean_us']} us, "
+                f"baseline {expected['mean_us']} us"
+            )
+
+    return regressions
@@ -0,0 +1,60 @@
+from django.core.management import CommandError, call_command
+from django.test import TransactionTestCase, override_settings
+
+from benchmarks.micro import run_microbenchmarks
+from benchmarks.runner import compare, run_scenarios, seed
+from book.models import Book
+
+
+@override_settings(TELEGRAM_TRANSPORT="telegram_helper.transports.FakeTransport")
+class BenchmarkRunnerTests(TransactionTestCase):
+    def test_run_scenarios(self):
+        dataset = seed(books=5, users=2, borrowings=10)
+
+        endpoints = run_scenarios(
+            dataset,
+            ["books-list", "borrowings-list", "borrowings-create", "borrowings-return"],
+            request_count=3,
+            concurrency=2,
+        )
+
+        self.assertEqual(
+            {name: result["requests"] for name, result in endpoints.items()},
+            {
+                "books-list": 6,
+                "borrowings-list": 6,
+                "borrowings-create": 6,
+                "borrowings-return": 6,
+            },
+        )
+        self.assertTrue(all(result["errors"] == 0 for result in endpoints.values()))
+        self.assertGreater(endpoints["borrowings-list"]["queries"], 0)
+
+    def test_run_microbenchmarks(self):
+        seed(books=5, users=2, borrowings=10)
+
+        micro = run_microbenchmarks(["borrowing-list-serializer"])
+
+        self.assertGreater(micro["borrowing-list-serializer"]["rounds"], 0)
+
+    def test_compare_reports_regressions(self):
+        baseline = {
+            "endpoints": {"books-list": {"p95_ms": 10.0, "queries": 1}},
+            "micro": {"book-serializer": {"mean_us": 100.0}},
+        }
+        report = {
+            "endpoints": {"books-list": {"p95_ms": 11.0, "queries": 2}},
+            "micro": {"book-serializer": {"mean_us": 200.0}},
+        }
+
+        regressions = compare(report, baseline, tolerance=0.25)
+
+        self.assertEqual(len(regressions), 2)
+        self.assertIn("queries", regressions[0])
+        self.assertIn("book-serializer", regressions[1])
+
+    def test_base_url_requires_seed_confirmation(self):
+        with self.assertRaisesMessage(CommandError, "--seed"):
+            call_command("benchmark", base_url="http://127.0.0.1:8000")
+
+        self.assertFalse(Book.objects.exists())
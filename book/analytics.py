@@ -0,0 +1,51 @@
+import datetime
+
+from django.db.models import Sum
+
+from book.models import BookDailyStat
+
+
+def get_date_range(days: int, today: datetime.date = None):
+    """Last ``days`` days, today included"""
+    end = today or datetime.date.today()
+    return end - datetime.timedelta(days=days - 1), end
+
+
+def top_borrowed(start: datetime.date, end: datetime.date, limit: int) -> list:
+    """Most borrowed books between ``start`` and ``end`` from the daily rollups"""
+    return list(
+        BookDailyStat.objects.filter(date__range=(start, end))
+        .values("book_id", "book__title", "book__author")
+        .annotate(borrowed=Sum("borrowed"))
+        .filter(borrowed__gt=0)
+        .order_by("-borrowed", "book_id")[:limit]
+    )
+
+
+def daily_series(start: datetime.date, end: datetime.date, book_id: int = None) -> list:
+    """Borrows and returns per day, days without activity included"""
+    stats = BookDailyStat.objects.filter(date__range=(start, end))
+    if book_id:
+        stats = stats.filter(book_id=book_id)
+
+    totals = {
+        row["date"]: row
+        for row in stats.values("date")
+        .annotate(borrowed=Sum("borrowed"), returned=Sum("returned"))
+        .order_by("date")
+    }
+
+    series = []
+    day = start
+    while day <= end:
+        row = totals.get(day, {})
+        series.append(
+            {
+                "date": day,
+                "borrowed": row.get("borrowed", 0),
+                "returned": row.get("returned", 0),
+            }
+        )
+        day += datetime.timedelta(days=1)
+
+    return series
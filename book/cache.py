@@ -0,0 +1,121 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+
+from library_api_service.metrics import registry
+
+VERSION_KEY = "book:catalogue-version"
+VALIDATOR_HEADERS = ("ETag", "Last-Modified")
+
+
+def get_cache():
+    return caches[settings.BOOK_CACHE_ALIAS]
+
+
+def increment(key: str) -> int:
+    cache = get_cache()
+    cache.add(key, 0, timeout=None)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # The key was evicted between add() and incr()
+        cache.set(key, 1, timeout=None)
+        return 1
+
+
+def get_catalogue_version() -> int:
+    version = get_cache().get(VERSION_KEY)
+    if version is None:
+        version = increment(VERSION_KEY)
+    return version
+
+
+def list_cache_key(request) -> str:
+    # Pages link to their neighbours with absolute URLs, so the scheme and
+    # host are part of the key
+    url_hash = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+    return f"book:list:{get_catalogue_version()}:{url_hash}"
+
+
+def detail_cache_key(book_id) -> str:
+    return f"book:detail:{book_id}"
+
+
+def invalidate_books(book_ids):
+    """Drop cached payloads of the given books and every cached list page.
+
+    Runs right away and once more after commit, so a reader that cached
+    the old rows while the transaction was still open does not keep them.
+    """
+
+    def invalidate():
+        cache = get_cache()
+        cache.delete_many([detail_cache_key(book_id) for book_id in book_ids])
+        increment(VERSION_KEY)
+
+    invalidate()
+    transaction.on_commit(invalidate)
+
+
+# Counted in the process, a lookup costs no extra cache round trip
+cache_requests = registry.counter(
+    "book_cache_requests_total", "Book cache lookups by result", ("result",)
+)
+
+
+def get_cache_stats() -> dict:
+    return {
+        "hits": cache_requests.get(result="hit"),
+        "misses": cache_requests.get(result="miss"),
+    }
+
+
+def cached_response(request, key, view_func, *args, **kwargs):
+    """Serve a rendered JSON payload from the cache, or render and store it.
+
+    The ETag and Last-Modified headers are cached with the payload, so a
+    conditional request hitting the cache is answered without a query.
+    """
+    if request.accepted_renderer.format != "json":
+        return view_func(request, *args, **kwargs)
+
+    cached = get_cache().get(key)
+    if cached is not None:
+        cache_requests.inc(result="hit")
+        content, content_type, *headers = cached
+        response = HttpResponse(content, content_type=content_type)
+        for name, value in (headers[0] if headers else {}).items():
+            response[name] = value
+
+        return get_conditional_response(
+            request,
+            etag=response.get("ETag"),
+            last_modified=parse_http_date_safe(response.get("Last-Modified")),
+            response=response,
+        )
+
+    cache_requests.inc(result="miss")
+    response = view_func(request, *args, **kwargs)
+
+    if response.status_code == 200:
+
+        def store(rendered_response):
+            headers = {
+                name: rendered_response[name]
+                for name in VALIDATOR_HEADERS
+                if rendered_response.has_header(name)
+            }
+            get_cache().set(
+                key,
+                (rendered_response.content, rendered_response["Content-Type"], headers),
+                settings.BOOK_CACHE_TIMEOUT,
+            )
+
+        response.add_post_render_callback(store)
+
+    return response
@@ -0,0 +1,39 @@
+from django.core.management import BaseCommand, CommandError
+
+from book.serializers import FILE_FORMATS
+from book.transfer import import_books, iter_rows
+
+
+class Command(BaseCommand):
+    """Django command to create or update books from a CSV/NDJSON file"""
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument(
+            "--file-format",
+            choices=FILE_FORMATS,
+            help="Guessed from the file extension when omitted",
+        )
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        file_format = options["file_format"] or path.rsplit(".", 1)[-1].lower()
+
+        if file_format not in FILE_FORMATS:
+            raise CommandError(f"Can't guess the format of {path}")
+
+        with open(path, encoding="utf-8-sig", newline="") as stream:
+            result = import_books(
+                iter_rows(stream, file_format), batch_size=options["batch_size"]
+            )
+
+        for error in result.errors:
+            self.stderr.write(f"Row {error['row']}: {error['errors']}")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created: {result.created}, updated: {result.updated}, "
+                f"failed: {result.failed}"
+            )
+        )
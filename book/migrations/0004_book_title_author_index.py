@@ -0,0 +1,18 @@
+# Generated by Django 5.0.1 on 2026-10-18 06:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("book", "0003_book_search_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="book",
+            index=models.Index(
+                fields=["title", "author"], name="book_title_author_idx"
+            ),
+        ),
+    ]
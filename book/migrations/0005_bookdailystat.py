@@ -0,0 +1,56 @@
+# Generated by Django 5.0.1 on 2026-10-18 06:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("book", "0004_book_title_author_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BookDailyStat",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("borrowed", models.PositiveIntegerField(default=0)),
+                ("returned", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "ordering": ["-date", "book"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="book",
+            index=models.Index(
+                condition=models.Q(("inventory", 0)),
+                fields=["title", "id"],
+                name="book_out_of_stock_idx",
+            ),
+        ),
+        migrations.AddField(
+            model_name="bookdailystat",
+            name="book",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="daily_stats",
+                to="book.book",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="bookdailystat",
+            constraint=models.UniqueConstraint(
+                fields=("date", "book"), name="book_daily_stat_date_book_unique"
+            ),
+        ),
+    ]
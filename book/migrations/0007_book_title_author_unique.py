@@ -0,0 +1,64 @@
+# Generated by Django 5.0.1 on 2026-10-18 08:18
+
+from django.db import migrations, models
+
+# Books sharing a title and author, each with the oldest one of its group,
+# which is the one the imports kept updating
+DUPLICATES = """
+    SELECT id, keep_id
+    FROM (
+        SELECT id, MIN(id) OVER (PARTITION BY title, author) AS keep_id
+        FROM book_book
+    ) AS book
+    WHERE id <> keep_id
+"""
+
+# Borrowings and daily stats of the duplicates move to the book they
+# duplicate, which keeps its own inventory and fee
+MERGE_DUPLICATES_SQL = [
+    f"""
+    UPDATE borrowing_borrowing AS borrowing
+    SET book_id = duplicate.keep_id
+    FROM ({DUPLICATES}) AS duplicate
+    WHERE borrowing.book_id = duplicate.id
+    """,
+    f"""
+    INSERT INTO book_bookdailystat AS stat (book_id, date, borrowed, returned)
+    SELECT duplicate.keep_id, stat.date, SUM(stat.borrowed), SUM(stat.returned)
+    FROM book_bookdailystat AS stat
+    JOIN ({DUPLICATES}) AS duplicate ON duplicate.id = stat.book_id
+    GROUP BY duplicate.keep_id, stat.date
+    ON CONFLICT (date, book_id) DO UPDATE
+    SET borrowed = stat.borrowed + EXCLUDED.borrowed,
+        returned = stat.returned + EXCLUDED.returned
+    """,
+    f"""
+    DELETE FROM book_bookdailystat
+    WHERE book_id IN (SELECT id FROM ({DUPLICATES}) AS duplicate)
+    """,
+    f"""
+    DELETE FROM book_book
+    WHERE id IN (SELECT id FROM ({DUPLICATES}) AS duplicate)
+    """,
+]
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("book", "0006_updated_at"),
+        ("borrowing", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunSQL(MERGE_DUPLICATES_SQL, reverse_sql=migrations.RunSQL.noop),
+        migrations.RemoveIndex(
+            model_name="book",
+            name="book_title_author_idx",
+        ),
+        migrations.AddConstraint(
+            model_name="book",
+            constraint=models.UniqueConstraint(
+                fields=("title", "author"), name="book_title_author_unique"
+            ),
+        ),
+    ]
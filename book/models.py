@@ -1,4 +1,12 @@
-from django.db import models
+import datetime
+
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db import connection, models
+from django.db.models import Case, F, IntegerField, Q, Value, When
+from django.db.models.functions import Now, Upper
+
+from book.search import BOOK_SEARCH_VECTOR
+from book.signals import inventory_changed
 
 
 class Book(models.Model):
@@ -11,19 +19,174 @@ class Book(models.Model):
     cover = models.CharField(max_length=50, choices=CoverChoices)
     inventory = models.PositiveIntegerField()
     daily_fee = models.DecimalField(max_digits=10, decimal_places=2)
+    # Also set by hand in the .update() calls, which skip auto_now
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = [
             "title",
+            "id",
+        ]
+        constraints = [
+            # Natural key the imports upsert on, see transfer.py
+            models.UniqueConstraint(
+                fields=["title", "author"], name="book_title_author_unique"
+            ),
+        ]
+        indexes = [
+            GinIndex(BOOK_SEARCH_VECTOR, name="book_search_vector_idx"),
+            GinIndex(
+                OpClass(Upper("title"), name="gin_trgm_ops"),
+                name="book_title_trgm_idx",
+            ),
+            GinIndex(
+                OpClass(Upper("author"), name="gin_trgm_ops"),
+                name="book_author_trgm_idx",
+            ),
+            models.Index(
+                fields=["title", "id"],
+                condition=Q(inventory=0),
+                name="book_out_of_stock_idx",
+            ),
         ]
 
-    def decrease_inventory_when_borrowed(self):
-        self.inventory -= 1
-        self.save()
+    def decrease_inventory_when_borrowed(self) -> bool:
+        """Take one copy in a single conditional UPDATE.
+
+        Returns False when the book is already out of stock, so callers
+        can reject the borrowing instead of overselling.
+        """
+        updated = Book.objects.filter(pk=self.pk, inventory__gt=0).update(
+            inventory=F("inventory") - 1, updated_at=Now()
+        )
+
+        if updated:
+            self.inventory -= 1
+            inventory_changed.send(sender=Book, book_ids=[self.pk])
+            BookDailyStat.record(borrowed={self.pk: 1})
+
+        return bool(updated)
 
     def increase_inventory_when_returned(self):
+        Book.objects.filter(pk=self.pk).update(
+            inventory=F("inventory") + 1, updated_at=Now()
+        )
         self.inventory += 1
-        self.save()
+        inventory_changed.send(sender=Book, book_ids=[self.pk])
+        BookDailyStat.record(returned={self.pk: 1})
+
+    @staticmethod
+    def _copies_per_book(counts: dict) -> Case:
+        return Case(
+            *[When(pk=book_id, then=Value(count)) for book_id, count in counts.items()],
+            output_field=IntegerField(),
+        )
+
+    @staticmethod
+    def lock_in_bulk(book_ids):
+        """Lock the rows in primary key order, the order every bulk path uses.
+
+        A multi-row UPDATE locks rows in whatever order its plan visits
+        them, so two of them over the same books could deadlock.
+        """
+        list(
+            Book.objects.filter(pk__in=book_ids)
+            .order_by("pk")
+            .select_for_update()
+            .values_list("pk", flat=True)
+        )
+
+    @staticmethod
+    def decrease_inventory_in_bulk(counts: dict) -> bool:
+        """Take ``counts[book_id]`` copies of every book in one UPDATE.
+
+        Returns False when any of the books has fewer copies left. The
+        books that did have enough are still updated, so this must run
+        inside a transaction that is rolled back on failure.
+        """
+        Book.lock_in_bulk(counts)
+
+        condition = Q()
+        for book_id, count in counts.items():
+            condition |= Q(pk=book_id, inventory__gte=count)
+
+        updated = Book.objects.filter(condition).update(
+            inventory=F("inventory") - Book._copies_per_book(counts),
+            updated_at=Now(),
+        )
+
+        if updated != len(counts):
+            return False
+
+        inventory_changed.send(sender=Book, book_ids=list(counts))
+        BookDailyStat.record(borrowed=counts)
+        return True
+
+    @staticmethod
+    def increase_inventory_in_bulk(counts: dict):
+        Book.lock_in_bulk(counts)
+        Book.objects.filter(pk__in=counts).update(
+            inventory=F("inventory") + Book._copies_per_book(counts),
+            updated_at=Now(),
+        )
+        inventory_changed.send(sender=Book, book_ids=list(counts))
+        BookDailyStat.record(returned=counts)
 
     def __str__(self) -> str:
         return self.title
+
+
+class BookDailyStat(models.Model):
+    """Borrows and returns of a book on one day, fed by the inventory updates"""
+
+    book = models.ForeignKey(
+        to=Book, on_delete=models.CASCADE, related_name="daily_stats"
+    )
+    date = models.DateField()
+    borrowed = models.PositiveIntegerField(default=0)
+    returned = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ["-date", "book"]
+        constraints = [
+            # Leading date column serves the date range scans of analytics
+            models.UniqueConstraint(
+                fields=["date", "book"], name="book_daily_stat_date_book_unique"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.book_id} on {self.date}"
+
+    @classmethod
+    def record(cls, borrowed: dict = None, returned: dict = None, day=None):
+        """Add ``{book_id: copies}`` borrowed and returned in one upsert"""
+        borrowed = borrowed or {}
+        returned = returned or {}
+        book_ids = set(borrowed) | set(returned)
+        if not book_ids:
+            return
+
+        day = day or datetime.date.today()
+        values = ", ".join(["(%s, %s, %s, %s)"] * len(book_ids))
+        params = []
+        for book_id in sorted(book_ids):
+            params += [
+                book_id,
+                day,
+                borrowed.get(book_id, 0),
+                returned.get(book_id, 0),
+            ]
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {cls._meta.db_table} AS stat
+                    (book_id, date, borrowed, returned)
+                VALUES {values}
+                ON CONFLICT (date, book_id) DO UPDATE
+                SET borrowed = stat.borrowed + EXCLUDED.borrowed,
+                    returned = stat.returned + EXCLUDED.returned
+                """,
+                params,
+            )
@@ -0,0 +1,47 @@
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db.models import F, FloatField, Q
+from django.db.models.functions import Cast
+
+# Must stay identical to the expression of ``book_search_vector_idx``,
+# otherwise Postgres can't use the index.
+BOOK_SEARCH_VECTOR = SearchVector("title", "author", config="english")
+
+
+def build_prefix_query(text: str):
+    """Turn free text into a tsquery where every word matches as a prefix"""
+    terms = re.findall(r"\w+", text)
+
+    if not terms:
+        return None
+
+    return SearchQuery(
+        " & ".join(f"{term}:*" for term in terms),
+        config="english",
+        search_type="raw",
+    )
+
+
+def search_books(queryset, text: str):
+    """Filter books by full-text match on title/author, best matches first.
+
+    Titles containing the raw text are matched as well (served by the
+    trigram index), which covers stop words and punctuation that the
+    full-text parser drops.
+    """
+    query = build_prefix_query(text)
+
+    if query is None:
+        return queryset.filter(title__icontains=text).order_by("title", "id")
+
+    return (
+        queryset.annotate(
+            search=BOOK_SEARCH_VECTOR,
+            # ts_rank returns real, cast it so the keyset cursor can
+            # round-trip the exact value through JSON
+            rank=Cast(SearchRank(F("search"), query), FloatField()),
+        )
+        .filter(Q(search=query) | Q(title__icontains=text))
+        .order_by("-rank", "title", "id")
+    )
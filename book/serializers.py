@@ -1,9 +1,66 @@
 from rest_framework import serializers
+from rest_framework.validators import UniqueTogetherValidator
 
 from book.models import Book
 
+CSV = "csv"
+NDJSON = "ndjson"
+FILE_FORMATS = (CSV, NDJSON)
+
 
 class BookSerializer(serializers.ModelSerializer):
     class Meta:
         model = Book
         fields = ("id", "title", "author", "cover", "inventory", "daily_fee")
+        # DRF 3.14 does not derive validators from UniqueConstraint
+        validators = [
+            UniqueTogetherValidator(
+                queryset=Book.objects.all(), fields=("title", "author")
+            )
+        ]
+
+
+class BookImportRowSerializer(BookSerializer):
+    """A row of an import, which updates the book when it already exists"""
+
+    class Meta(BookSerializer.Meta):
+        validators = []
+
+
+class BookImportSerializer(serializers.Serializer):
+    file = serializers.FileField()
+    file_format = serializers.ChoiceField(choices=FILE_FORMATS, required=False)
+
+    def validate(self, attrs):
+        data = super(BookImportSerializer, self).validate(attrs=attrs)
+
+        if "file_format" not in data:
+            extension = data["file"].name.rsplit(".", 1)[-1].lower()
+
+            if extension not in FILE_FORMATS:
+                raise serializers.ValidationError(
+                    {"file_format": "Can't guess the format from the file name."}
+                )
+
+            data["file_format"] = extension
+
+        return data
+
+
+class BookAnalyticsQuerySerializer(serializers.Serializer):
+    days = serializers.IntegerField(min_value=1, max_value=366, default=7)
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=10)
+    book = serializers.IntegerField(min_value=1, required=False)
+
+
+class BookPopularitySerializer(serializers.Serializer):
+    book = serializers.IntegerField(source="book_id")
+    title = serializers.CharField(source="book__title")
+    author = serializers.CharField(source="book__author")
+    borrowed = serializers.IntegerField()
+
+
+class BookDailyActivitySerializer(serializers.Serializer):
+    date = serializers.DateField()
+    borrowed = serializers.IntegerField()
+    returned = serializers.IntegerField()
@@ -0,0 +1,18 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from book.cache import invalidate_books
+
+# Sent with ``book_ids`` when inventory is changed by a queryset update,
+# which does not trigger post_save.
+inventory_changed = Signal()
+
+
+@receiver([post_save, post_delete], sender="book.Book")
+def invalidate_saved_book(sender, instance, **kwargs):
+    invalidate_books([instance.pk])
+
+
+@receiver(inventory_changed)
+def invalidate_book_inventory(sender, book_ids, **kwargs):
+    invalidate_books(book_ids)
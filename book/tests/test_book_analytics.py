@@ -0,0 +1,172 @@
+import datetime
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from book.models import Book, BookDailyStat
+from borrowing.models import Borrowing
+
+TOP_BORROWED_URL = reverse("book:book-top-borrowed")
+DAILY_URL = reverse("book:book-daily-activity")
+OUT_OF_STOCK_URL = reverse("book:book-out-of-stock")
+BORROWING_URL = reverse("borrowing:borrowing-list")
+BULK_BORROWING_URL = reverse("borrowing:borrowing-bulk-create-borrowings")
+BULK_RETURN_URL = reverse("borrowing:borrowing-bulk-return-borrowings")
+
+
+def sample_book(**params):
+    defaults = {
+        "title": "Test Book",
+        "author": "Test author",
+        "cover": "hard",
+        "inventory": 5,
+        "daily_fee": 0.5,
+    }
+    defaults.update(params)
+
+    return Book.objects.create(**defaults)
+
+
+class BookDailyStatTests(TestCase):
+    def setUp(self):
+        self.today = datetime.date.today()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="user@user.com", password="userpass"
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_borrow_and_return_paths_feed_rollups(self):
+        book = sample_book()
+        other = sample_book(title="Other Book")
+
+        res = self.client.post(
+            BORROWING_URL,
+            {"book": book.id, "expected_return_date": str(self.today)},
+        )
+        self.client.post(
+            reverse("borrowing:borrowing-return-borrowing", args=[res.data["id"]])
+        )
+        res = self.client.post(
+            BULK_BORROWING_URL,
+            {
+                "books": [book.id, other.id, other.id],
+                "expected_return_date": str(self.today),
+            },
+            format="json",
+        )
+        self.client.post(
+            BULK_RETURN_URL,
+            {"ids": [borrowing["id"] for borrowing in res.data]},
+            format="json",
+        )
+
+        self.assertEqual(
+            set(BookDailyStat.objects.values_list("book_id", "borrowed", "returned")),
+            {(book.id, 2, 2), (other.id, 2, 2)},
+        )
+
+    def test_backfill_command_rebuilds_rollups(self):
+        book = sample_book()
+        for _ in range(3):
+            Borrowing.objects.create(
+                expected_return_date=self.today, book=book, user=self.user
+            )
+        Borrowing.objects.filter(pk=Borrowing.objects.first().pk).update(
+            actual_return_date=self.today
+        )
+        BookDailyStat.objects.create(book=book, date=self.today, borrowed=99)
+        out = StringIO()
+
+        call_command("backfill_book_stats", stdout=out)
+
+        stat = BookDailyStat.objects.get()
+        self.assertIn("Backfilled 1 daily stats", out.getvalue())
+        self.assertEqual((stat.borrowed, stat.returned), (3, 1))
+
+
+class BookAnalyticsApiTests(TestCase):
+    def setUp(self):
+        self.today = datetime.date.today()
+        self.client = APIClient()
+
+    def test_top_borrowed_within_days(self):
+        popular = sample_book(title="Popular")
+        rare = sample_book(title="Rare")
+        old = sample_book(title="Old")
+        BookDailyStat.record(borrowed={popular.id: 3, rare.id: 1})
+        BookDailyStat.record(
+            borrowed={popular.id: 2},
+            day=self.today - datetime.timedelta(days=3),
+        )
+        BookDailyStat.record(
+            borrowed={old.id: 50},
+            day=self.today - datetime.timedelta(days=10),
+        )
+
+        res = self.client.get(TOP_BORROWED_URL, {"days": 7, "limit": 2})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res.data,
+            [
+                {
+                    "book": popular.id,
+                    "title": "Popular",
+                    "author": "Test author",
+                    "borrowed": 5,
+                },
+                {
+                    "book": rare.id,
+                    "title": "Rare",
+                    "author": "Test author",
+                    "borrowed": 1,
+                },
+            ],
+        )
+
+    def test_daily_activity_fills_empty_days(self):
+        book = sample_book()
+        other = sample_book(title="Other")
+        BookDailyStat.record(borrowed={book.id: 2}, returned={other.id: 1})
+        BookDailyStat.record(
+            returned={book.id: 1}, day=self.today - datetime.timedelta(days=2)
+        )
+
+        res = self.client.get(DAILY_URL, {"days": 3, "book": book.id})
+
+        self.assertEqual(
+            res.data,
+            [
+                {
+                    "date": str(self.today - datetime.timedelta(days=2)),
+                    "borrowed": 0,
+                    "returned": 1,
+                },
+                {
+                    "date": str(self.today - datetime.timedelta(days=1)),
+                    "borrowed": 0,
+                    "returned": 0,
+                },
+                {"date": str(self.today), "borrowed": 2, "returned": 0},
+            ],
+        )
+
+    def test_invalid_days_rejected(self):
+        res = self.client.get(DAILY_URL, {"days": 0})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_out_of_stock(self):
+        sample_book(title="Available")
+        missing = sample_book(title="Missing", inventory=0)
+
+        res = self.client.get(OUT_OF_STOCK_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([book["id"] for book in res.data["results"]], [missing.id])
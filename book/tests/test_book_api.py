@@ -33,7 +33,7 @@ class UnauthenticatedBookApiTests(TestCase):
 
     def test_list_books(self):
         sample_book()
-        sample_book()
+        sample_book(title="Another Book")
 
         res = self.client.get(BOOK_URL)
 
@@ -41,7 +41,33 @@ class UnauthenticatedBookApiTests(TestCase):
         serializer = BookSerializer(books, many=True)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data["results"], serializer.data)
+
+    def test_list_books_paginated_by_cursor(self):
+        for number, title in enumerate(("C", "A", "B", "A", "D")):
+            sample_book(title=title, author=f"Author {number}")
+
+        res = self.client.get(BOOK_URL, {"page_size": 2})
+        pages = [res.data["results"]]
+
+        while res.data["next"]:
+            res = self.client.get(res.data["next"])
+            pages.append(res.data["results"])
+
+        books = Book.objects.order_by("title", "id")
+        serializer = BookSerializer(books, many=True)
+
+        self.assertEqual([len(page) for page in pages], [2, 2, 1])
+        self.assertEqual(sum(pages, []), serializer.data)
+
+        res = self.client.get(res.data["previous"])
+
+        self.assertEqual(res.data["results"], pages[1])
+
+    def test_invalid_cursor(self):
+        res = self.client.get(BOOK_URL, {"cursor": "invalid"})
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
 
     def test_retrieve_book_detail(self):
         book = sample_book()
@@ -124,6 +150,21 @@ class AdminBookApiTests(TestCase):
 
         self.assertEqual(res.status_code, status.HTTP_201_CREATED)
 
+    def test_create_book_with_existing_title_and_author(self):
+        book = sample_book()
+        payload = {
+            "title": book.title,
+            "author": book.author,
+            "cover": "soft",
+            "inventory": 10,
+            "daily_fee": 0.5,
+        }
+
+        res = self.client.post(BOOK_URL, payload)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Book.objects.count(), 1)
+
     def test_update_book(self):
         book = sample_book()
         book_url = detail_url(book.id)
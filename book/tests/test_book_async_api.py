@@ -0,0 +1,78 @@
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.test import AsyncClient, TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from book.models import Book
+
+BOOK_URL = reverse("book:book-list")
+ASYNC_BOOK_URL = reverse("async:book-list")
+
+
+def sample_book(**params):
+    defaults = {
+        "title": "Test Book",
+        "author": "Test author",
+        "cover": "hard",
+        "inventory": 5,
+        "daily_fee": 0.5,
+    }
+    defaults.update(params)
+
+    return Book.objects.create(**defaults)
+
+
+def async_detail_url(book_id: int):
+    return reverse("async:book-detail", args=[book_id])
+
+
+class AsyncBookApiTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.async_client = AsyncClient()
+        self.books = [
+            sample_book(title=f"Book {number}", author=f"Author {number % 2}")
+            for number in range(5)
+        ]
+
+    async def test_list_matches_sync_endpoint(self):
+        for params in ({}, {"author": "author 1"}, {"search": "book"}):
+            res = await self.async_client.get(ASYNC_BOOK_URL, params)
+            expected = await sync_to_async(self.client.get)(BOOK_URL, params)
+
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertEqual(res.json()["results"], expected.json()["results"])
+
+    async def test_list_pages(self):
+        res = await self.async_client.get(ASYNC_BOOK_URL, {"page_size": 2})
+        next_url = res.json()["next"]
+        res = await self.async_client.get(next_url)
+
+        self.assertEqual(
+            [book["id"] for book in res.json()["results"]],
+            [book.id for book in self.books[2:4]],
+        )
+        self.assertIn(ASYNC_BOOK_URL, next_url)
+        self.assertIsNotNone(res.json()["previous"])
+
+    async def test_retrieve(self):
+        book = self.books[0]
+
+        res = await self.async_client.get(async_detail_url(book.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json()["title"], book.title)
+
+    async def test_retrieve_missing_book(self):
+        res = await self.async_client.get(async_detail_url(0))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(res.json(), {"detail": "Not found."})
+
+    async def test_write_methods_not_allowed(self):
+        res = await self.async_client.post(ASYNC_BOOK_URL, {})
+
+        self.assertEqual(res.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
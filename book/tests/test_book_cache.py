@@ -0,0 +1,140 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from book.cache import detail_cache_key, get_cache_stats
+from book.models import Book
+from book.serializers import BookSerializer
+
+BOOK_URL = reverse("book:book-list")
+CACHE_STATS_URL = reverse("book:book-cache-stats")
+
+
+def sample_book(**params):
+    defaults = {
+        "title": "Test Book",
+        "author": "Test author",
+        "cover": "hard",
+        "inventory": 5,
+        "daily_fee": 0.5,
+    }
+    defaults.update(params)
+
+    return Book.objects.create(**defaults)
+
+
+def detail_url(book_id: int):
+    return reverse("book:book-detail", args=[book_id])
+
+
+class BookCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def test_retrieve_served_from_cache(self):
+        book = sample_book()
+        url = detail_url(book.id)
+
+        first = self.client.get(url)
+
+        with self.assertNumQueries(0):
+            second = self.client.get(url)
+
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second["Content-Type"], first["Content-Type"])
+        self.assertEqual(second.content, first.content)
+
+    def test_list_served_from_cache(self):
+        sample_book()
+        first = self.client.get(BOOK_URL)
+
+        with self.assertNumQueries(0):
+            second = self.client.get(BOOK_URL)
+
+        self.assertEqual(second.content, first.content)
+
+    @override_settings(ALLOWED_HOSTS=["a.example.com", "b.example.com"])
+    def test_list_cached_per_host_and_scheme(self):
+        sample_book(title="First")
+        sample_book(title="Second")
+        self.client.get(BOOK_URL, {"page_size": 1}, HTTP_HOST="a.example.com")
+
+        for host, secure in (("b.example.com", False), ("a.example.com", True)):
+            res = self.client.get(
+                BOOK_URL, {"page_size": 1}, HTTP_HOST=host, secure=secure
+            )
+            scheme = "https" if secure else "http"
+            next_url = json.loads(res.content)["next"]
+
+            self.assertTrue(next_url.startswith(f"{scheme}://{host}/"))
+
+    def test_book_update_invalidates_cache(self):
+        book = sample_book()
+        self.client.get(detail_url(book.id))
+        self.client.get(BOOK_URL)
+
+        book.title = "New title"
+        book.save()
+
+        detail = json.loads(self.client.get(detail_url(book.id)).content)
+        books = json.loads(self.client.get(BOOK_URL).content)["results"]
+
+        self.assertEqual(detail["title"], "New title")
+        self.assertEqual(books[0]["title"], "New title")
+
+    def test_book_delete_invalidates_list(self):
+        book = sample_book()
+        self.client.get(BOOK_URL)
+
+        book.delete()
+        res = self.client.get(BOOK_URL)
+
+        self.assertEqual(json.loads(res.content)["results"], [])
+
+    def test_borrowing_invalidates_book_inventory(self):
+        book = sample_book()
+        self.client.get(detail_url(book.id))
+
+        book.decrease_inventory_when_borrowed()
+        res = self.client.get(detail_url(book.id))
+
+        self.assertEqual(
+            json.loads(res.content), BookSerializer(Book.objects.get()).data
+        )
+
+    def test_retrieve_only_by_canonical_pk(self):
+        book = sample_book()
+
+        res = self.client.get(f"{BOOK_URL}0{book.id}/")
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(cache.get(detail_cache_key(f"0{book.id}")))
+
+    def test_cache_stats(self):
+        before = get_cache_stats()
+        book = sample_book()
+        self.client.get(detail_url(book.id))
+        self.client.get(detail_url(book.id))
+        self.client.get(detail_url(book.id))
+
+        admin = get_user_model().objects.create_user(
+            "admin@admin.com", "testpass", is_staff=True
+        )
+        self.client.force_authenticate(admin)
+        res = self.client.get(CACHE_STATS_URL)
+
+        self.assertEqual(
+            res.data,
+            {"hits": before["hits"] + 2, "misses": before["misses"] + 1},
+        )
+
+    def test_cache_stats_forbidden_for_non_admin(self):
+        res = self.client.get(CACHE_STATS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,119 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from book.models import Book
+from book.serializers import BookSerializer
+
+BOOK_URL = reverse("book:book-list")
+
+
+def sample_book(**params):
+    defaults = {
+        "title": "Test Book",
+        "author": "Test author",
+        "cover": "hard",
+        "inventory": 5,
+        "daily_fee": 0.5,
+    }
+    defaults.update(params)
+
+    return Book.objects.create(**defaults)
+
+
+def detail_url(book_id: int):
+    return reverse("book:book-detail", args=[book_id])
+
+
+class BookConditionalGetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def test_retrieve_not_modified(self):
+        book = sample_book()
+        etag = self.client.get(detail_url(book.id))["ETag"]
+        cache.clear()
+
+        with mock.patch.object(BookSerializer, "to_representation") as serialize:
+            with self.assertNumQueries(1):
+                res = self.client.get(detail_url(book.id), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res["ETag"], etag)
+        serialize.assert_not_called()
+
+    def test_retrieve_if_modified_since(self):
+        book = sample_book()
+        last_modified = self.client.get(detail_url(book.id))["Last-Modified"]
+        cache.clear()
+
+        res = self.client.get(detail_url(book.id), HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_cached_list_not_modified_without_queries(self):
+        sample_book()
+        etag = self.client.get(BOOK_URL)["ETag"]
+
+        with self.assertNumQueries(0):
+            res = self.client.get(BOOK_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_list_not_modified_after_cache_eviction(self):
+        sample_book()
+        etag = self.client.get(BOOK_URL)["ETag"]
+        cache.clear()
+
+        with self.assertNumQueries(1):
+            res = self.client.get(BOOK_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_list_without_last_modified(self):
+        sample_book(title="Older")
+        newest = sample_book(title="Newer")
+        last_modified = self.client.get(detail_url(newest.id))["Last-Modified"]
+        res = self.client.get(BOOK_URL)
+
+        self.assertNotIn("Last-Modified", res)
+
+        newest.delete()
+        res = self.client.get(BOOK_URL, HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.json()["results"]), 1)
+
+    def test_changed_book_gets_new_etag(self):
+        admin = get_user_model().objects.create_superuser(
+            email="admin@admin.com", password="adminpass"
+        )
+        book = sample_book()
+        list_etag = self.client.get(BOOK_URL)["ETag"]
+        detail_etag = self.client.get(detail_url(book.id))["ETag"]
+
+        self.client.force_authenticate(admin)
+        self.client.patch(detail_url(book.id), {"inventory": 1})
+        list_res = self.client.get(BOOK_URL, HTTP_IF_NONE_MATCH=list_etag)
+        detail_res = self.client.get(
+            detail_url(book.id), HTTP_IF_NONE_MATCH=detail_etag
+        )
+
+        self.assertEqual(list_res.status_code, status.HTTP_200_OK)
+        self.assertEqual(detail_res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(detail_res["ETag"], detail_etag)
+
+    def test_inventory_update_changes_etag(self):
+        book = sample_book()
+        etag = self.client.get(detail_url(book.id))["ETag"]
+
+        book.decrease_inventory_when_borrowed()
+        res = self.client.get(detail_url(book.id), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
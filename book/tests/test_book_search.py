@@ -0,0 +1,122 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from book.models import Book
+from book.search import search_books
+
+BOOK_URL = reverse("book:book-list")
+
+
+def sample_book(**params):
+    defaults = {
+        "title": "Test Book",
+        "author": "Test author",
+        "cover": "hard",
+        "inventory": 5,
+        "daily_fee": 0.5,
+    }
+    defaults.update(params)
+
+    return Book.objects.create(**defaults)
+
+
+class BookSearchApiTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def get_titles(self, params) -> list:
+        res = self.client.get(BOOK_URL, params)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [book["title"] for book in res.data["results"]]
+
+    def test_search_by_word_prefixes(self):
+        sample_book(title="Harry Potter and the Chamber of Secrets")
+        sample_book(title="The Hobbit")
+        sample_book(title="Potions for beginners")
+
+        titles = self.get_titles({"search": "harr pot"})
+
+        self.assertEqual(titles, ["Harry Potter and the Chamber of Secrets"])
+
+    def test_search_matches_author(self):
+        sample_book(title="Dune", author="Frank Herbert")
+        sample_book(title="Emma", author="Jane Austen")
+
+        self.assertEqual(self.get_titles({"search": "herb"}), ["Dune"])
+
+    def test_search_orders_by_relevance(self):
+        sample_book(title="A history of databases", author="Someone")
+        sample_book(title="Databases", author="Databases Team")
+
+        titles = self.get_titles({"search": "databases"})
+
+        self.assertEqual(titles, ["Databases", "A history of databases"])
+
+    def test_search_falls_back_to_title_substring(self):
+        sample_book(title="The Hobbit")
+        sample_book(title="Dune")
+
+        self.assertEqual(self.get_titles({"search": "the"}), ["The Hobbit"])
+
+    def test_filter_by_author(self):
+        sample_book(title="Dune", author="Frank Herbert")
+        sample_book(title="Emma", author="Jane Austen")
+
+        self.assertEqual(self.get_titles({"author": "AUST"}), ["Emma"])
+
+    def test_search_results_paginated(self):
+        for number in range(5):
+            sample_book(title=f"Databases volume {number}")
+
+        res = self.client.get(BOOK_URL, {"search": "databases", "page_size": 2})
+        titles = [book["title"] for book in res.data["results"]]
+
+        while res.data["next"]:
+            res = self.client.get(res.data["next"])
+            titles += [book["title"] for book in res.data["results"]]
+
+        self.assertEqual(titles, [f"Databases volume {number}" for number in range(5)])
+
+
+class BookSearchIndexTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Book.objects.bulk_create(
+            Book(
+                title=f"Title {number} volume",
+                author=f"Author {number}",
+                cover="hard",
+                inventory=1,
+                daily_fee=1,
+            )
+            for number in range(5000)
+        )
+
+        with connection.cursor() as cursor:
+            # Rows inserted after index creation sit in the GIN pending
+            # list until autovacuum flushes it, which tests can't wait for
+            for index in (
+                "book_search_vector_idx",
+                "book_title_trgm_idx",
+                "book_author_trgm_idx",
+            ):
+                cursor.execute("SELECT gin_clean_pending_list(%s::regclass)", [index])
+            cursor.execute("ANALYZE book_book")
+
+    def test_search_uses_search_vector_index(self):
+        plan = search_books(Book.objects.all(), "Title 42").explain()
+
+        self.assertIn("book_search_vector_idx", plan)
+        self.assertNotIn("Seq Scan", plan)
+
+    def test_author_filter_uses_trigram_index(self):
+        plan = Book.objects.filter(author__icontains="author 4242").explain()
+
+        self.assertIn("book_author_trgm_idx", plan)
+        self.assertNotIn("Seq Scan", plan)
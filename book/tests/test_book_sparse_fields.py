@@ -0,0 +1,74 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from book.models import Book
+from book.serializers import BookSerializer
+
+BOOK_URL = reverse("book:book-list")
+ASYNC_BOOK_URL = reverse("async:book-list")
+
+
+def sample_book(**params):
+    defaults = {
+        "title": "Test Book",
+        "author": "Test author",
+        "cover": "hard",
+        "inventory": 5,
+        "daily_fee": 0.5,
+    }
+    defaults.update(params)
+
+    return Book.objects.create(**defaults)
+
+
+def detail_url(book_id: int):
+    return reverse("book:book-detail", args=[book_id])
+
+
+class BookSparseFieldsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.books = [sample_book(title=f"Book {number}") for number in range(3)]
+
+    def test_list_selected_fields(self):
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(BOOK_URL, {"fields": "title,id"})
+
+        self.assertEqual(
+            res.data["results"],
+            [{"id": book.id, "title": book.title} for book in self.books],
+        )
+        self.assertNotIn("daily_fee", queries[0]["sql"])
+
+    def test_search_with_selected_fields(self):
+        res = self.client.get(BOOK_URL, {"fields": "title", "search": "book"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data["results"]), 3)
+
+    def test_async_list_selected_fields(self):
+        res = self.client.get(ASYNC_BOOK_URL, {"fields": "id"})
+
+        self.assertEqual(
+            res.json()["results"], [{"id": book.id} for book in self.books]
+        )
+
+    def test_sparse_retrieve_bypasses_cache(self):
+        book = self.books[0]
+
+        sparse = self.client.get(detail_url(book.id), {"fields": "author"})
+        full = self.client.get(detail_url(book.id))
+
+        self.assertEqual(sparse.data, {"author": book.author})
+        self.assertEqual(full.data, BookSerializer(book).data)
+
+    def test_expand_rejected(self):
+        res = self.client.get(BOOK_URL, {"expand": "borrowings"})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,220 @@
+import json
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from book.cache import detail_cache_key, get_cache
+from book.models import Book
+from book.transfer import import_books
+
+IMPORT_URL = reverse("book:book-import-books")
+EXPORT_URL = reverse("book:book-export-books")
+
+CSV_CONTENT = (
+    "title,author,cover,inventory,daily_fee\n"
+    "Dune,Frank Herbert,hard,3,1.50\n"
+    "Emma,Jane Austen,soft,2,0.75\n"
+    "Broken,Nobody,paper,-1,x\n"
+)
+
+
+def sample_book(**params):
+    defaults = {
+        "title": "Test Book",
+        "author": "Test author",
+        "cover": "hard",
+        "inventory": 5,
+        "daily_fee": 0.5,
+    }
+    defaults.update(params)
+
+    return Book.objects.create(**defaults)
+
+
+class AdminBookTransferApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "admin@admin.com", "testpass", is_staff=True
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_import_csv_creates_and_updates_by_title_and_author(self):
+        dune = sample_book(title="Dune", author="Frank Herbert", inventory=10)
+        upload = SimpleUploadedFile("books.csv", CSV_CONTENT.encode())
+
+        res = self.client.post(IMPORT_URL, {"file": upload}, format="multipart")
+
+        dune.refresh_from_db()
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["created"], 1)
+        self.assertEqual(res.data["updated"], 1)
+        self.assertEqual(res.data["failed"], 1)
+        self.assertEqual(res.data["errors"][0]["row"], 3)
+        self.assertEqual(dune.inventory, 3)
+        self.assertEqual(dune.cover, "hard")
+        self.assertTrue(Book.objects.filter(title="Emma").exists())
+        self.assertFalse(Book.objects.filter(title="Broken").exists())
+
+    def test_import_ndjson(self):
+        lines = [
+            {
+                "title": "Dune",
+                "author": "Frank Herbert",
+                "cover": "hard",
+                "inventory": 3,
+                "daily_fee": "1.50",
+            },
+            "not json",
+        ]
+        content = "\n".join(
+            line if isinstance(line, str) else json.dumps(line) for line in lines
+        )
+        upload = SimpleUploadedFile("books.txt", content.encode())
+
+        res = self.client.post(
+            IMPORT_URL, {"file": upload, "file_format": "ndjson"}, format="multipart"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["created"], 1)
+        self.assertEqual(res.data["failed"], 1)
+
+    def test_import_unknown_format(self):
+        upload = SimpleUploadedFile("books.xlsx", b"")
+
+        res = self.client.post(IMPORT_URL, {"file": upload}, format="multipart")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_import_invalidates_each_committed_batch(self):
+        dune = sample_book(title="Dune", author="Frank Herbert")
+        self.client.get(reverse("book:book-detail", args=[dune.id]))
+
+        def rows():
+            for title, author in (("Dune", "Frank Herbert"), ("Emma", "Jane Austen")):
+                yield {
+                    "title": title,
+                    "author": author,
+                    "cover": "soft",
+                    "inventory": "3",
+                    "daily_fee": "1.50",
+                }
+            raise ValueError("Connection lost")
+
+        with self.assertRaises(ValueError):
+            import_books(rows(), batch_size=1)
+
+        self.assertIsNone(get_cache().get(detail_cache_key(dune.id)))
+
+    def test_import_updates_book_created_after_the_lookup(self):
+        dune = sample_book(title="Dune", author="Frank Herbert", inventory=10)
+        row = {
+            "title": "Dune",
+            "author": "Frank Herbert",
+            "cover": "soft",
+            "inventory": "3",
+            "daily_fee": "1.50",
+        }
+
+        # As if a concurrent import inserted the book after this one looked
+        with mock.patch.object(
+            Book.objects, "filter", return_value=Book.objects.none()
+        ):
+            import_books([row])
+
+        dune.refresh_from_db()
+        self.assertEqual(Book.objects.count(), 1)
+        self.assertEqual(dune.inventory, 3)
+
+    def test_export_csv(self):
+        book = sample_book(title="Dune", author="Frank Herbert")
+
+        res = self.client.get(EXPORT_URL)
+        content = b"".join(res.streaming_content).decode()
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            content.splitlines(),
+            [
+                "id,title,author,cover,inventory,daily_fee",
+                f"{book.id},Dune,Frank Herbert,hard,5,0.50",
+            ],
+        )
+
+    def test_export_ndjson(self):
+        book = sample_book()
+
+        res = self.client.get(EXPORT_URL, {"file_format": "ndjson"})
+        lines = b"".join(res.streaming_content).decode().splitlines()
+
+        self.assertEqual(
+            json.loads(lines[0]),
+            {
+                "id": book.id,
+                "title": "Test Book",
+                "author": "Test author",
+                "cover": "hard",
+                "inventory": 5,
+                "daily_fee": "0.50",
+            },
+        )
+
+    def test_export_import_round_trip(self):
+        sample_book(title="Dune", author="Frank Herbert")
+        sample_book(title="Emma", author="Jane Austen")
+
+        res = self.client.get(EXPORT_URL)
+        upload = SimpleUploadedFile("books.csv", b"".join(res.streaming_content))
+        res = self.client.post(IMPORT_URL, {"file": upload}, format="multipart")
+
+        self.assertEqual(res.data["updated"], 2)
+        self.assertEqual(Book.objects.count(), 2)
+
+
+class BookTransferPermissionTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "user@user.com",
+            "userpass",
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_import_forbidden(self):
+        upload = SimpleUploadedFile("books.csv", CSV_CONTENT.encode())
+
+        res = self.client.post(IMPORT_URL, {"file": upload}, format="multipart")
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_export_forbidden(self):
+        res = self.client.get(EXPORT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class ImportBooksCommandTests(TestCase):
+    def test_import_books_command(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv") as file:
+            file.write(CSV_CONTENT)
+            file.flush()
+
+            call_command(
+                "import_books",
+                file.name,
+                batch_size=2,
+                stdout=StringIO(),
+                stderr=StringIO(),
+            )
+
+        self.assertEqual(Book.objects.count(), 2)
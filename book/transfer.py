@@ -0,0 +1,149 @@
+import csv
+import json
+from dataclasses import dataclass, field
+from itertools import islice
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+from book.cache import invalidate_books
+from book.models import Book
+from book.serializers import CSV, BookImportRowSerializer, BookSerializer
+
+IMPORT_FIELDS = ("title", "author", "cover", "inventory", "daily_fee")
+EXPORT_FIELDS = BookSerializer.Meta.fields
+NATURAL_KEY = ("title", "author")
+MAX_REPORTED_ERRORS = 100
+
+
+@dataclass
+class ImportResult:
+    created: int = 0
+    updated: int = 0
+    failed: int = 0
+    errors: list = field(default_factory=list)
+
+    def add_error(self, row_number: int, errors):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row_number, "errors": errors})
+
+
+def iter_rows(stream, file_format: str):
+    """Yield dicts from a text stream without reading it into memory"""
+    if file_format == CSV:
+        yield from csv.DictReader(stream)
+        return
+
+    for line in stream:
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except ValueError:
+                yield None
+
+
+def chunked(iterable, size: int):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def validate_batch(rows: list, first_row_number: int, result: ImportResult) -> list:
+    rows = [
+        {name: row.get(name) for name in IMPORT_FIELDS}
+        if isinstance(row, dict)
+        else row
+        for row in rows
+    ]
+    serializer = BookImportRowSerializer(data=rows, many=True)
+
+    if serializer.is_valid():
+        return serializer.validated_data
+
+    valid_rows = []
+    for number, (row, errors) in enumerate(
+        zip(rows, serializer.errors), start=first_row_number
+    ):
+        if errors:
+            result.add_error(number, errors)
+        else:
+            valid_rows.append(row)
+
+    serializer = BookImportRowSerializer(data=valid_rows, many=True)
+    serializer.is_valid(raise_exception=True)
+    return serializer.validated_data
+
+
+def upsert_batch(books_data: list, result: ImportResult):
+    """Create or update books matched by (title, author)"""
+    by_key = {tuple(data[name] for name in NATURAL_KEY): data for data in books_data}
+
+    # Only tells created from updated books in the result, the upsert
+    # itself relies on the unique constraint, not on this snapshot
+    existing = set(
+        Book.objects.filter(
+            title__in={title for title, _ in by_key},
+            author__in={author for _, author in by_key},
+        ).values_list(*NATURAL_KEY)
+    )
+    books = [Book(**data) for data in by_key.values()]
+
+    with transaction.atomic():
+        Book.objects.bulk_create(
+            books,
+            update_conflicts=True,
+            unique_fields=NATURAL_KEY,
+            update_fields=[
+                *(name for name in IMPORT_FIELDS if name not in NATURAL_KEY),
+                "updated_at",
+            ],
+        )
+        # Each batch commits on its own, readers see it right after
+        invalidate_books([book.id for book in books])
+
+    updated = len(existing & by_key.keys())
+    result.created += len(books) - updated
+    result.updated += updated
+
+
+def import_books(rows, batch_size: int = 500) -> ImportResult:
+    """Validate and upsert books from an iterable of dicts, batch by batch"""
+    result = ImportResult()
+    # Rows are numbered from 1, not counting the CSV header
+    row_number = 1
+
+    for batch in chunked(rows, batch_size):
+        books_data = validate_batch(batch, row_number, result)
+        row_number += len(batch)
+
+        if books_data:
+            upsert_batch(books_data, result)
+
+    return result
+
+
+class Echo:
+    """File-like object that hands back what is written to it"""
+
+    def write(self, value):
+        return value
+
+
+def iter_export(file_format: str, chunk_size: int = 2000):
+    """Yield the whole catalogue as CSV or NDJSON lines, streaming from the DB"""
+    rows = (
+        Book.objects.order_by("id")
+        .values(*EXPORT_FIELDS)
+        .iterator(chunk_size=chunk_size)
+    )
+
+    if file_format == CSV:
+        writer = csv.DictWriter(Echo(), fieldnames=EXPORT_FIELDS)
+        yield writer.writeheader()
+        for row in rows:
+            yield writer.writerow(row)
+        return
+
+    for row in rows:
+        yield json.dumps(row, cls=DjangoJSONEncoder) + "\n"
@@ -1,11 +1,223 @@
-from rest_framework import viewsets
+import io
+from dataclasses import asdict
 
+from django.http import StreamingHttpResponse
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema, OpenApiParameter
+from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+
+from book.analytics import daily_series, get_date_range, top_borrowed
+from book.cache import (
+    cached_response,
+    detail_cache_key,
+    get_cache_stats,
+    list_cache_key,
+)
 from book.models import Book
-from book.serializers import BookSerializer
+from book.search import search_books
+from book.serializers import (
+    CSV,
+    FILE_FORMATS,
+    BookSerializer,
+    BookImportSerializer,
+    BookAnalyticsQuerySerializer,
+    BookPopularitySerializer,
+    BookDailyActivitySerializer,
+)
 from book.permissions import IsAdminOrReadOnly
+from book.transfer import import_books, iter_export, iter_rows
+from library_api_service.async_views import AsyncReadOnlyView
+from library_api_service.conditional import ConditionalGetMixin
+from library_api_service.fast_list import FastListMixin
+from library_api_service.sparse_fields import FIELDS_PARAMETER, SparseFieldsMixin
 
 
-class BookViewSet(viewsets.ModelViewSet):
+class BookViewSet(
+    SparseFieldsMixin, ConditionalGetMixin, FastListMixin, viewsets.ModelViewSet
+):
     queryset = Book.objects.all()
     serializer_class = BookSerializer
     permission_classes = (IsAdminOrReadOnly,)
+    # Details are cached under the pk in the URL, which has to be the one
+    # invalidate_books() builds its keys from, e.g. no "01" for book 1
+    lookup_value_regex = r"[1-9][0-9]*"
+
+    def get_serializer_class(self):
+        if self.action == "import_books":
+            return BookImportSerializer
+
+        return BookSerializer
+
+    def get_queryset(self):
+        queryset = self.queryset
+
+        if self.action != "list":
+            return queryset
+
+        search = self.request.query_params.get("search")
+        author = self.request.query_params.get("author")
+
+        if author:
+            queryset = queryset.filter(author__icontains=author)
+
+        if search:
+            queryset = search_books(queryset, search)
+
+        return queryset
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "search",
+                type=OpenApiTypes.STR,
+                description="Search by title and author words or their "
+                "prefixes, best matches first (ex. ?search=harry pot)",
+            ),
+            OpenApiParameter(
+                "author",
+                type=OpenApiTypes.STR,
+                description="Filter by author (ex. ?author=rowling)",
+            ),
+            FIELDS_PARAMETER,
+        ]
+    )
+    def list(self, request, *args, **kwargs):
+        return cached_response(
+            request, list_cache_key(request), super().list, *args, **kwargs
+        )
+
+    @extend_schema(parameters=[FIELDS_PARAMETER])
+    def retrieve(self, request, *args, **kwargs):
+        # Only whole books are cached by id
+        if self.is_sparse():
+            return super().retrieve(request, *args, **kwargs)
+
+        return cached_response(
+            request, detail_cache_key(kwargs["pk"]), super().retrieve, *args, **kwargs
+        )
+
+    @action(
+        methods=["GET"],
+        detail=False,
+        url_path="cache-stats",
+        permission_classes=[
+            IsAdminUser,
+        ],
+    )
+    def cache_stats(self, request):
+        """Endpoint for book cache hit/miss counters"""
+        return Response(get_cache_stats())
+
+    @action(
+        methods=["POST"],
+        detail=False,
+        url_path="import",
+        permission_classes=[
+            IsAdminUser,
+        ],
+        parser_classes=[
+            MultiPartParser,
+        ],
+    )
+    def import_books(self, request):
+        """Endpoint for creating or updating books from a CSV/NDJSON file"""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        stream = io.TextIOWrapper(
+            serializer.validated_data["file"].file, encoding="utf-8-sig", newline=""
+        )
+        result = import_books(
+            iter_rows(stream, serializer.validated_data["file_format"])
+        )
+
+        return Response(asdict(result), status=status.HTTP_200_OK)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "file_format",
+                type=OpenApiTypes.STR,
+                enum=FILE_FORMATS,
+                description="Export file format, csv by default "
+                "(ex. ?file_format=ndjson)",
+            ),
+        ]
+    )
+    @action(
+        methods=["GET"],
+        detail=False,
+        url_path="export",
+        permission_classes=[
+            IsAdminUser,
+        ],
+    )
+    def export_books(self, request):
+        """Endpoint for streaming the whole catalogue as CSV or NDJSON"""
+        file_format = request.query_params.get("file_format", CSV)
+
+        if file_format not in FILE_FORMATS:
+            raise ValidationError({"file_format": f"Choose one of {FILE_FORMATS}"})
+
+        content_type = "text/csv" if file_format == CSV else "application/x-ndjson"
+        response = StreamingHttpResponse(
+            iter_export(file_format), content_type=content_type
+        )
+        response["Content-Disposition"] = f'attachment; filename="books.{file_format}"'
+        return response
+
+    def get_analytics_params(self):
+        serializer = BookAnalyticsQuerySerializer(data=self.request.query_params)
+        serializer.is_valid(raise_exception=True)
+
+        return serializer.validated_data
+
+    @extend_schema(
+        parameters=[BookAnalyticsQuerySerializer],
+        responses=BookPopularitySerializer(many=True),
+    )
+    @action(methods=["GET"], detail=False, url_path="analytics/top-borrowed")
+    def top_borrowed(self, request):
+        """Endpoint for the most borrowed books of the last days (?days=7&limit=10)"""
+        params = self.get_analytics_params()
+        start, end = get_date_range(params["days"])
+
+        return Response(
+            BookPopularitySerializer(
+                top_borrowed(start, end, params["limit"]), many=True
+            ).data
+        )
+
+    @extend_schema(
+        parameters=[BookAnalyticsQuerySerializer],
+        responses=BookDailyActivitySerializer(many=True),
+    )
+    @action(methods=["GET"], detail=False, url_path="analytics/daily")
+    def daily_activity(self, request):
+        """Endpoint for borrows and returns per day (?days=30, ?book=1)"""
+        params = self.get_analytics_params()
+        start, end = get_date_range(params["days"])
+
+        return Response(
+            BookDailyActivitySerializer(
+                daily_series(start, end, params.get("book")), many=True
+            ).data
+        )
+
+    @action(methods=["GET"], detail=False, url_path="analytics/out-of-stock")
+    def out_of_stock(self, request):
+        """Endpoint for the titles with no copies left"""
+        page = self.paginate_queryset(Book.objects.filter(inventory=0))
+
+        return self.get_paginated_response(BookSerializer(page, many=True).data)
+
+
+class AsyncBookView(AsyncReadOnlyView):
+    """Async list and retrieve of books, same queries and representation"""
+
+    viewset_class = BookViewSet
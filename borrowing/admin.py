@@ -1,5 +1,24 @@
 from django.contrib import admin
 
-from borrowing.models import Borrowing
+from borrowing.models import Borrowing, OverdueBorrowing, UserBorrowingSummary
 
 admin.site.register(Borrowing)
+
+
+@admin.register(OverdueBorrowing)
+class OverdueBorrowingAdmin(admin.ModelAdmin):
+    list_display = ("borrowing", "user", "days_overdue", "fee", "scanned_on")
+    list_select_related = ("borrowing__book", "user")
+    date_hierarchy = "scanned_on"
+
+
+@admin.register(UserBorrowingSummary)
+class UserBorrowingSummaryAdmin(admin.ModelAdmin):
+    list_display = (
+        "user",
+        "active_count",
+        "total_count",
+        "overdue_count",
+        "outstanding_fees",
+    )
+    list_select_related = ("user",)
@@ -0,0 +1,30 @@
+import datetime
+
+from django.core.management import BaseCommand
+
+from borrowing.summary import backfill_book_stats
+
+
+class Command(BaseCommand):
+    """Django command to rebuild the daily book rollups from the borrowings"""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--from",
+            dest="start",
+            type=datetime.date.fromisoformat,
+            default=None,
+            help="First day to rebuild (YYYY-MM-DD), the whole history by default",
+        )
+        parser.add_argument(
+            "--to",
+            dest="end",
+            type=datetime.date.fromisoformat,
+            default=None,
+            help="Last day to rebuild (YYYY-MM-DD), today by default",
+        )
+
+    def handle(self, *args, **options):
+        rows = backfill_book_stats(options["start"], options["end"])
+
+        self.stdout.write(self.style.SUCCESS(f"Backfilled {rows} daily stats"))
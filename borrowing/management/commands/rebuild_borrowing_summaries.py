@@ -0,0 +1,12 @@
+from django.core.management import BaseCommand
+
+from borrowing.summary import rebuild_summaries
+
+
+class Command(BaseCommand):
+    """Django command to recount the per-user borrowing summaries"""
+
+    def handle(self, *args, **options):
+        rebuilt = rebuild_summaries()
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rebuilt} summaries"))
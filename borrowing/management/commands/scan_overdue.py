@@ -0,0 +1,37 @@
+import datetime
+
+from django.core.management import BaseCommand
+
+from borrowing.overdue import scan_overdue
+
+
+class Command(BaseCommand):
+    """Django command to materialize overdue borrowings and their fees"""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--date",
+            type=datetime.date.fromisoformat,
+            default=None,
+            help="Scan as of this date (YYYY-MM-DD), today by default",
+        )
+        parser.add_argument("--batch-size", type=int, default=None)
+        parser.add_argument(
+            "--no-notify",
+            action="store_true",
+            help="Don't send the Telegram digest",
+        )
+
+    def handle(self, *args, **options):
+        result = scan_overdue(
+            today=options["date"],
+            batch_size=options["batch_size"],
+            notify=not options["no_notify"],
+        )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Overdue: {result.overdue} in {result.batches} batches, "
+                f"fees: {result.fees}, removed: {result.removed}"
+            )
+        )
@@ -0,0 +1,16 @@
+# Generated by Django 5.0.1 on 2026-10-18 06:07
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("borrowing", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="borrowing",
+            options={"ordering": ["-borrow_date", "id"]},
+        ),
+    ]
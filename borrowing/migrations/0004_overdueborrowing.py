@@ -0,0 +1,54 @@
+# Generated by Django 5.0.1 on 2026-10-18 06:29
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("book", "0004_book_title_author_index"),
+        ("borrowing", "0003_borrowing_list_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OverdueBorrowing",
+            fields=[
+                (
+                    "borrowing",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="overdue",
+                        serialize=False,
+                        to="borrowing.borrowing",
+                    ),
+                ),
+                ("days_overdue", models.PositiveIntegerField()),
+                ("fee", models.DecimalField(decimal_places=2, max_digits=12)),
+                ("scanned_on", models.DateField()),
+            ],
+            options={
+                "ordering": ["-fee", "borrowing_id"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="borrowing",
+            index=models.Index(
+                condition=models.Q(("actual_return_date__isnull", True)),
+                fields=["id"],
+                name="borrowing_active_id_idx",
+            ),
+        ),
+        migrations.AddField(
+            model_name="overdueborrowing",
+            name="user",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="overdue_borrowings",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+    ]
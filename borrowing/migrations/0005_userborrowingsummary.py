@@ -0,0 +1,74 @@
+# Generated by Django 5.0.1 on 2026-10-18 06:31
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+# Frozen copies of borrowing.summary's queries as of this migration
+REBUILD_COUNTS_SQL = """
+    INSERT INTO borrowing_userborrowingsummary
+        (user_id, active_count, total_count, overdue_count, outstanding_fees)
+    SELECT user_id,
+           COUNT(*) FILTER (WHERE actual_return_date IS NULL),
+           COUNT(*),
+           0,
+           0
+    FROM borrowing_borrowing
+    GROUP BY user_id
+    ON CONFLICT (user_id) DO UPDATE
+    SET active_count = EXCLUDED.active_count,
+        total_count = EXCLUDED.total_count
+"""
+
+REFRESH_OVERDUE_SQL = """
+    UPDATE borrowing_userborrowingsummary AS summary
+    SET overdue_count = COALESCE(overdue.overdue_count, 0),
+        outstanding_fees = COALESCE(overdue.fees, 0)
+    FROM borrowing_userborrowingsummary AS current
+    LEFT JOIN (
+        SELECT user_id, COUNT(*) AS overdue_count, SUM(fee) AS fees
+        FROM borrowing_overdueborrowing
+        GROUP BY user_id
+    ) AS overdue ON overdue.user_id = current.user_id
+    WHERE summary.user_id = current.user_id
+      AND (summary.overdue_count <> COALESCE(overdue.overdue_count, 0)
+           OR summary.outstanding_fees <> COALESCE(overdue.fees, 0))
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("borrowing", "0004_overdueborrowing"),
+        ("user", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserBorrowingSummary",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="borrowing_summary",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("active_count", models.PositiveIntegerField(default=0)),
+                ("total_count", models.PositiveIntegerField(default=0)),
+                ("overdue_count", models.PositiveIntegerField(default=0)),
+                (
+                    "outstanding_fees",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=12),
+                ),
+            ],
+        ),
+        # Existing borrowings are counted right away, the borrow and return
+        # paths only update summaries that are already there
+        migrations.RunSQL(
+            [REBUILD_COUNTS_SQL, REFRESH_OVERDUE_SQL],
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
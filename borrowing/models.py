@@ -1,11 +1,14 @@
 from django.conf import settings
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import IntegrityError, connection, models
 from django.db.models import CheckConstraint, Q, F
 
 from book.models import Book
 
 
+DATE_ORDER_CONSTRAINT = "borrow_date_lte_return_date"
+
+
 class Borrowing(models.Model):
     borrow_date = models.DateField(auto_now_add=True)
     expected_return_date = models.DateField()
@@ -14,29 +17,61 @@ class Borrowing(models.Model):
         to=Book, on_delete=models.CASCADE, related_name="borrowings"
     )
     user = models.ForeignKey(
-        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="borrowings"
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="borrowings",
+        db_index=False,
     )
+    # Also set by hand in the .update() calls, which skip auto_now
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
-        ordering = ["-borrow_date"]
+        ordering = ["-borrow_date", "id"]
+        indexes = [
+            # (user_id, ...) also serves the user foreign key lookups,
+            # so the default single-column index is not created.
+            models.Index(
+                fields=["user", "-borrow_date", "id"],
+                name="borrowing_user_date_idx",
+            ),
+            models.Index(
+                fields=["user", "-borrow_date", "id"],
+                condition=Q(actual_return_date__isnull=True),
+                name="borrowing_active_user_date_idx",
+            ),
+            models.Index(
+                fields=["-borrow_date", "id"],
+                name="borrowing_date_idx",
+            ),
+            # Keyset batches of the overdue scan walk only active rows
+            models.Index(
+                fields=["id"],
+                condition=Q(actual_return_date__isnull=True),
+                name="borrowing_active_id_idx",
+            ),
+        ]
         constraints = [
             CheckConstraint(
                 check=(
                     Q(borrow_date__lte=F("expected_return_date"))
                     & Q(borrow_date__lte=F("actual_return_date"))
                 ),
-                name="borrow_date_lte_return_date",
+                name=DATE_ORDER_CONSTRAINT,
             ),
         ]
 
+    @staticmethod
+    def raise_out_of_stock(book, error_to_raise):
+        raise error_to_raise(
+            {
+                "book_inventory": f"{book.title} is currently out of stock"
+            }
+        )
+
     @staticmethod
     def validate_book_inventory(book, error_to_raise):
         if book.inventory <= 0:
-            raise error_to_raise(
-                {
-                    "book_inventory": f"{book.title} is currently out of stock"
-                }
-            )
+            Borrowing.raise_out_of_stock(book, error_to_raise)
 
     def clean(self):
         Borrowing.validate_book_inventory(
@@ -44,6 +79,23 @@ class Borrowing(models.Model):
             ValidationError,
         )
 
+    def clean_changed_fields(self, update_fields=None):
+        """Run field validators for the saved fields only.
+
+        Relations are checked by the database foreign keys, book inventory by
+        the conditional update in Book and date ordering by the check
+        constraint, so none of them cost a query here.
+        """
+        exclude = [
+            field.name
+            for field in self._meta.concrete_fields
+            if field.is_relation
+            or update_fields is not None
+            and field.name not in update_fields
+            and field.attname not in update_fields
+        ]
+        self.clean_fields(exclude=exclude)
+
     def save(
         self,
         force_insert=False,
@@ -51,10 +103,19 @@ class Borrowing(models.Model):
         using=None,
         update_fields=None,
     ):
-        self.full_clean()
-        return super(Borrowing, self).save(
-            force_insert, force_update, using, update_fields
-        )
+        self.clean_changed_fields(update_fields)
+
+        try:
+            return super(Borrowing, self).save(
+                force_insert, force_update, using, update_fields
+            )
+        except IntegrityError as error:
+            if DATE_ORDER_CONSTRAINT not in str(error):
+                raise
+
+            raise ValidationError(
+                "Borrow date can't be later than the return dates."
+            ) from error
 
     def __str__(self) -> str:
         return f"{self.book} borrowed by {self.user} on {str(self.borrow_date)}"
@@ -62,3 +123,117 @@ class Borrowing(models.Model):
     @property
     def is_active(self) -> bool:
         return self.actual_return_date is None
+
+
+class OverdueBorrowing(models.Model):
+    """Active borrowing past its expected return date, as of the last scan"""
+
+    borrowing = models.OneToOneField(
+        to=Borrowing,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="overdue",
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="overdue_borrowings",
+    )
+    days_overdue = models.PositiveIntegerField()
+    fee = models.DecimalField(max_digits=12, decimal_places=2)
+    scanned_on = models.DateField()
+
+    class Meta:
+        ordering = ["-fee", "borrowing_id"]
+
+    def __str__(self) -> str:
+        return f"Borrowing {self.borrowing_id} overdue by {self.days_overdue} days"
+
+
+class UserBorrowingSummary(models.Model):
+    """Per-user borrowing counters, updated along with the borrowings.
+
+    Active and total counts change with every borrow and return, overdue
+    counts and fees are refreshed by the overdue scan.
+    """
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="borrowing_summary",
+    )
+    active_count = models.PositiveIntegerField(default=0)
+    total_count = models.PositiveIntegerField(default=0)
+    overdue_count = models.PositiveIntegerField(default=0)
+    outstanding_fees = models.DecimalField(
+        max_digits=12, decimal_places=2, default=0
+    )
+
+    def __str__(self) -> str:
+        return f"Borrowing summary of user {self.user_id}"
+
+    @classmethod
+    def record_borrowed(cls, counts: dict) -> None:
+        """Add ``{user_id: number of borrowings}`` in one upsert"""
+        if not counts:
+            return
+
+        values = ", ".join(["(%s, %s, %s)"] * len(counts))
+        params = [value for item in counts.items() for value in (*item, item[1])]
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {cls._meta.db_table} AS summary
+                    (user_id, active_count, total_count,
+                     overdue_count, outstanding_fees)
+                SELECT changes.*, 0, 0
+                FROM (VALUES {values}) AS changes (user_id, active, total)
+                ON CONFLICT (user_id) DO UPDATE
+                SET active_count = summary.active_count + EXCLUDED.active_count,
+                    total_count = summary.total_count + EXCLUDED.total_count
+                """,
+                params,
+            )
+
+    @classmethod
+    def record_deleted(cls, counts: dict) -> None:
+        """Subtract ``{user_id: (active, total)}`` deleted borrowings in one update"""
+        if not counts:
+            return
+
+        values = ", ".join(["(%s, %s, %s)"] * len(counts))
+        params = [value for item in counts.items() for value in (item[0], *item[1])]
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                UPDATE {cls._meta.db_table} AS summary
+                SET active_count = GREATEST(summary.active_count - active, 0),
+                    total_count = GREATEST(summary.total_count - total, 0)
+                FROM (VALUES {values}) AS changes (user_id, active, total)
+                WHERE summary.user_id = changes.user_id
+                """,
+                params,
+            )
+
+    @classmethod
+    def record_returned(cls, counts: dict) -> None:
+        """Subtract ``{user_id: number of returns}`` in one update"""
+        if not counts:
+            return
+
+        values = ", ".join(["(%s, %s)"] * len(counts))
+        params = [value for item in counts.items() for value in item]
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                UPDATE {cls._meta.db_table} AS summary
+                SET active_count = GREATEST(summary.active_count - returned, 0)
+                FROM (VALUES {values}) AS changes (user_id, returned)
+                WHERE summary.user_id = changes.user_id
+                """,
+                params,
+            )
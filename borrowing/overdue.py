@@ -0,0 +1,126 @@
+import datetime
+from dataclasses import dataclass
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Count
+
+from book.models import Book
+from borrowing.models import Borrowing, OverdueBorrowing
+from borrowing.summary import refresh_overdue_summaries
+from telegram_helper.outbox import enqueue_notification
+
+DIGEST_TOP_SIZE = 10
+
+# One batch of the keyset scan: fees are computed and upserted by the
+# database, only the ids and fees of the batch come back.
+UPSERT_BATCH_SQL = f"""
+    INSERT INTO {OverdueBorrowing._meta.db_table}
+        (borrowing_id, user_id, days_overdue, fee, scanned_on)
+    SELECT borrowing.id,
+           borrowing.user_id,
+           %(today)s - borrowing.expected_return_date,
+           (%(today)s - borrowing.expected_return_date) * book.daily_fee,
+           %(today)s
+    FROM {Borrowing._meta.db_table} AS borrowing
+    JOIN {Book._meta.db_table} AS book ON book.id = borrowing.book_id
+    WHERE borrowing.actual_return_date IS NULL
+      AND borrowing.expected_return_date < %(today)s
+      AND borrowing.id > %(last_id)s
+    ORDER BY borrowing.id
+    LIMIT %(batch_size)s
+    ON CONFLICT (borrowing_id) DO UPDATE
+    SET days_overdue = EXCLUDED.days_overdue,
+        fee = EXCLUDED.fee,
+        scanned_on = EXCLUDED.scanned_on
+    RETURNING borrowing_id, fee
+"""
+
+
+@dataclass
+class ScanResult:
+    overdue: int = 0
+    batches: int = 0
+    fees: Decimal = Decimal("0")
+    removed: int = 0
+
+
+def upsert_overdue_batch(today: datetime.date, last_id: int, batch_size: int):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            UPSERT_BATCH_SQL,
+            {"today": today, "last_id": last_id, "batch_size": batch_size},
+        )
+        return cursor.fetchall()
+
+
+def scan_overdue(
+    today: datetime.date = None, batch_size: int = None, notify: bool = True
+) -> ScanResult:
+    """Materialize overdue borrowings and their fees as of ``today``.
+
+    Active borrowings are walked in id order, one batch per statement
+    (committed on its own outside a transaction), so memory and lock
+    time stay bounded whatever the table size.
+    Rows not refreshed by this scan were returned in the meantime and
+    are removed at the end, then the user summaries are brought in line.
+    """
+    today = today or datetime.date.today()
+    batch_size = batch_size or settings.OVERDUE_SCAN_BATCH_SIZE
+    result = ScanResult()
+    last_id = 0
+
+    while True:
+        rows = upsert_overdue_batch(today, last_id, batch_size)
+
+        if not rows:
+            break
+
+        result.batches += 1
+        result.overdue += len(rows)
+        result.fees += sum(fee for _, fee in rows)
+        last_id = max(borrowing_id for borrowing_id, _ in rows)
+
+        if len(rows) < batch_size:
+            break
+
+    # Left by an earlier scan (of any day, same-day ones included) for a
+    # borrowing that has since been returned or is not overdue as of today
+    result.removed, _ = OverdueBorrowing.objects.exclude(
+        scanned_on=today,
+        borrowing__actual_return_date__isnull=True,
+        borrowing__expected_return_date__lt=today,
+    ).delete()
+    refresh_overdue_summaries()
+
+    if notify and result.overdue:
+        enqueue_notification(build_digest(today, result))
+
+    return result
+
+
+def build_digest(today: datetime.date, result: ScanResult) -> str:
+    users = OverdueBorrowing.objects.aggregate(users=Count("user", distinct=True))[
+        "users"
+    ]
+    top = OverdueBorrowing.objects.select_related("borrowing__book").order_by(
+        "-fee", "borrowing_id"
+    )[:DIGEST_TOP_SIZE]
+
+    message = (
+        "Overdue Borrowings\n"
+        f"\nScan Date: {today}\n"
+        f"Overdue Borrowings: {result.overdue}\n"
+        f"Users: {users}\n"
+        f"Outstanding Fees: {result.fees}\n"
+    )
+    for overdue in top:
+        message += (
+            f"\nBook Title: {overdue.borrowing.book.title}\n"
+            f"User Id: {overdue.user_id}\n"
+            f"Days Overdue: {overdue.days_overdue}\n"
+            f"Fee: {overdue.fee}\n"
+        )
+
+    return message
@@ -1,12 +1,22 @@
 import datetime
+from collections import Counter
 
+from django.conf import settings
 from django.db import transaction
+from django.db.models import BooleanField, ExpressionWrapper, Q
+from django.db.models.functions import Now
+from django.utils import timezone
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 
+from book.models import Book
 from book.serializers import BookSerializer
-from borrowing.models import Borrowing
-from telegram_helper.bot import send_create_notification
+from borrowing.models import Borrowing, UserBorrowingSummary
+from telegram_helper.outbox import enqueue_notification
+
+IS_ACTIVE = ExpressionWrapper(
+    Q(actual_return_date__isnull=True), output_field=BooleanField()
+)
 
 
 class BorrowingSerializer(serializers.ModelSerializer):
@@ -22,6 +32,10 @@ class BorrowingSerializer(serializers.ModelSerializer):
             "is_active",
         )
         read_only_fields = fields
+        # Model fields read by the properties, for sparse fieldsets
+        property_fields = {"is_active": ("actual_return_date",)}
+        # SQL of the fields that are not columns, for FAST_LIST_SERIALIZATION
+        values_expressions = {"is_active": IS_ACTIVE}
 
 
 class BorrowingListSerializer(BorrowingSerializer):
@@ -31,6 +45,8 @@ class BorrowingListSerializer(BorrowingSerializer):
         model = Borrowing
         fields = ("id", "book_title", "expected_return_date", "user", "is_active")
         read_only_fields = fields
+        property_fields = BorrowingSerializer.Meta.property_fields
+        values_expressions = BorrowingSerializer.Meta.values_expressions
 
 
 class BorrowingDetailSerializer(BorrowingSerializer):
@@ -45,14 +61,26 @@ class BorrowingDetailSerializer(BorrowingSerializer):
         return data
 
     def update(self, instance, validated_data):
+        today = datetime.date.today()
+        now = timezone.now()
+
         with transaction.atomic():
-            book = instance.book
-            book.increase_inventory_when_returned()
+            # Conditional UPDATE, so of concurrent returns that all passed
+            # validate() only one puts the copy back
+            returned = Borrowing.objects.filter(
+                pk=instance.pk, actual_return_date__isnull=True
+            ).update(actual_return_date=today, updated_at=now)
+
+            if not returned:
+                raise serializers.ValidationError(
+                    "You have already returned this book."
+                )
 
-            instance.actual_return_date = datetime.date.today()
-            instance.save()
+            instance.book.increase_inventory_when_returned()
+            UserBorrowingSummary.record_returned({instance.user_id: 1})
 
-            return instance
+        instance.actual_return_date, instance.updated_at = today, now
+        return instance
 
 
 class BorrowingCreateSerializer(serializers.ModelSerializer):
@@ -60,6 +88,12 @@ class BorrowingCreateSerializer(serializers.ModelSerializer):
         model = Borrowing
         fields = ("id", "book", "borrow_date", "expected_return_date")
 
+    def validate_expected_return_date(self, value):
+        if value < datetime.date.today():
+            raise ValidationError("Expected return date can't be in the past.")
+
+        return value
+
     def validate(self, attrs):
         data = super(BorrowingCreateSerializer, self).validate(attrs=attrs)
         Borrowing.validate_book_inventory(
@@ -74,7 +108,10 @@ class BorrowingCreateSerializer(serializers.ModelSerializer):
 
             book = validated_data.get("book")
 
-            book.decrease_inventory_when_borrowed()
+            if not book.decrease_inventory_when_borrowed():
+                Borrowing.raise_out_of_stock(book, ValidationError)
+
+            UserBorrowingSummary.record_borrowed({borrowing.user_id: 1})
 
             message_to_send = (
                 "Borrowing Created\n"
@@ -84,6 +121,151 @@ class BorrowingCreateSerializer(serializers.ModelSerializer):
                 f"Book Author: {book.author}\n"
                 f"Daily Fee: {book.daily_fee}\n"
             )
-            send_create_notification(message_to_send)
+            enqueue_notification(message_to_send)
 
             return borrowing
+
+
+class BorrowingBulkCreateSerializer(serializers.Serializer):
+    books = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=settings.BORROWING_BULK_MAX_SIZE,
+    )
+    expected_return_date = serializers.DateField()
+
+    def validate_expected_return_date(self, value):
+        if value < datetime.date.today():
+            raise ValidationError("Expected return date can't be in the past.")
+
+        return value
+
+    def validate(self, attrs):
+        data = super(BorrowingBulkCreateSerializer, self).validate(attrs=attrs)
+
+        counts = Counter(attrs["books"])
+        books = Book.objects.in_bulk(counts)
+
+        missing = sorted(set(counts) - set(books))
+        if missing:
+            raise ValidationError({"books": f"Books not found: {missing}"})
+
+        for book_id, count in counts.items():
+            if books[book_id].inventory < count:
+                Borrowing.raise_out_of_stock(books[book_id], ValidationError)
+
+        data["counts"] = counts
+        data["books"] = [books[book_id] for book_id in attrs["books"]]
+        return data
+
+    def create(self, validated_data):
+        counts = validated_data["counts"]
+
+        with transaction.atomic():
+            if not Book.decrease_inventory_in_bulk(counts):
+                raise ValidationError(
+                    {"book_inventory": "Some of the books are out of stock"}
+                )
+
+            borrowings = Borrowing.objects.bulk_create(
+                Borrowing(
+                    book=book,
+                    user_id=validated_data["user_id"],
+                    expected_return_date=validated_data["expected_return_date"],
+                )
+                for book in validated_data["books"]
+            )
+            UserBorrowingSummary.record_borrowed(
+                {validated_data["user_id"]: len(borrowings)}
+            )
+
+            books = {borrowing.book_id: borrowing.book for borrowing in borrowings}
+            message_to_send = (
+                "Borrowings Created\n"
+                f"\nBorrowing Date: {borrowings[0].borrow_date}\n"
+                f"Expected Return Date: {borrowings[0].expected_return_date}\n"
+                f"Books Borrowed: {len(borrowings)}\n"
+            )
+            for book_id, book in books.items():
+                message_to_send += (
+                    f"\nBook Title: {book.title}\n"
+                    f"Book Author: {book.author}\n"
+                    f"Daily Fee: {book.daily_fee}\n"
+                    f"Copies: {counts[book_id]}\n"
+                )
+            enqueue_notification(message_to_send)
+
+            return borrowings
+
+
+class BorrowingBulkReturnSerializer(serializers.Serializer):
+    RETURNED = "returned"
+    ALREADY_RETURNED = "already_returned"
+    NOT_FOUND = "not_found"
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=settings.BORROWING_BULK_MAX_SIZE,
+    )
+
+    def create(self, validated_data):
+        """Return every active borrowing of ``ids`` found in ``queryset``.
+
+        Uses a constant number of queries: one to lock the rows, one to
+        set the return date, two to lock and put the copies back and one
+        to update the user summaries. Like a single return, borrowings are
+        locked before their books, so the two can't deadlock.
+        """
+        ids = list(dict.fromkeys(validated_data["ids"]))
+        today = datetime.date.today()
+
+        with transaction.atomic():
+            rows = (
+                validated_data["queryset"]
+                .select_related(None)
+                .select_for_update()
+                .filter(pk__in=ids)
+                .order_by("pk")
+                .values_list("id", "book_id", "user_id", "actual_return_date")
+            )
+            results = {borrowing_id: self.NOT_FOUND for borrowing_id in ids}
+            returned_books = Counter()
+            returned_by_user = Counter()
+
+            for borrowing_id, book_id, user_id, actual_return_date in rows:
+                if actual_return_date:
+                    results[borrowing_id] = self.ALREADY_RETURNED
+                else:
+                    results[borrowing_id] = self.RETURNED
+                    returned_books[book_id] += 1
+                    returned_by_user[user_id] += 1
+
+            if returned_books:
+                Borrowing.objects.filter(
+                    pk__in=[
+                        borrowing_id
+                        for borrowing_id, result in results.items()
+                        if result == self.RETURNED
+                    ]
+                ).update(actual_return_date=today, updated_at=Now())
+                Book.increase_inventory_in_bulk(returned_books)
+                UserBorrowingSummary.record_returned(returned_by_user)
+
+        return [
+            {"id": borrowing_id, "status": result}
+            for borrowing_id, result in results.items()
+        ]
+
+
+class UserBorrowingSummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = UserBorrowingSummary
+        fields = (
+            "user",
+            "active_count",
+            "total_count",
+            "overdue_count",
+            "outstanding_fees",
+        )
+        read_only_fields = fields
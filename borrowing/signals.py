@@ -0,0 +1,25 @@
+from django.db.models import Count, Q
+from django.db.models.signals import pre_delete
+from django.dispatch import receiver
+
+from borrowing.models import Borrowing, UserBorrowingSummary
+
+
+@receiver(pre_delete, sender="book.Book")
+def forget_borrowings_of_deleted_book(sender, instance, **kwargs):
+    """Take the borrowings the book deletion cascades to out of the summaries.
+
+    Overdue counts and fees catch up with the next overdue scan.
+    """
+    counts = (
+        Borrowing.objects.filter(book=instance)
+        .order_by()
+        .values("user_id")
+        .annotate(
+            active=Count("id", filter=Q(actual_return_date__isnull=True)),
+            total=Count("id"),
+        )
+    )
+    UserBorrowingSummary.record_deleted(
+        {row["user_id"]: (row["active"], row["total"]) for row in counts}
+    )
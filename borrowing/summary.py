@@ -0,0 +1,95 @@
+import datetime
+
+from django.db import connection, transaction
+
+from book.models import BookDailyStat
+from borrowing.models import Borrowing, OverdueBorrowing, UserBorrowingSummary
+
+SUMMARY_TABLE = UserBorrowingSummary._meta.db_table
+
+REFRESH_OVERDUE_SQL = f"""
+    UPDATE {SUMMARY_TABLE} AS summary
+    SET overdue_count = COALESCE(overdue.overdue_count, 0),
+        outstanding_fees = COALESCE(overdue.fees, 0)
+    FROM {SUMMARY_TABLE} AS current
+    LEFT JOIN (
+        SELECT user_id, COUNT(*) AS overdue_count, SUM(fee) AS fees
+        FROM {OverdueBorrowing._meta.db_table}
+        GROUP BY user_id
+    ) AS overdue ON overdue.user_id = current.user_id
+    WHERE summary.user_id = current.user_id
+      AND (summary.overdue_count <> COALESCE(overdue.overdue_count, 0)
+           OR summary.outstanding_fees <> COALESCE(overdue.fees, 0))
+"""
+
+REBUILD_COUNTS_SQL = f"""
+    INSERT INTO {SUMMARY_TABLE}
+        (user_id, active_count, total_count, overdue_count, outstanding_fees)
+    SELECT user_id,
+           COUNT(*) FILTER (WHERE actual_return_date IS NULL),
+           COUNT(*),
+           0,
+           0
+    FROM {Borrowing._meta.db_table}
+    GROUP BY user_id
+    ON CONFLICT (user_id) DO UPDATE
+    SET active_count = EXCLUDED.active_count,
+        total_count = EXCLUDED.total_count
+"""
+
+RESET_COUNTS_SQL = f"""
+    UPDATE {SUMMARY_TABLE}
+    SET active_count = 0, total_count = 0
+    WHERE user_id NOT IN (SELECT user_id FROM {Borrowing._meta.db_table})
+"""
+
+DELETE_BOOK_STATS_SQL = f"""
+    DELETE FROM {BookDailyStat._meta.db_table}
+    WHERE date BETWEEN %(start)s AND %(end)s
+"""
+
+BACKFILL_BOOK_STATS_SQL = f"""
+    INSERT INTO {BookDailyStat._meta.db_table} (book_id, date, borrowed, returned)
+    SELECT book_id, day, SUM(borrowed), SUM(returned)
+    FROM (
+        SELECT book_id, borrow_date AS day, 1 AS borrowed, 0 AS returned
+        FROM {Borrowing._meta.db_table}
+        WHERE borrow_date BETWEEN %(start)s AND %(end)s
+        UNION ALL
+        SELECT book_id, actual_return_date, 0, 1
+        FROM {Borrowing._meta.db_table}
+        WHERE actual_return_date BETWEEN %(start)s AND %(end)s
+    ) AS activity
+    GROUP BY book_id, day
+"""
+
+
+def refresh_overdue_summaries() -> int:
+    """Copy overdue counts and fees of the last scan into the summaries"""
+    with connection.cursor() as cursor:
+        cursor.execute(REFRESH_OVERDUE_SQL)
+        return cursor.rowcount
+
+
+def rebuild_summaries() -> int:
+    """Recount every summary from the borrowings and overdue tables"""
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(REBUILD_COUNTS_SQL)
+        rebuilt = cursor.rowcount
+        cursor.execute(RESET_COUNTS_SQL)
+        refresh_overdue_summaries()
+
+    return rebuilt
+
+
+def backfill_book_stats(start: datetime.date = None, end: datetime.date = None) -> int:
+    """Recompute the daily book rollups between ``start`` and ``end``"""
+    params = {
+        "start": start or datetime.date.min,
+        "end": end or datetime.date.today(),
+    }
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(DELETE_BOOK_STATS_SQL, params)
+        cursor.execute(BACKFILL_BOOK_STATS_SQL, params)
+        return cursor.rowcount
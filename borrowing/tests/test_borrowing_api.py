@@ -1,7 +1,10 @@
 import datetime
+from itertools import count
 
 from django.contrib.auth import get_user_model
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
@@ -12,8 +15,11 @@ from borrowing.serializers import (
     BorrowingDetailSerializer,
     BorrowingListSerializer,
 )
+from telegram_helper.models import Notification
 
 BORROWING_URL = reverse("borrowing:borrowing-list")
+BULK_BORROWING_URL = reverse("borrowing:borrowing-bulk-create-borrowings")
+BULK_RETURN_URL = reverse("borrowing:borrowing-bulk-return-borrowings")
 
 
 def detail_url(borrowing_id: int):
@@ -25,9 +31,17 @@ def return_url(borrowing_id: int):
     return reverse("borrowing:borrowing-return-borrowing", args=[borrowing_id])
 
 
+# Titles and authors are unique together
+BOOK_NUMBERS = count(1)
+
+
+def days_from_today(days: int) -> str:
+    return str(datetime.date.today() + datetime.timedelta(days=days))
+
+
 def sample_book(**params):
     defaults = {
-        "title": "Test Book",
+        "title": f"Test Book {next(BOOK_NUMBERS)}",
         "author": "Test author",
         "cover": "hard",
         "inventory": 5,
@@ -42,8 +56,8 @@ def sample_borrowing(**params):
     book = sample_book()
 
     defaults = {
-        "borrow_date": "2024-01-31",
-        "expected_return_date": "2024-02-01",
+        "borrow_date": days_from_today(0),
+        "expected_return_date": days_from_today(1),
         "book": book,
     }
     defaults.update(params)
@@ -91,12 +105,12 @@ class AuthenticatedBorrowingApiTests(TestCase):
         serializer = BorrowingListSerializer(borrowings, many=True)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data["results"], serializer.data)
 
     def test_filter_borrowings_by_is_active(self):
         borrowing = sample_borrowing(user_id=self.user.id)
         borrowing_with_return_date = sample_borrowing(
-            user_id=self.user.id, actual_return_date="2024-02-01"
+            user_id=self.user.id, actual_return_date=days_from_today(0)
         )
 
         res = self.client.get(BORROWING_URL, {"is_active": True})
@@ -104,8 +118,8 @@ class AuthenticatedBorrowingApiTests(TestCase):
         serializer1 = BorrowingListSerializer(borrowing)
         serializer2 = BorrowingListSerializer(borrowing_with_return_date)
 
-        self.assertIn(serializer1.data, res.data)
-        self.assertNotIn(serializer2.data, res.data)
+        self.assertIn(serializer1.data, res.data["results"])
+        self.assertNotIn(serializer2.data, res.data["results"])
 
     def test_filter_borrowings_by_user_id_not_works_for_default_user(self):
         another_user = sample_user()
@@ -119,8 +133,8 @@ class AuthenticatedBorrowingApiTests(TestCase):
         serializer1 = BorrowingListSerializer(borrowing)
         serializer2 = BorrowingListSerializer(borrowing_with_another_user)
 
-        self.assertIn(serializer1.data, res.data)
-        self.assertNotIn(serializer2.data, res.data)
+        self.assertIn(serializer1.data, res.data["results"])
+        self.assertNotIn(serializer2.data, res.data["results"])
 
     def test_retrieve_borrowing_detail(self):
         borrowing = sample_borrowing(user_id=self.user.id)
@@ -136,7 +150,7 @@ class AuthenticatedBorrowingApiTests(TestCase):
         book = sample_book()
 
         payload = {
-            "expected_return_date": "2024-02-01",
+            "expected_return_date": days_from_today(3),
             "book": book.id,
         }
 
@@ -144,11 +158,26 @@ class AuthenticatedBorrowingApiTests(TestCase):
 
         self.assertEqual(res.status_code, status.HTTP_201_CREATED)
 
+    def test_create_borrowing_with_past_expected_return_date(self):
+        book = sample_book()
+        payload = {
+            "expected_return_date": days_from_today(-1),
+            "book": book.id,
+        }
+
+        res = self.client.post(BORROWING_URL, payload)
+
+        book.refresh_from_db()
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("expected_return_date", res.data)
+        self.assertEqual(book.inventory, 5)
+
     def test_create_borrowing_decreases_book_inventory_by_1(self):
         book = sample_book()
         expected_inventory = book.inventory - 1
         payload = {
-            "expected_return_date": "2024-02-01",
+            "expected_return_date": days_from_today(3),
             "book": book.id,
         }
 
@@ -159,6 +188,66 @@ class AuthenticatedBorrowingApiTests(TestCase):
 
         self.assertEqual(actual_inventory, expected_inventory)
 
+    def test_bulk_create_borrowings(self):
+        book1 = sample_book(inventory=3)
+        book2 = sample_book(inventory=1)
+        payload = {
+            "expected_return_date": days_from_today(3),
+            "books": [book1.id, book2.id, book1.id],
+        }
+
+        res = self.client.post(BULK_BORROWING_URL, payload, format="json")
+
+        book1.refresh_from_db()
+        book2.refresh_from_db()
+        borrowings = Borrowing.objects.filter(user=self.user)
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(res.data), 3)
+        self.assertEqual(borrowings.count(), 3)
+        self.assertEqual(book1.inventory, 1)
+        self.assertEqual(book2.inventory, 0)
+        self.assertEqual(Notification.objects.count(), 1)
+        self.assertIn("Books Borrowed: 3", Notification.objects.get().message)
+
+    def test_bulk_create_borrowings_is_all_or_nothing(self):
+        book1 = sample_book(inventory=3)
+        book2 = sample_book(inventory=1)
+        payload = {
+            "expected_return_date": days_from_today(3),
+            "books": [book1.id, book2.id, book2.id],
+        }
+
+        res = self.client.post(BULK_BORROWING_URL, payload, format="json")
+
+        book1.refresh_from_db()
+        book2.refresh_from_db()
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Borrowing.objects.exists())
+        self.assertEqual(book1.inventory, 3)
+        self.assertEqual(book2.inventory, 1)
+        self.assertFalse(Notification.objects.exists())
+
+    def test_bulk_create_borrowings_unknown_book(self):
+        payload = {"expected_return_date": days_from_today(3), "books": [0, 999999]}
+
+        res = self.client.post(BULK_BORROWING_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_create_borrowings_query_count_does_not_grow(self):
+        def bulk_borrow(number_of_books):
+            books = [sample_book().id for _ in range(number_of_books)]
+            payload = {"expected_return_date": days_from_today(3), "books": books}
+
+            with CaptureQueriesContext(connection) as context:
+                self.client.post(BULK_BORROWING_URL, payload, format="json")
+
+            return len(context.captured_queries)
+
+        self.assertEqual(bulk_borrow(1), bulk_borrow(10))
+
     def test_return_borrowing(self):
         borrowing = sample_borrowing(user_id=self.user.id)
 
@@ -178,6 +267,59 @@ class AuthenticatedBorrowingApiTests(TestCase):
 
         self.assertEqual(res_return_twice.status_code, status.HTTP_400_BAD_REQUEST)
 
+    def test_bulk_return_borrowings(self):
+        book = sample_book()
+        borrowing1 = sample_borrowing(user_id=self.user.id, book=book)
+        borrowing2 = sample_borrowing(user_id=self.user.id, book=book)
+        returned = sample_borrowing(
+            user_id=self.user.id, actual_return_date=days_from_today(0)
+        )
+        another_user_borrowing = sample_borrowing(user_id=sample_user().id)
+        payload = {
+            "ids": [
+                borrowing1.id,
+                borrowing2.id,
+                returned.id,
+                another_user_borrowing.id,
+            ]
+        }
+
+        res = self.client.post(BULK_RETURN_URL, payload, format="json")
+
+        book.refresh_from_db()
+        another_user_borrowing.refresh_from_db()
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res.data["results"],
+            [
+                {"id": borrowing1.id, "status": "returned"},
+                {"id": borrowing2.id, "status": "returned"},
+                {"id": returned.id, "status": "already_returned"},
+                {"id": another_user_borrowing.id, "status": "not_found"},
+            ],
+        )
+        self.assertFalse(
+            Borrowing.objects.filter(
+                pk__in=[borrowing1.id, borrowing2.id], actual_return_date=None
+            ).exists()
+        )
+        self.assertEqual(book.inventory, 7)
+        self.assertIsNone(another_user_borrowing.actual_return_date)
+
+    def test_bulk_return_query_count_does_not_grow(self):
+        def bulk_return(number_of_borrowings):
+            ids = [
+                sample_borrowing(user_id=self.user.id).id
+                for _ in range(number_of_borrowings)
+            ]
+
+            with CaptureQueriesContext(connection) as context:
+                self.client.post(BULK_RETURN_URL, {"ids": ids}, format="json")
+
+            return len(context.captured_queries)
+
+        self.assertEqual(bulk_return(1), bulk_return(10))
 
     def test_increase_book_inventory_when_returned(self):
         borrowing = sample_borrowing(user_id=self.user.id)
@@ -212,7 +354,23 @@ class AdminBorrowingApiTests(TestCase):
         res = self.client.get(BORROWING_URL)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(serializer.data, res.data)
+        self.assertEqual(serializer.data, res.data["results"])
+
+    def test_list_borrowings_paginated_within_same_borrow_date(self):
+        for _ in range(5):
+            sample_borrowing(user_id=self.user.id)
+
+        res = self.client.get(BORROWING_URL, {"page_size": 2})
+        results = res.data["results"]
+
+        while res.data["next"]:
+            res = self.client.get(res.data["next"])
+            results += res.data["results"]
+
+        borrowings = Borrowing.objects.order_by("-borrow_date", "id")
+        serializer = BorrowingListSerializer(borrowings, many=True)
+
+        self.assertEqual(results, serializer.data)
 
     def test_filter_borrowings_by_user_id(self):
         test_user1 = sample_user()
@@ -227,6 +385,6 @@ class AdminBorrowingApiTests(TestCase):
         serializer2 = BorrowingListSerializer(borrowing2)
         serializer3 = BorrowingListSerializer(borrowing3)
 
-        self.assertNotIn(serializer1.data, res.data)
-        self.assertIn(serializer2.data, res.data)
-        self.assertNotIn(serializer3.data, res.data)
+        self.assertNotIn(serializer1.data, res.data["results"])
+        self.assertIn(serializer2.data, res.data["results"])
+        self.assertNotIn(serializer3.data, res.data["results"])
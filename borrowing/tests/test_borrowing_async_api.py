@@ -0,0 +1,113 @@
+import datetime
+import time
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.test import AsyncClient, Client, TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from book.models import Book
+from borrowing.models import Borrowing
+from user.authentication import revoke_tokens
+from user.serializers import TokenObtainPairWithClaimsSerializer
+
+BORROWING_URL = reverse("borrowing:borrowing-list")
+ASYNC_BORROWING_URL = reverse("async:borrowing-list")
+
+
+def detail_url(borrowing_id: int):
+    return reverse("borrowing:borrowing-detail", args=[borrowing_id])
+
+
+def async_detail_url(borrowing_id: int):
+    return reverse("async:borrowing-detail", args=[borrowing_id])
+
+
+def bearer(user) -> str:
+    token = TokenObtainPairWithClaimsSerializer.get_token(user).access_token
+    return f"Bearer {token}"
+
+
+class AsyncBorrowingApiTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email="user@user.com", password="userpass"
+        )
+        self.other = get_user_model().objects.create_user(
+            email="other@user.com", password="userpass"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.async_client = AsyncClient()
+        self.headers = {"Authorize": bearer(self.user)}
+        self.book = Book.objects.create(
+            title="Test Book",
+            author="Test author",
+            cover="hard",
+            inventory=50,
+            daily_fee=0.5,
+        )
+        today = datetime.date.today()
+        self.borrowings = [
+            Borrowing.objects.create(
+                expected_return_date=today, book=self.book, user=user
+            )
+            for user in (self.user, self.user, self.other)
+        ]
+
+    async def test_list_matches_sync_endpoint(self):
+        res = await self.async_client.get(
+            ASYNC_BORROWING_URL, {"is_active": "true"}, headers=self.headers
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.headers["Content-Type"], "application/json")
+        expected = await self.sync_get(BORROWING_URL + "?is_active=true")
+        self.assertEqual(res.json()["results"], expected["results"])
+        self.assertEqual(len(res.json()["results"]), 2)
+
+    async def test_retrieve_matches_sync_endpoint(self):
+        borrowing_id = self.borrowings[0].id
+
+        res = await self.async_client.get(
+            async_detail_url(borrowing_id), headers=self.headers
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json(), await self.sync_get(detail_url(borrowing_id)))
+
+    async def test_retrieve_other_users_borrowing_not_found(self):
+        res = await self.async_client.get(
+            async_detail_url(self.borrowings[2].id), headers=self.headers
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_auth_required(self):
+        res = await AsyncClient().get(ASYNC_BORROWING_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertIn("WWW-Authenticate", res.headers)
+
+    async def test_revoked_token_rejected(self):
+        # Revocations cover whole seconds before the current one
+        with mock.patch("time.time", return_value=time.time() + 1):
+            revoke_tokens(self.user.id)
+
+        res = await self.async_client.get(ASYNC_BORROWING_URL, headers=self.headers)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_list_without_user_query(self):
+        client = Client(headers=self.headers)
+
+        with self.assertNumQueries(1):
+            res = client.get(ASYNC_BORROWING_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    async def sync_get(self, url: str) -> dict:
+        return (await sync_to_async(self.client.get)(url)).json()
@@ -0,0 +1,99 @@
+import datetime
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from book.models import Book
+from borrowing.models import Borrowing
+from borrowing.serializers import BorrowingDetailSerializer
+
+BORROWING_URL = reverse("borrowing:borrowing-list")
+
+
+def detail_url(borrowing_id: int):
+    return reverse("borrowing:borrowing-detail", args=[borrowing_id])
+
+
+class BorrowingConditionalGetTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="user@user.com", password="userpass"
+        )
+        self.client.force_authenticate(self.user)
+        self.book = Book.objects.create(
+            title="Test Book",
+            author="Test author",
+            cover="hard",
+            inventory=5,
+            daily_fee=0.5,
+        )
+        self.borrowing = Borrowing.objects.create(
+            expected_return_date=datetime.date.today(),
+            book=self.book,
+            user=self.user,
+        )
+
+    def test_retrieve_not_modified(self):
+        etag = self.client.get(detail_url(self.borrowing.id))["ETag"]
+
+        with mock.patch.object(
+            BorrowingDetailSerializer, "to_representation"
+        ) as serialize:
+            with self.assertNumQueries(1):
+                res = self.client.get(
+                    detail_url(self.borrowing.id), HTTP_IF_NONE_MATCH=etag
+                )
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        serialize.assert_not_called()
+
+    def test_list_not_modified(self):
+        etag = self.client.get(BORROWING_URL)["ETag"]
+
+        with self.assertNumQueries(1):
+            res = self.client.get(BORROWING_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_return_changes_etags(self):
+        detail_etag = self.client.get(detail_url(self.borrowing.id))["ETag"]
+        list_etag = self.client.get(BORROWING_URL)["ETag"]
+
+        self.client.post(
+            reverse("borrowing:borrowing-return-borrowing", args=[self.borrowing.id])
+        )
+
+        detail_res = self.client.get(
+            detail_url(self.borrowing.id), HTTP_IF_NONE_MATCH=detail_etag
+        )
+        list_res = self.client.get(BORROWING_URL, HTTP_IF_NONE_MATCH=list_etag)
+
+        self.assertEqual(detail_res.status_code, status.HTTP_200_OK)
+        self.assertEqual(list_res.status_code, status.HTTP_200_OK)
+
+    def test_book_change_changes_borrowing_etag(self):
+        etag = self.client.get(detail_url(self.borrowing.id))["ETag"]
+
+        self.book.title = "Renamed Book"
+        self.book.save()
+        res = self.client.get(detail_url(self.borrowing.id), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["book"]["title"], "Renamed Book")
+
+    def test_other_users_borrowing_not_found(self):
+        other = get_user_model().objects.create_user(
+            email="other@user.com", password="userpass"
+        )
+        borrowing = Borrowing.objects.create(
+            expected_return_date=datetime.date.today(), book=self.book, user=other
+        )
+
+        res = self.client.get(detail_url(borrowing.id), HTTP_IF_NONE_MATCH="*")
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
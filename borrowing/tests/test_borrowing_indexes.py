@@ -0,0 +1,103 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from book.models import Book
+from borrowing.models import Borrowing
+
+BORROWING_URL = reverse("borrowing:borrowing-list")
+
+USERS = 50
+BORROWINGS_PER_USER = 40
+
+
+class BorrowingListIndexTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        users = get_user_model().objects.bulk_create(
+            get_user_model()(email=f"user{number}@user.com") for number in range(USERS)
+        )
+        book = Book.objects.create(
+            title="Test Book",
+            author="Test author",
+            cover="hard",
+            inventory=5,
+            daily_fee=0.5,
+        )
+        today = datetime.date.today()
+        Borrowing.objects.bulk_create(
+            Borrowing(
+                expected_return_date=today + datetime.timedelta(days=3),
+                actual_return_date=today if number % 4 else None,
+                book=book,
+                user=user,
+            )
+            for user in users
+            for number in range(BORROWINGS_PER_USER)
+        )
+
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE borrowing_borrowing")
+
+        cls.user = users[0]
+        cls.admin = get_user_model().objects.create_user(
+            "admin@admin.com", "testpass", is_staff=True
+        )
+
+    def get_list_query_plan(self, user, params=None, url=BORROWING_URL) -> str:
+        client = APIClient()
+        client.force_authenticate(user)
+
+        with CaptureQueriesContext(connection) as context:
+            client.get(url, params)
+
+        sql = next(
+            query["sql"]
+            for query in context.captured_queries
+            if 'FROM "borrowing_borrowing"' in query["sql"]
+        )
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN {sql}")
+            return "\n".join(row[0] for row in cursor.fetchall())
+
+    def assertUsesIndex(self, plan: str, index_name: str):
+        self.assertRegex(plan, rf"Index (Only )?Scan (using|on) {index_name}\b")
+        self.assertNotIn("Seq Scan on borrowing_borrowing", plan)
+
+    def test_user_list_uses_user_date_index(self):
+        plan = self.get_list_query_plan(self.user)
+
+        self.assertUsesIndex(plan, "borrowing_user_date_idx")
+
+    def test_user_active_list_uses_partial_index(self):
+        plan = self.get_list_query_plan(self.user, {"is_active": True})
+
+        self.assertUsesIndex(plan, "borrowing_active_user_date_idx")
+
+    def test_staff_list_uses_date_index(self):
+        plan = self.get_list_query_plan(self.admin)
+
+        self.assertUsesIndex(plan, "borrowing_date_idx")
+
+    def test_staff_list_filtered_by_user_uses_user_date_index(self):
+        plan = self.get_list_query_plan(self.admin, {"user_id": self.user.id})
+
+        self.assertUsesIndex(plan, "borrowing_user_date_idx")
+
+    def test_deep_page_bounds_leading_column_in_index(self):
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        url = client.get(BORROWING_URL, {"page_size": 100}).data["next"]
+        for _ in range(10):
+            url = client.get(url).data["next"]
+
+        plan = self.get_list_query_plan(self.admin, url=url)
+
+        self.assertUsesIndex(plan, "borrowing_date_idx")
+        self.assertRegex(plan, r"Index Cond: \(borrow_date <= ")
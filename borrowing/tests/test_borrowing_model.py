@@ -0,0 +1,72 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.test import TestCase
+
+from book.models import Book
+from borrowing.models import Borrowing
+
+
+class BorrowingSaveTests(TestCase):
+    def setUp(self):
+        self.today = datetime.date.today()
+        self.user = get_user_model().objects.create_user(
+            email="user@user.com", password="userpass"
+        )
+        self.book = Book.objects.create(
+            title="Test Book",
+            author="Test author",
+            cover="hard",
+            inventory=5,
+            daily_fee=0.5,
+        )
+
+    def create_borrowing(self, **params):
+        defaults = {
+            "expected_return_date": self.today + datetime.timedelta(days=7),
+            "book": self.book,
+            "user": self.user,
+        }
+        defaults.update(params)
+
+        return Borrowing.objects.create(**defaults)
+
+    def test_create_runs_only_insert(self):
+        with self.assertNumQueries(1):
+            self.create_borrowing()
+
+    def test_create_converts_field_values(self):
+        borrowing = self.create_borrowing(
+            expected_return_date=str(self.today + datetime.timedelta(days=1))
+        )
+
+        self.assertEqual(
+            borrowing.expected_return_date, self.today + datetime.timedelta(days=1)
+        )
+
+    def test_save_with_update_fields_runs_only_update(self):
+        borrowing = self.create_borrowing()
+        borrowing.actual_return_date = self.today
+
+        with self.assertNumQueries(1):
+            borrowing.save(update_fields=["actual_return_date"])
+
+        borrowing.refresh_from_db()
+        self.assertEqual(borrowing.actual_return_date, self.today)
+
+    def test_save_with_update_fields_validates_saved_field(self):
+        borrowing = self.create_borrowing()
+        borrowing.actual_return_date = "not a date"
+
+        with self.assertRaises(ValidationError):
+            borrowing.save(update_fields=["actual_return_date"])
+
+    def test_date_order_constraint_raises_validation_error(self):
+        with transaction.atomic(), self.assertRaises(ValidationError):
+            self.create_borrowing(
+                expected_return_date=self.today - datetime.timedelta(days=1)
+            )
+
+        self.assertFalse(Borrowing.objects.exists())
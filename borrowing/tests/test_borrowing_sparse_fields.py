@@ -0,0 +1,157 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from book.models import Book
+from book.serializers import BookSerializer
+from borrowing.models import Borrowing
+
+BORROWING_URL = reverse("borrowing:borrowing-list")
+
+
+def detail_url(borrowing_id: int):
+    return reverse("borrowing:borrowing-detail", args=[borrowing_id])
+
+
+def sample_book(**params):
+    defaults = {
+        "title": "Test Book",
+        "author": "Test author",
+        "cover": "hard",
+        "inventory": 5,
+        "daily_fee": 0.5,
+    }
+    defaults.update(params)
+
+    return Book.objects.create(**defaults)
+
+
+class BorrowingSparseFieldsTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user("test@test.com", "testpass")
+        self.client.force_authenticate(self.user)
+        self.book = sample_book()
+
+        today = datetime.date.today()
+        self.borrowings = [
+            Borrowing.objects.create(
+                book=self.book,
+                user=self.user,
+                expected_return_date=today + datetime.timedelta(days=number),
+                actual_return_date=today if number == 0 else None,
+            )
+            for number in range(3)
+        ]
+
+    def get(self, url, params):
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(url, params)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return res, [query["sql"] for query in queries]
+
+    def test_retrieve_selected_fields_without_join(self):
+        borrowing = self.borrowings[1]
+
+        res, queries = self.get(
+            detail_url(borrowing.id), {"fields": "id,borrow_date,is_active"}
+        )
+
+        self.assertEqual(
+            res.data,
+            {
+                "id": borrowing.id,
+                "borrow_date": str(borrowing.borrow_date),
+                "is_active": True,
+            },
+        )
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn("book_book", queries[0])
+        self.assertNotIn("expected_return_date", queries[0])
+
+    def test_retrieve_keeps_nested_book(self):
+        res, queries = self.get(detail_url(self.borrowings[0].id), {"fields": "book"})
+
+        self.assertEqual(res.data, {"book": BookSerializer(self.book).data})
+        self.assertEqual(len(queries), 1)
+
+    def test_list_selected_fields_without_join(self):
+        res, queries = self.get(BORROWING_URL, {"fields": "id, is_active"})
+
+        self.assertEqual(
+            res.data["results"],
+            [
+                {"id": borrowing.id, "is_active": borrowing.is_active}
+                for borrowing in Borrowing.objects.filter(user=self.user)
+            ],
+        )
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn("book_book", queries[0])
+
+    def test_list_expand_book(self):
+        res, queries = self.get(BORROWING_URL, {"fields": "id", "expand": "book"})
+
+        book = BookSerializer(self.book).data
+        self.assertEqual(
+            res.data["results"],
+            [
+                {"id": borrowing.id, "book": book}
+                for borrowing in Borrowing.objects.filter(user=self.user)
+            ],
+        )
+        self.assertEqual(len(queries), 1)
+
+    def test_list_expand_keeps_other_fields(self):
+        res = self.client.get(BORROWING_URL, {"expand": "book"})
+
+        self.assertEqual(
+            list(res.data["results"][0]),
+            ["id", "book_title", "expected_return_date", "user", "is_active", "book"],
+        )
+
+    def test_pages_follow_the_selection(self):
+        res, _ = self.get(BORROWING_URL, {"fields": "id", "page_size": 2})
+        next_page, queries = self.get(res.data["next"], {})
+
+        self.assertEqual(next_page.data["results"], [{"id": self.borrowings[-1].id}])
+        self.assertNotIn("book_book", queries[0])
+
+    def test_conditional_get_without_join(self):
+        params = {"fields": "id"}
+        res = self.client.get(BORROWING_URL, params)
+
+        with CaptureQueriesContext(connection) as queries:
+            not_modified = self.client.get(
+                BORROWING_URL, params, HTTP_IF_NONE_MATCH=res["ETag"]
+            )
+
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertNotIn("book_book", queries[0]["sql"])
+
+    def test_unknown_field_rejected(self):
+        res = self.client.get(BORROWING_URL, {"fields": "id,secret"})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("secret", res.data["fields"])
+
+    def test_unknown_expand_rejected(self):
+        res = self.client.get(detail_url(self.borrowings[0].id), {"expand": "user"})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("expand", res.data)
+
+    def test_selection_ignored_by_other_actions(self):
+        res = self.client.post(
+            BORROWING_URL + "?fields=id",
+            {"book": self.book.id, "expected_return_date": "2099-01-01"},
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertIn("expected_return_date", res.data)
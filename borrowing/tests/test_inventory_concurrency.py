@@ -0,0 +1,157 @@
+import datetime
+import threading
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TransactionTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from book.models import Book
+from borrowing.models import Borrowing, UserBorrowingSummary
+
+BORROWING_URL = reverse("borrowing:borrowing-list")
+BULK_RETURN_URL = reverse("borrowing:borrowing-bulk-return-borrowings")
+
+THREADS = 20
+
+
+def expected_return_date():
+    return str(datetime.date.today() + datetime.timedelta(days=3))
+
+
+def return_url(borrowing_id: int):
+    return reverse("borrowing:borrowing-return-borrowing", args=[borrowing_id])
+
+
+class ConcurrentBorrowingTests(TransactionTestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "testpass",
+        )
+        self.book = Book.objects.create(
+            title="Hot title",
+            author="Test author",
+            cover="hard",
+            inventory=5,
+            daily_fee=0.5,
+        )
+
+    def borrow(self, barrier, responses):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        barrier.wait()
+
+        try:
+            res = client.post(
+                BORROWING_URL,
+                {"expected_return_date": expected_return_date(), "book": self.book.id},
+            )
+            responses.append(res.status_code)
+        finally:
+            connection.close()
+
+    def test_concurrent_borrowings_never_oversell(self):
+        barrier = threading.Barrier(THREADS)
+        responses = []
+        threads = [
+            threading.Thread(target=self.borrow, args=(barrier, responses))
+            for _ in range(THREADS)
+        ]
+
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.book.refresh_from_db()
+
+        self.assertEqual(self.book.inventory, 0)
+        self.assertEqual(responses.count(status.HTTP_201_CREATED), 5)
+        self.assertEqual(responses.count(status.HTTP_400_BAD_REQUEST), THREADS - 5)
+        self.assertEqual(Borrowing.objects.filter(book=self.book).count(), 5)
+
+    def post_concurrently(self, requests) -> list:
+        """Send every ``(url, data)`` at once, one thread each"""
+        barrier = threading.Barrier(len(requests))
+        responses = []
+
+        def post(url, data):
+            client = APIClient()
+            client.force_authenticate(self.user)
+            barrier.wait()
+
+            try:
+                responses.append(client.post(url, data, format="json"))
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=post, args=request) for request in requests]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        return responses
+
+    def test_concurrent_returns_put_one_copy_back(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        client.post(
+            BORROWING_URL,
+            {"expected_return_date": expected_return_date(), "book": self.book.id},
+        )
+        borrowing = Borrowing.objects.get()
+
+        responses = self.post_concurrently([(return_url(borrowing.id), {})] * THREADS)
+        statuses = [res.status_code for res in responses]
+
+        self.book.refresh_from_db()
+        summary = UserBorrowingSummary.objects.get(user=self.user)
+
+        self.assertEqual(self.book.inventory, 5)
+        self.assertEqual(statuses.count(status.HTTP_200_OK), 1)
+        self.assertEqual(statuses.count(status.HTTP_400_BAD_REQUEST), THREADS - 1)
+        self.assertEqual(summary.active_count, 0)
+
+    def test_concurrent_single_and_bulk_returns(self):
+        other_book = Book.objects.create(
+            title="Other title",
+            author="Test author",
+            cover="hard",
+            inventory=5,
+            daily_fee=0.5,
+        )
+        client = APIClient()
+        client.force_authenticate(self.user)
+        for book in (self.book, other_book) * 2:
+            client.post(
+                BORROWING_URL,
+                {"expected_return_date": expected_return_date(), "book": book.id},
+            )
+        ids = list(Borrowing.objects.values_list("id", flat=True))
+
+        responses = self.post_concurrently(
+            [(return_url(borrowing_id), {}) for borrowing_id in ids]
+            + [(BULK_RETURN_URL, {"ids": ids}), (BULK_RETURN_URL, {"ids": ids[::-1]})]
+        )
+
+        returned = sum(
+            res.status_code == status.HTTP_200_OK and "results" not in res.data
+            for res in responses
+        ) + sum(
+            result["status"] == "returned"
+            for res in responses
+            if res.status_code == status.HTTP_200_OK and "results" in res.data
+            for result in res.data["results"]
+        )
+        self.assertEqual(returned, len(ids))
+        self.assertTrue(
+            all(
+                res.status_code != status.HTTP_500_INTERNAL_SERVER_ERROR
+                for res in responses
+            )
+        )
+        self.assertEqual(set(Book.objects.values_list("inventory", flat=True)), {5})
@@ -0,0 +1,141 @@
+import datetime
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from book.models import Book
+from borrowing.models import Borrowing, OverdueBorrowing
+from borrowing.overdue import scan_overdue
+from telegram_helper.models import Notification
+
+
+class OverdueScanTests(TestCase):
+    def setUp(self):
+        self.today = datetime.date.today()
+        self.user = get_user_model().objects.create_user(
+            email="user@user.com", password="userpass"
+        )
+        self.book = Book.objects.create(
+            title="Test Book",
+            author="Test author",
+            cover="hard",
+            inventory=50,
+            daily_fee="0.50",
+        )
+
+    def sample_borrowing(self, days=0, **params):
+        return Borrowing.objects.create(
+            expected_return_date=self.today + datetime.timedelta(days=days),
+            book=self.book,
+            user=self.user,
+            **params,
+        )
+
+    def test_scan_materializes_overdue_fees(self):
+        overdue = [self.sample_borrowing() for _ in range(5)]
+        self.sample_borrowing(days=30)
+        self.sample_borrowing(actual_return_date=self.today)
+
+        result = scan_overdue(
+            today=self.today + datetime.timedelta(days=4), batch_size=2
+        )
+
+        self.assertEqual(result.overdue, 5)
+        self.assertEqual(result.batches, 3)
+        self.assertEqual(result.fees, Decimal("10.00"))
+        self.assertEqual(
+            set(OverdueBorrowing.objects.values_list("borrowing_id", flat=True)),
+            {borrowing.id for borrowing in overdue},
+        )
+        self.assertEqual(
+            set(OverdueBorrowing.objects.values_list("days_overdue", "fee")),
+            {(4, Decimal("2.00"))},
+        )
+
+    def test_scan_sends_one_digest(self):
+        for _ in range(3):
+            self.sample_borrowing()
+
+        scan_overdue(today=self.today + datetime.timedelta(days=1), batch_size=1)
+
+        self.assertEqual(Notification.objects.count(), 1)
+        self.assertIn("Overdue Borrowings: 3", Notification.objects.get().message)
+
+    def test_scan_without_overdue_sends_nothing(self):
+        self.sample_borrowing(days=5)
+
+        result = scan_overdue(today=self.today + datetime.timedelta(days=1))
+
+        self.assertEqual(result.overdue, 0)
+        self.assertFalse(Notification.objects.exists())
+
+    def test_rescan_updates_fees_and_removes_returned(self):
+        kept = self.sample_borrowing()
+        returned = self.sample_borrowing()
+        scan_overdue(today=self.today + datetime.timedelta(days=1), notify=False)
+
+        Borrowing.objects.filter(pk=returned.pk).update(
+            actual_return_date=self.today + datetime.timedelta(days=2)
+        )
+        result = scan_overdue(
+            today=self.today + datetime.timedelta(days=3), notify=False
+        )
+
+        self.assertEqual(result.removed, 1)
+        overdue = OverdueBorrowing.objects.get()
+        self.assertEqual(overdue.borrowing_id, kept.id)
+        self.assertEqual(overdue.days_overdue, 3)
+        self.assertEqual(overdue.fee, Decimal("1.50"))
+
+    def test_same_day_rescan_removes_returned(self):
+        kept = self.sample_borrowing()
+        returned = self.sample_borrowing()
+        scan_day = self.today + datetime.timedelta(days=1)
+        scan_overdue(today=scan_day, notify=False)
+
+        Borrowing.objects.filter(pk=returned.pk).update(actual_return_date=scan_day)
+        result = scan_overdue(today=scan_day, notify=False)
+
+        self.assertEqual(result.removed, 1)
+        self.assertEqual(OverdueBorrowing.objects.get().borrowing_id, kept.id)
+
+    def test_rescan_of_earlier_day_removes_later_rows(self):
+        borrowing = self.sample_borrowing(days=2)
+        scan_overdue(today=self.today + datetime.timedelta(days=5), notify=False)
+
+        result = scan_overdue(
+            today=self.today + datetime.timedelta(days=1), notify=False
+        )
+
+        self.assertEqual(result.removed, 1)
+        self.assertFalse(OverdueBorrowing.objects.filter(borrowing=borrowing))
+
+    def test_queries_grow_with_batches_only(self):
+        for _ in range(6):
+            self.sample_borrowing()
+
+        with self.assertNumQueries(6):
+            # 3 batches, the empty one ending the scan, cleanup, summaries
+            scan_overdue(
+                today=self.today + datetime.timedelta(days=1),
+                batch_size=2,
+                notify=False,
+            )
+
+    def test_scan_overdue_command(self):
+        self.sample_borrowing()
+        out = StringIO()
+
+        call_command(
+            "scan_overdue",
+            "--date",
+            str(self.today + datetime.timedelta(days=2)),
+            "--no-notify",
+            stdout=out,
+        )
+
+        self.assertIn("Overdue: 1 in 1 batches, fees: 1.00", out.getvalue())
+        self.assertFalse(Notification.objects.exists())
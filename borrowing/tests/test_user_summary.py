@@ -0,0 +1,209 @@
+import datetime
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from book.models import Book
+from borrowing.models import Borrowing, UserBorrowingSummary
+from borrowing.overdue import scan_overdue
+
+BORROWING_URL = reverse("borrowing:borrowing-list")
+BULK_BORROWING_URL = reverse("borrowing:borrowing-bulk-create-borrowings")
+BULK_RETURN_URL = reverse("borrowing:borrowing-bulk-return-borrowings")
+ME_SUMMARY_URL = reverse("user:manage-summary")
+
+
+def summary_url(user_id: int):
+    return reverse("user:summary", args=[user_id])
+
+
+def return_url(borrowing_id: int):
+    return reverse("borrowing:borrowing-return-borrowing", args=[borrowing_id])
+
+
+def sample_book(**params):
+    defaults = {
+        "title": "Test Book",
+        "author": "Test author",
+        "cover": "hard",
+        "inventory": 5,
+        "daily_fee": 0.5,
+    }
+    defaults.update(params)
+
+    return Book.objects.create(**defaults)
+
+
+class UserBorrowingSummaryTests(TestCase):
+    def setUp(self):
+        self.today = datetime.date.today()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="user@user.com", password="userpass"
+        )
+        self.client.force_authenticate(self.user)
+        self.book = sample_book()
+
+    def borrow(self):
+        res = self.client.post(
+            BORROWING_URL,
+            {"book": self.book.id, "expected_return_date": str(self.today)},
+        )
+        return res.data["id"]
+
+    def assertSummary(self, active, total, overdue=0, fees="0.00"):
+        res = self.client.get(ME_SUMMARY_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res.data,
+            {
+                "user": self.user.id,
+                "active_count": active,
+                "total_count": total,
+                "overdue_count": overdue,
+                "outstanding_fees": fees,
+            },
+        )
+
+    def test_summary_of_user_without_borrowings(self):
+        self.assertSummary(active=0, total=0)
+
+    def test_borrow_and_return_update_summary(self):
+        first = self.borrow()
+        self.borrow()
+
+        self.client.post(return_url(first))
+
+        self.assertSummary(active=1, total=2)
+
+    def test_bulk_borrow_and_return_update_summary(self):
+        res = self.client.post(
+            BULK_BORROWING_URL,
+            {"books": [self.book.id] * 3, "expected_return_date": str(self.today)},
+            format="json",
+        )
+        ids = [borrowing["id"] for borrowing in res.data]
+
+        self.client.post(BULK_RETURN_URL, {"ids": ids[:2]}, format="json")
+
+        self.assertSummary(active=1, total=3)
+
+    def test_summary_is_one_query(self):
+        self.borrow()
+
+        with self.assertNumQueries(1):
+            self.client.get(ME_SUMMARY_URL)
+
+    def test_overdue_scan_updates_summary(self):
+        self.borrow()
+        self.borrow()
+
+        scan_overdue(today=self.today + datetime.timedelta(days=3), notify=False)
+
+        self.assertSummary(active=2, total=2, overdue=2, fees="3.00")
+
+    def test_book_deletion_updates_summary(self):
+        first = self.borrow()
+        self.borrow()
+        self.client.post(return_url(first))
+        book = self.book
+        self.book = sample_book(title="Other Book")
+        self.borrow()
+
+        book.delete()
+
+        self.assertSummary(active=1, total=1)
+
+    def test_rebuild_summaries(self):
+        self.borrow()
+        Borrowing.objects.create(
+            expected_return_date=self.today,
+            actual_return_date=self.today,
+            book=self.book,
+            user=self.user,
+        )
+        UserBorrowingSummary.objects.all().delete()
+        out = StringIO()
+
+        call_command("rebuild_borrowing_summaries", stdout=out)
+
+        self.assertIn("Rebuilt 1 summaries", out.getvalue())
+        self.assertSummary(active=1, total=2)
+
+    def test_user_summary_admin_only(self):
+        res = self.client.get(summary_url(self.user.id))
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class AdminUserBorrowingSummaryTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = get_user_model().objects.create_superuser(
+            email="admin@admin.com", password="adminpass"
+        )
+        self.client.force_authenticate(self.admin)
+
+    def test_retrieve_user_summary(self):
+        user = get_user_model().objects.create_user(
+            email="user@user.com", password="userpass"
+        )
+        UserBorrowingSummary.record_borrowed({user.id: 4})
+        UserBorrowingSummary.record_returned({user.id: 1})
+
+        res = self.client.get(summary_url(user.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["active_count"], 3)
+        self.assertEqual(res.data["total_count"], 4)
+        self.assertEqual(Decimal(res.data["outstanding_fees"]), 0)
+
+    def test_unknown_user_summary_not_found(self):
+        res = self.client.get(summary_url(999999))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class SummaryMigrationTests(TransactionTestCase):
+    migrate_from = [("borrowing", "0004_overdueborrowing")]
+    migrate_to = [("borrowing", "0005_userborrowingsummary")]
+
+    def migrate(self, targets):
+        return MigrationExecutor(connection).migrate(targets).apps
+
+    def tearDown(self):
+        self.migrate(MigrationExecutor(connection).loader.graph.leaf_nodes())
+
+    def test_migration_counts_existing_borrowings(self):
+        apps = self.migrate(self.migrate_from)
+        user = apps.get_model("user", "User").objects.create(email="user@user.com")
+        book = apps.get_model("book", "Book").objects.create(
+            title="Test Book",
+            author="Test author",
+            cover="hard",
+            inventory=5,
+            daily_fee=Decimal("0.50"),
+        )
+        today = datetime.date.today()
+        for actual_return_date in (None, None, today):
+            apps.get_model("borrowing", "Borrowing").objects.create(
+                book=book,
+                user=user,
+                expected_return_date=today,
+                actual_return_date=actual_return_date,
+            )
+
+        apps = self.migrate(self.migrate_to)
+        summary = apps.get_model("borrowing", "UserBorrowingSummary").objects.get()
+
+        self.assertEqual(summary.user_id, user.id)
+        self.assertEqual((summary.active_count, summary.total_count), (2, 3))
@@ -5,16 +5,34 @@ from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from book.serializers import BookSerializer
 from borrowing.models import Borrowing
 from borrowing.serializers import (
     BorrowingSerializer,
     BorrowingListSerializer,
     BorrowingDetailSerializer,
     BorrowingCreateSerializer,
+    BorrowingBulkCreateSerializer,
+    BorrowingBulkReturnSerializer,
+)
+from library_api_service.async_views import AsyncReadOnlyView
+from library_api_service.conditional import ConditionalGetMixin
+from library_api_service.fast_list import FastListMixin
+from library_api_service.sparse_fields import (
+    EXPAND_PARAMETER,
+    FIELDS_PARAMETER,
+    SparseFieldsMixin,
+)
+from library_api_service.throttling import (
+    IPSlidingWindowThrottle,
+    UserSlidingWindowThrottle,
 )
 
 
 class BorrowingViewSet(
+    SparseFieldsMixin,
+    ConditionalGetMixin,
+    FastListMixin,
     mixins.ListModelMixin,
     mixins.RetrieveModelMixin,
     mixins.CreateModelMixin,
@@ -22,6 +40,12 @@ class BorrowingViewSet(
 ):
     queryset = Borrowing.objects.select_related("book")
     permission_classes = (IsAuthenticated,)
+    # Both list and detail representations include book fields
+    validator_fields = ("updated_at", "book__updated_at")
+    expandable_fields = {"book": BookSerializer}
+    throttle_classes = (UserSlidingWindowThrottle, IPSlidingWindowThrottle)
+    throttle_scope = "borrowing_create"
+    throttled_actions = ("create", "bulk_create_borrowings")
 
     def get_queryset(self):
         queryset = self.queryset
@@ -34,13 +58,19 @@ class BorrowingViewSet(
             queryset = queryset.filter(actual_return_date__isnull=True)
 
         if not user.is_staff:
-            return queryset.filter(user=user)
+            return queryset.filter(user_id=user.id)
 
         if user_id:
             queryset = queryset.filter(user_id=user_id)
 
         return queryset
 
+    def get_throttles(self):
+        if self.action not in self.throttled_actions:
+            return []
+
+        return super().get_throttles()
+
     def get_serializer_class(self):
         if self.action == "list":
             return BorrowingListSerializer
@@ -51,10 +81,16 @@ class BorrowingViewSet(
         if self.action == "create":
             return BorrowingCreateSerializer
 
+        if self.action == "bulk_create_borrowings":
+            return BorrowingBulkCreateSerializer
+
+        if self.action == "bulk_return_borrowings":
+            return BorrowingBulkReturnSerializer
+
         return BorrowingSerializer
 
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        serializer.save(user_id=self.request.user.id)
 
     @action(
         methods=["POST"],
@@ -74,6 +110,44 @@ class BorrowingViewSet(
 
         return Response(serializer.data, status=status.HTTP_200_OK)
 
+    @extend_schema(responses={status.HTTP_201_CREATED: BorrowingSerializer(many=True)})
+    @action(
+        methods=["POST"],
+        detail=False,
+        url_path="bulk",
+        permission_classes=[
+            IsAuthenticated,
+        ],
+    )
+    def bulk_create_borrowings(self, request):
+        """Endpoint for borrowing several books at once, all or nothing"""
+        serializer = self.get_serializer(data=request.data)
+
+        serializer.is_valid(raise_exception=True)
+        borrowings = serializer.save(user_id=self.request.user.id)
+
+        return Response(
+            BorrowingSerializer(borrowings, many=True).data,
+            status=status.HTTP_201_CREATED,
+        )
+
+    @action(
+        methods=["POST"],
+        detail=False,
+        url_path="bulk-return",
+        permission_classes=[
+            IsAuthenticated,
+        ],
+    )
+    def bulk_return_borrowings(self, request):
+        """Endpoint for returning several borrowings at once"""
+        serializer = self.get_serializer(data=request.data)
+
+        serializer.is_valid(raise_exception=True)
+        results = serializer.save(queryset=self.get_queryset())
+
+        return Response({"results": results}, status=status.HTTP_200_OK)
+
     @extend_schema(
         parameters=[
             OpenApiParameter(
@@ -86,7 +160,19 @@ class BorrowingViewSet(
                 type=OpenApiTypes.BOOL,
                 description="Filter by active borrowings (ex. ?is_active=True)",
             ),
+            FIELDS_PARAMETER,
+            EXPAND_PARAMETER,
         ]
     )
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
+
+    @extend_schema(parameters=[FIELDS_PARAMETER, EXPAND_PARAMETER])
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
+
+class AsyncBorrowingView(AsyncReadOnlyView):
+    """Async list and retrieve of borrowings, same queries and representation"""
+
+    viewset_class = BorrowingViewSet
@@ -0,0 +1,10 @@
+#!/bin/sh
+# Production entrypoint: prepare the database and static files, then serve
+# the application under gunicorn (settings in gunicorn.conf.py).
+set -e
+
+python3 manage.py wait_for_db
+python3 manage.py migrate --noinput
+python3 manage.py collectstatic --noinput
+
+exec gunicorn --config gunicorn.conf.py
@@ -0,0 +1,26 @@
+"""Gunicorn settings for the production profile, overridable from the environment"""
+import multiprocessing
+import os
+
+# The ASGI app needs GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker
+wsgi_app = os.getenv("GUNICORN_APP", "library_api_service.wsgi:application")
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+
+# Requests spend most of their time waiting on Postgres, so each worker
+# process serves several of them at once from a thread pool
+workers = int(os.getenv("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+threads = int(os.getenv("GUNICORN_THREADS", 4))
+
+# Recycle workers now and then to bound memory growth, staggered so they
+# do not all restart at once
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", 2000))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", 200))
+
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 30))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", 30))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", 5))
+
+preload_app = True
+accesslog = os.getenv("GUNICORN_ACCESS_LOG", "-")
+errorlog = "-"
@@ -0,0 +1,99 @@
+"""Async-native list and retrieve views built on the DRF viewsets.
+
+DRF views are synchronous, so under ASGI each request to them occupies a
+worker thread for its whole duration. These views run the viewset's own
+queryset, permission, pagination and serializer code on the event loop
+and only await the queries, through the async ORM, so one worker can keep
+many slow connections open at once. The book cache and conditional GET
+of the sync endpoints are not applied here.
+"""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import Http404
+from django.views import View
+from rest_framework.exceptions import APIException
+from rest_framework.response import Response
+
+from library_api_service.fast_list import FastListMixin
+
+
+class AsyncReadOnlyView(View):
+    viewset_class = None
+
+    async def get(self, request, pk=None):
+        action = "list" if pk is None else "retrieve"
+        view = self.viewset_class(
+            action_map={"get": action}, args=(), kwargs=self.kwargs
+        )
+        view.request = drf_request = view.initialize_request(request)
+        view.headers = view.default_response_headers
+
+        try:
+            await self.initial(view, drf_request)
+
+            if pk is None:
+                response = await self.list(view, drf_request)
+            else:
+                response = await self.retrieve(view, drf_request, pk)
+        except Exception as exc:
+            response = view.handle_exception(exc)
+
+        response = view.finalize_response(drf_request, response)
+        return response.render()
+
+    async def initial(self, view, request):
+        view.format_kwarg = view.get_format_suffix(**view.kwargs)
+        negotiated = view.perform_content_negotiation(request)
+        request.accepted_renderer, request.accepted_media_type = negotiated
+
+        await self.authenticate(request)
+        view.check_permissions(request)
+
+        if view.get_throttles():
+            await sync_to_async(view.check_throttles)(request)
+
+    async def authenticate(self, request):
+        """Request.user without blocking, using ``aauthenticate`` if available"""
+        try:
+            for authenticator in request.authenticators:
+                if hasattr(authenticator, "aauthenticate"):
+                    user_auth = await authenticator.aauthenticate(request)
+                else:
+                    user_auth = await sync_to_async(authenticator.authenticate)(request)
+
+                if user_auth is not None:
+                    request._authenticator = authenticator
+                    request.user, request.auth = user_auth
+                    return
+        except APIException:
+            request._not_authenticated()
+            raise
+
+        request._not_authenticated()
+
+    async def list(self, view, request):
+        if settings.FAST_LIST_SERIALIZATION and isinstance(view, FastListMixin):
+            queryset = view.get_values_queryset()
+            serialize = view.get_values_serializer().to_representation
+        else:
+            queryset = view.filter_queryset(view.get_queryset())
+
+            def serialize(rows):
+                return view.get_serializer(rows, many=True).data
+
+        if view.paginator is None:
+            return Response(serialize([row async for row in queryset]))
+
+        page = await view.paginator.apaginate_queryset(queryset, request, view=view)
+        return view.get_paginated_response(serialize(page))
+
+    async def retrieve(self, view, request, pk):
+        queryset = view.filter_queryset(view.get_queryset())
+
+        try:
+            instance = await queryset.aget(**{view.lookup_field: pk})
+        except queryset.model.DoesNotExist:
+            raise Http404
+
+        view.check_object_permissions(request, instance)
+        return Response(view.get_serializer(instance).data)
@@ -0,0 +1,134 @@
+import hashlib
+
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+CONDITIONAL_HEADERS = ("HTTP_IF_NONE_MATCH", "HTTP_IF_MODIFIED_SINCE")
+
+
+def is_conditional(request, headers=CONDITIONAL_HEADERS) -> bool:
+    return any(header in request.META for header in headers)
+
+
+def get_value(instance, path: str):
+    if isinstance(instance, dict):
+        return instance[path]
+
+    for name in path.split("__"):
+        instance = getattr(instance, name)
+    return instance
+
+
+def set_validators(response, etag: str, last_modified):
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+    return response
+
+
+def not_modified_response(request, etag: str, last_modified):
+    """304 response if the client's copy is current, None otherwise"""
+    response = set_validators(HttpResponse(), etag, last_modified)
+    conditional = get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=last_modified and int(last_modified.timestamp()),
+        response=response,
+    )
+
+    return None if conditional is response else conditional
+
+
+class ConditionalGetMixin:
+    """ETag and Last-Modified for list and retrieve, from ``updated_at``.
+
+    The validators are a hash of the primary key and ``validator_fields``
+    of the rows in the response. Conditional requests first select just
+    these columns, so an unchanged resource is answered with 304 without
+    loading or serializing the rows.
+
+    Lists only get the ETag: the newest ``updated_at`` of a page goes back
+    in time when its newest row is deleted, or when an older one moves in
+    for a deleted row, so If-Modified-Since would answer 304 for a page
+    that changed.
+    """
+
+    validator_fields = ("updated_at",)
+
+    def get_validator_fields(self) -> tuple:
+        return self.validator_fields
+
+    def get_validators(self, rows, *extra):
+        digest = hashlib.md5(self.request.accepted_renderer.format.encode())
+        last_modified = None
+
+        for part in extra:
+            digest.update(f"|{part}".encode())
+
+        validator_fields = self.get_validator_fields()
+        for row in rows:
+            digest.update(f"|{get_value(row, 'pk')}".encode())
+
+            for field in validator_fields:
+                value = get_value(row, field)
+                digest.update(f":{value.isoformat()}".encode())
+                last_modified = max(last_modified or value, value)
+
+        return f'W/"{digest.hexdigest()}"', last_modified
+
+    def get_page_validators(self):
+        etag, _ = self.get_validators(
+            self.paginator.page, self.paginator.has_next, self.paginator.has_previous
+        )
+        return etag, None
+
+    def list(self, request, *args, **kwargs):
+        if self.paginator is None:
+            return super().list(request, *args, **kwargs)
+
+        if is_conditional(request, headers=("HTTP_IF_NONE_MATCH",)):
+            queryset = self.filter_queryset(self.get_queryset())
+            ordering = self.paginator.get_ordering(request, queryset, self)
+            rows = queryset.values(
+                "pk",
+                *{field.lstrip("-") for field in ordering} - {"pk"},
+                *self.get_validator_fields(),
+            )
+            self.paginator.paginate_queryset(rows, request, view=self)
+
+            not_modified = not_modified_response(request, *self.get_page_validators())
+            if not_modified:
+                return not_modified
+
+        response = super().list(request, *args, **kwargs)
+
+        if response.status_code == 200:
+            set_validators(response, *self.get_page_validators())
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        if is_conditional(request):
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            row = (
+                self.filter_queryset(self.get_queryset())
+                .filter(**{self.lookup_field: kwargs[lookup_url_kwarg]})
+                .values("pk", *self.get_validator_fields())
+                .first()
+            )
+            if row:
+                not_modified = not_modified_response(
+                    request, *self.get_validators([row])
+                )
+                if not_modified:
+                    return not_modified
+
+        response = super().retrieve(request, *args, **kwargs)
+
+        if response.status_code == 200:
+            set_validators(response, *self.get_validators([self.object]))
+        return response
+
+    def get_object(self):
+        self.object = super().get_object()
+        return self.object
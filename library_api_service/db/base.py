@@ -0,0 +1,57 @@
+"""PostgreSQL backend drawing its connections from a ConnectionPool.
+
+Enable it with ``"ENGINE": "library_api_service.db"`` and size it with the
+``POOL`` entry of the database settings. Closing a connection, which Django
+does at the end of each request unless ``CONN_MAX_AGE`` keeps it, hands it
+back to the pool instead.
+"""
+from django.db.backends.postgresql import base, creation
+
+from library_api_service.db.pool import close_idle_connections, get_pool
+
+POOL_DEFAULTS = {"MAX_SIZE": 10, "TIMEOUT": 10, "MAX_IDLE": 300}
+
+
+class DatabaseCreation(creation.DatabaseCreation):
+    def _destroy_test_db(self, test_database_name, verbosity):
+        # Idle pooled connections would keep the test database in use
+        close_idle_connections()
+        super()._destroy_test_db(test_database_name, verbosity)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    creation_class = DatabaseCreation
+    pool = None
+
+    def get_pool(self, conn_params: dict):
+        options = {**POOL_DEFAULTS, **self.settings_dict.get("POOL", {})}
+        key = (
+            self.alias,
+            sorted((name, repr(value)) for name, value in conn_params.items()),
+        )
+
+        return get_pool(
+            repr(key),
+            self.alias,
+            max_size=options["MAX_SIZE"],
+            timeout=options["TIMEOUT"],
+            max_idle=options["MAX_IDLE"],
+        )
+
+    def get_new_connection(self, conn_params):
+        self.pool = self.get_pool(conn_params)
+        return self.pool.acquire(
+            lambda: super(DatabaseWrapper, self).get_new_connection(conn_params)
+        )
+
+    def connect(self):
+        super().connect()
+        # A pooled connection may have died while idle, so let Django check
+        # it before the first query when health checks are enabled
+        self.health_check_done = False
+
+    def _close(self):
+        if self.connection is not None:
+            # Closed inside atomic(), the wrapper keeps the connection until
+            # the block exits, so it must not be handed to anybody else
+            self.pool.release(self.connection, discard=self.in_atomic_block)
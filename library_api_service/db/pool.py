@@ -0,0 +1,200 @@
+"""Process-wide pools of psycopg2 connections, one per database.
+
+At most ``max_size`` connections are checked out at once; further callers
+wait up to ``timeout`` seconds for one to be returned. Returned
+connections are rolled back if needed and kept for the next caller,
+unless they are broken or idled longer than ``max_idle`` seconds.
+
+Django's connections are per thread. Under ASGI each request runs its
+sync code in a thread of its own, and a client disconnecting early can
+skip the request_finished signal that closes the connection, so the
+connections of threads that have exited are reclaimed when the pool runs
+out of them.
+"""
+import collections
+import threading
+import time
+
+from django.db.utils import OperationalError
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE, TRANSACTION_STATUS_UNKNOWN
+
+from library_api_service.metrics import registry
+
+pool_size = registry.gauge(
+    "db_pool_size", "Maximum number of connections of the pool", ("alias",)
+)
+pool_connections = registry.gauge(
+    "db_pool_connections",
+    "Open connections of the pool by state (in_use or idle)",
+    ("alias", "state"),
+)
+pool_waiting = registry.gauge(
+    "db_pool_waiting", "Callers waiting for a connection of the pool", ("alias",)
+)
+pool_wait_duration = registry.histogram(
+    "db_pool_wait_seconds", "Time spent waiting for a connection", ("alias",)
+)
+pool_reclaimed = registry.counter(
+    "db_pool_reclaimed_total",
+    "Connections taken back from threads that exited without returning them",
+    ("alias",),
+)
+pool_timeouts = registry.counter(
+    "db_pool_timeouts_total",
+    "Callers that gave up waiting for a connection",
+    ("alias",),
+)
+
+pools = {}
+pools_lock = threading.Lock()
+
+
+class PoolTimeout(OperationalError):
+    pass
+
+
+def close_quietly(connection):
+    try:
+        connection.close()
+    except Exception:
+        pass
+
+
+class ConnectionPool:
+    def __init__(self, alias: str, max_size: int, timeout: float, max_idle: float):
+        self.alias = alias
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.in_use = 0
+        self.waiting = 0
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._idle = collections.deque()
+        self._owners = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, connect):
+        """Check out a connection, the most recently returned one or ``connect()``"""
+        with self._lock:
+            self.waiting += 1
+
+        start = time.perf_counter()
+        try:
+            acquired = self._slots.acquire(blocking=False)
+            if not acquired:
+                self.reclaim()
+                acquired = self._slots.acquire(timeout=self.timeout)
+        finally:
+            with self._lock:
+                self.waiting -= 1
+
+        pool_wait_duration.observe(time.perf_counter() - start, alias=self.alias)
+        if not acquired:
+            pool_timeouts.inc(alias=self.alias)
+            raise PoolTimeout(
+                f"No connection of the {self.alias!r} pool became available "
+                f"within {self.timeout} seconds ({self.max_size} in use)"
+            )
+
+        try:
+            connection = self._pop_idle() or connect()
+        except BaseException:
+            self._slots.release()
+            raise
+
+        with self._lock:
+            self.in_use += 1
+            self._owners[connection] = threading.current_thread()
+        return connection
+
+    def _pop_idle(self):
+        while True:
+            with self._lock:
+                if not self._idle:
+                    return None
+                connection, returned_at = self._idle.pop()
+
+            if connection.closed or time.monotonic() - returned_at > self.max_idle:
+                close_quietly(connection)
+                continue
+
+            return connection
+
+    def release(self, connection, discard: bool = False):
+        """Return a connection, closing it when broken or ``discard`` is set"""
+        try:
+            if not discard and not connection.closed:
+                status = connection.info.transaction_status
+                if status == TRANSACTION_STATUS_UNKNOWN:
+                    discard = True
+                elif status != TRANSACTION_STATUS_IDLE:
+                    connection.rollback()
+        except Exception:
+            discard = True
+
+        try:
+            if discard or connection.closed:
+                close_quietly(connection)
+            else:
+                with self._lock:
+                    self._idle.append((connection, time.monotonic()))
+        finally:
+            with self._lock:
+                self.in_use -= 1
+                self._owners.pop(connection, None)
+            self._slots.release()
+
+    def reclaim(self) -> int:
+        """Return the connections checked out by threads that have exited"""
+        with self._lock:
+            leaked = [
+                connection
+                for connection, owner in self._owners.items()
+                if not owner.is_alive()
+            ]
+
+        for connection in leaked:
+            self.release(connection)
+            pool_reclaimed.inc(alias=self.alias)
+        return len(leaked)
+
+    def close_idle(self) -> int:
+        """Close the idle connections, e.g. before dropping the database"""
+        with self._lock:
+            idle = [connection for connection, _ in self._idle]
+            self._idle.clear()
+
+        for connection in idle:
+            close_quietly(connection)
+        return len(idle)
+
+    @property
+    def idle(self) -> int:
+        return len(self._idle)
+
+
+def get_pool(key, alias: str, **options) -> ConnectionPool:
+    with pools_lock:
+        if key not in pools:
+            pools[key] = ConnectionPool(alias, **options)
+        return pools[key]
+
+
+def close_idle_connections() -> int:
+    with pools_lock:
+        current = list(pools.values())
+    return sum(pool.close_idle() for pool in current)
+
+
+def collect_pool_stats():
+    with pools_lock:
+        current = list(pools.values())
+
+    for pool in current:
+        pool_size.set(pool.max_size, alias=pool.alias)
+        pool_connections.set(pool.in_use, alias=pool.alias, state="in_use")
+        pool_connections.set(pool.idle, alias=pool.alias, state="idle")
+        pool_waiting.set(pool.waiting, alias=pool.alias)
+
+
+registry.register_collector(collect_pool_stats)
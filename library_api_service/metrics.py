@@ -0,0 +1,197 @@
+"""In-process Prometheus-style metrics.
+
+Values live in the memory of each worker process, so every worker has to
+be scraped (or a single one run per container) to get the full picture.
+"""
+import bisect
+import threading
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+def format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+
+    pairs = ",".join(
+        '{}="{}"'.format(name, str(value).replace("\\", "\\\\").replace('"', '\\"'))
+        for name, value in labels.items()
+    )
+    return "{" + pairs + "}"
+
+
+def format_value(value) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    kind = None
+
+    def __init__(self, name: str, documentation: str, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+    def render(self) -> list:
+        with self._lock:
+            values = [(key, self._copy(value)) for key, value in self._values.items()]
+
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        for key, value in values:
+            lines += self._render_sample(dict(zip(self.labelnames, key)), value)
+
+        return lines
+
+    def _copy(self, value):
+        return value
+
+    def _render_sample(self, labels: dict, value) -> list:
+        return [f"{self.name}{format_labels(labels)} {format_value(value)}"]
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels):
+        return self._values.get(self._key(labels), 0)
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+
+        with self._lock:
+            sample = self._values.get(key)
+            if sample is None:
+                sample = self._values[key] = [[0] * len(self.buckets), 0, 0]
+
+            if index < len(self.buckets):
+                sample[0][index] += 1
+            sample[1] += 1
+            sample[2] += value
+
+    def get_count(self, **labels) -> int:
+        sample = self._values.get(self._key(labels))
+        return sample[1] if sample else 0
+
+    def get_sum(self, **labels):
+        sample = self._values.get(self._key(labels))
+        return sample[2] if sample else 0
+
+    def _copy(self, value):
+        return [list(value[0]), value[1], value[2]]
+
+    def _render_sample(self, labels: dict, value) -> list:
+        bucket_counts, count, total = value
+        lines = []
+        cumulative = 0
+
+        for bucket, bucket_count in zip(self.buckets, bucket_counts):
+            cumulative += bucket_count
+            bucket_labels = {**labels, "le": format_value(float(bucket))}
+            lines.append(
+                f"{self.name}_bucket{format_labels(bucket_labels)} {cumulative}"
+            )
+
+        lines += [
+            f"{self.name}_bucket{format_labels({**labels, 'le': '+Inf'})} {count}",
+            f"{self.name}_sum{format_labels(labels)} {format_value(total)}",
+            f"{self.name}_count{format_labels(labels)} {count}",
+        ]
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = []
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics.setdefault(metric.name, metric)
+        return self._metrics[metric.name]
+
+    def counter(self, name, documentation, labelnames=()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), **kwargs) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, **kwargs))
+
+    def register_collector(self, collector):
+        """Add a callable that refreshes gauges right before rendering"""
+        if collector not in self._collectors:
+            self._collectors.append(collector)
+
+    def clear(self):
+        for metric in self._metrics.values():
+            metric.clear()
+
+    def render(self) -> str:
+        for collector in self._collectors:
+            collector()
+
+        lines = []
+        for metric in self._metrics.values():
+            lines += metric.render()
+
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+request_duration = registry.histogram(
+    "http_request_duration_seconds",
+    "Sampled request latency by view",
+    ("view", "method"),
+)
+requests_total = registry.counter(
+    "http_requests_total",
+    "Sampled requests by view and status code",
+    ("view", "method", "status"),
+)
+db_queries = registry.histogram(
+    "http_request_db_queries",
+    "Sampled number of SQL queries per request by view",
+    ("view", "method"),
+    buckets=QUERY_COUNT_BUCKETS,
+)
+db_duration = registry.histogram(
+    "http_request_db_duration_seconds",
+    "Sampled time spent in SQL queries per request by view",
+    ("view", "method"),
+)
@@ -0,0 +1,98 @@
+import random
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import (
+    iscoroutinefunction,
+    markcoroutinefunction,
+    sync_to_async,
+)
+from django.conf import settings
+from django.db import connections
+
+from library_api_service.metrics import (
+    db_duration,
+    db_queries,
+    request_duration,
+    requests_total,
+)
+
+
+class QueryCounter:
+    """Execute wrapper that counts queries and the time spent running them"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - start
+
+
+class RequestMetricsMiddleware:
+    """Record latency and DB usage per resolved view for a sample of requests"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        if random.random() >= settings.METRICS_SAMPLE_RATE:
+            return self.get_response(request)
+
+        counter = QueryCounter()
+        start = time.perf_counter()
+
+        with self.count_queries(counter):
+            response = self.get_response(request)
+
+        self.record(request, response, counter, time.perf_counter() - start)
+        return response
+
+    async def __acall__(self, request):
+        if random.random() >= settings.METRICS_SAMPLE_RATE:
+            return await self.get_response(request)
+
+        counter = QueryCounter()
+        start = time.perf_counter()
+
+        # Connections are per thread and the queries of async views run on
+        # the request's thread-sensitive executor, not on the event loop
+        stack = await sync_to_async(self.count_queries)(counter)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+
+        self.record(request, response, counter, time.perf_counter() - start)
+        return response
+
+    def count_queries(self, counter: QueryCounter) -> ExitStack:
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(counter))
+        return stack
+
+    def record(self, request, response, counter: QueryCounter, duration: float):
+        match = request.resolver_match
+        labels = {
+            "view": match.view_name if match else "unresolved",
+            "method": request.method,
+        }
+        request_duration.observe(duration, **labels)
+        db_queries.observe(counter.count, **labels)
+        db_duration.observe(counter.duration, **labels)
+        requests_total.inc(**labels, status=response.status_code)
@@ -0,0 +1,198 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination
+from rest_framework.utils.urls import replace_query_param
+
+
+def reverse_ordering(ordering):
+    return tuple(
+        field[1:] if field.startswith("-") else f"-{field}" for field in ordering
+    )
+
+
+class KeysetPagination(CursorPagination):
+    """Cursor pagination over a unique, composite ordering.
+
+    The cursor stores the values of every ordering field of the boundary
+    row, and the next page is fetched with a row comparison such as
+    ``borrow_date <= d AND (borrow_date < d OR (borrow_date = d AND id > i))``,
+    whose leading bound is an index condition. Unlike offset
+    pagination, the cost of a page does not grow with its depth.
+    """
+
+    ordering = None
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+
+        return self.set_page(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """paginate_queryset() for async views, fetching with the async ORM"""
+        queryset = self.get_page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+
+        return self.set_page([row async for row in queryset])
+
+    def get_page_queryset(self, queryset, request, view=None):
+        """The rows of the requested page, plus one telling if there are more"""
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.model = queryset.model
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+
+        if self.cursor and self.cursor.reverse:
+            queryset = queryset.order_by(*reverse_ordering(self.ordering))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        if self.cursor is not None:
+            queryset = queryset.filter(self.get_keyset_filter(self.cursor))
+
+        return queryset[: self.page_size + 1]
+
+    def set_page(self, results: list) -> list:
+        self.page = results[: self.page_size]
+        has_more = len(results) > self.page_size
+
+        if self.cursor and self.cursor.reverse:
+            self.page.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.cursor is not None
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def get_ordering(self, request, queryset, view):
+        """Use the queryset ordering, made unique with a primary key tiebreak"""
+        ordering = self.ordering or (
+            queryset.query.order_by or queryset.model._meta.ordering
+        )
+        ordering = tuple(ordering)
+
+        pk_name = queryset.model._meta.pk.name
+        if not any(field.lstrip("-") in ("pk", pk_name) for field in ordering):
+            ordering += (pk_name,)
+
+        assert all("__" not in field for field in ordering), (
+            "Keyset pagination does not support double underscore lookups "
+            "for orderings."
+        )
+
+        return ordering
+
+    def get_keyset_filter(self, cursor):
+        ordering = self.ordering
+        if cursor.reverse:
+            ordering = reverse_ordering(ordering)
+
+        keyset_filter = Q()
+        equal_prefix = Q()
+
+        for field, value in zip(ordering, cursor.position):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+
+            keyset_filter |= equal_prefix & Q(**{f"{name}__{lookup}": value})
+            equal_prefix &= Q(**{name: value})
+
+        # Redundant bound on the leading field, which Postgres can use as an
+        # index condition instead of filtering every row before the cursor
+        field, value = ordering[0], cursor.position[0]
+        lookup = "lte" if field.startswith("-") else "gte"
+
+        return Q(**{f"{field.lstrip('-')}__{lookup}": value}) & keyset_filter
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+
+        position = (
+            self._get_position_from_instance(self.page[-1], self.ordering)
+            if self.page
+            else self.cursor.position
+        )
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=position))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+
+        position = (
+            self._get_position_from_instance(self.page[0], self.ordering)
+            if self.page
+            else self.cursor.position
+        )
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=position))
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            tokens = json.loads(urlsafe_b64decode(encoded.encode("ascii")))
+            values = tokens["p"]
+
+            if len(values) != len(self.ordering):
+                raise ValueError
+
+            position = tuple(
+                self._to_python(field, value)
+                for field, value in zip(self.ordering, values)
+            )
+            reverse = bool(tokens.get("r"))
+        except (
+            BinasciiError,
+            KeyError,
+            TypeError,
+            ValueError,
+            ValidationError,
+        ):
+            raise NotFound(self.invalid_cursor_message)
+
+        return Cursor(offset=0, reverse=reverse, position=position)
+
+    def encode_cursor(self, cursor):
+        tokens = {"p": cursor.position}
+        if cursor.reverse:
+            tokens["r"] = 1
+
+        encoded = urlsafe_b64encode(
+            json.dumps(tokens, cls=DjangoJSONEncoder, separators=(",", ":")).encode()
+        ).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def _get_position_from_instance(self, instance, ordering):
+        names = [field.lstrip("-") for field in ordering]
+
+        if isinstance(instance, dict):
+            return tuple(instance[name] for name in names)
+        return tuple(getattr(instance, name) for name in names)
+
+    def _to_python(self, field, value):
+        try:
+            model_field = self.model._meta.get_field(field.lstrip("-"))
+        except FieldDoesNotExist:
+            return value
+        return model_field.to_python(value)
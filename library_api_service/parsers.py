@@ -0,0 +1,43 @@
+import codecs
+import io
+import re
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+from django.conf import settings
+from rest_framework.parsers import JSONParser
+
+from library_api_service.renderers import ORJSONRenderer
+
+# orjson reads integers beyond 64 bits as floats
+LONG_NUMBER = re.compile(rb"\d{19}")
+
+
+class ORJSONParser(JSONParser):
+    """JSONParser reading UTF-8 bodies with orjson when it is installed.
+
+    Bodies with very long numbers and those orjson rejects are parsed with
+    the stdlib, which reads big integers exactly, accepts what it does
+    (lone surrogates) and reports errors with the usual messages.
+    """
+
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+
+        if orjson is None or codecs.lookup(encoding).name != "utf-8":
+            return super().parse(stream, media_type, parser_context)
+
+        content = stream.read()
+        if LONG_NUMBER.search(content):
+            return super().parse(io.BytesIO(content), media_type, parser_context)
+
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            return super().parse(io.BytesIO(content), media_type, parser_context)
@@ -0,0 +1,39 @@
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+from rest_framework.renderers import JSONRenderer
+
+
+class ORJSONRenderer(JSONRenderer):
+    """JSONRenderer writing the same bytes with orjson when it is installed.
+
+    Dates, times and the types orjson does not know (Decimal, lazy strings,
+    bytes, ...) are encoded by DRF's JSONEncoder. Indented output, as the
+    browsable API asks for, and non-default JSON settings use the stdlib
+    encoder. Floats in exponent notation are spelled differently (1e16, not
+    1e+16) and NaN renders as null where the stdlib encoder fails.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None
+            or data is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(
+            data,
+            default=self.encoder_class().default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME,
+        )
+
+        # Escaped like JSONRenderer does, to keep the output a javascript subset
+        if b"\xe2\x80" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028")
+            ret = ret.replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.0/ref/settings/
 """
 import os
+import sys
 from datetime import timedelta
 from pathlib import Path
 from dotenv import load_dotenv
@@ -41,15 +42,19 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "rest_framework",
     "drf_spectacular",
     "book",
     "user",
     "borrowing",
+    "telegram_helper",
+    "benchmarks",
     "debug_toolbar",
 ]
 
 MIDDLEWARE = [
+    "library_api_service.middleware.RequestMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "debug_toolbar.middleware.DebugToolbarMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -64,6 +69,12 @@ INTERNAL_IPS = [
     "127.0.0.1",
 ]
 
+# Share of requests measured by RequestMetricsMiddleware, from 0 to 1
+METRICS_SAMPLE_RATE = float(os.getenv("METRICS_SAMPLE_RATE", 1))
+
+# Addresses allowed to scrape /metrics, everyone when empty
+METRICS_ALLOWED_IPS = os.getenv("METRICS_ALLOWED_IPS", "127.0.0.1").split(",")
+
 ROOT_URLCONF = "library_api_service.urls"
 
 TEMPLATES = [
@@ -98,6 +109,68 @@ DATABASES = {
     }
 }
 
+# Pool of connections shared by the threads of each process, enabled with
+# DB_POOL_SIZE (see library_api_service/db/base.py)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 0))
+
+if DB_POOL_SIZE:
+    DATABASES["default"]["ENGINE"] = "library_api_service.db"
+    DATABASES["default"]["POOL"] = {
+        "MAX_SIZE": DB_POOL_SIZE,
+        "TIMEOUT": float(os.getenv("DB_POOL_TIMEOUT", 10)),
+        "MAX_IDLE": float(os.getenv("DB_POOL_MAX_IDLE", 300)),
+    }
+
+# PgBouncer in transaction pooling mode: server-side cursors (iterator())
+# would not survive from one transaction to the next
+if os.getenv("DB_PGBOUNCER"):
+    DATABASES["default"]["DISABLE_SERVER_SIDE_CURSORS"] = True
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+
+REDIS_URL = os.getenv("REDIS_URL")
+
+# Token revocations must never be evicted, or revoked tokens would be
+# accepted again: with Redis, point REVOCATION_REDIS_URL at an instance
+# with maxmemory-policy noeviction (or volatile-ttl, the keys all expire)
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        },
+        "revocations": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.getenv("REVOCATION_REDIS_URL", REDIS_URL),
+        },
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        },
+        "revocations": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "revocations",
+            # Never culled, entries expire with the refresh tokens
+            "OPTIONS": {"MAX_ENTRIES": sys.maxsize},
+        },
+    }
+
+BOOK_CACHE_ALIAS = "default"
+BOOK_CACHE_TIMEOUT = 60 * 5
+
+# Serialize book and borrowing lists from values() rows, see fast_list.py
+FAST_LIST_SERIALIZATION = bool(os.getenv("FAST_LIST_SERIALIZATION"))
+
+# Counters of the throttles, shared by all processes only with Redis
+THROTTLE_CACHE_ALIAS = "default"
+DISABLE_THROTTLING = bool(os.getenv("DISABLE_THROTTLING"))
+
+TEST_RUNNER = "library_api_service.test_runner.TestRunner"
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
@@ -143,9 +216,33 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "user.authentication.StatelessJWTAuthentication",
     ),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    # Same output as DRF's JSON renderer and parser, encoded with orjson
+    "DEFAULT_RENDERER_CLASSES": (
+        "library_api_service.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "library_api_service.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
+    "DEFAULT_PAGINATION_CLASS": "library_api_service.pagination.KeysetPagination",
+    "PAGE_SIZE": 20,
+    # Sliding window rates of the throttled views, per user and per client
+    # address, see throttling.py
+    "DEFAULT_THROTTLE_RATES": {
+        "token.user": os.getenv("THROTTLE_TOKEN_USER_RATE", "10/min"),
+        "token.ip": os.getenv("THROTTLE_TOKEN_IP_RATE", "30/min"),
+        "register.ip": os.getenv("THROTTLE_REGISTER_IP_RATE", "20/hour"),
+        "borrowing_create.user": os.getenv("THROTTLE_BORROWING_USER_RATE", "60/min"),
+        "borrowing_create.ip": os.getenv("THROTTLE_BORROWING_IP_RATE", "120/min"),
+    },
+    # Proxies in front of the server, whose X-Forwarded-For addresses are
+    # trusted by the per address throttles
+    "NUM_PROXIES": int(os.getenv("NUM_PROXIES", 0)),
 }
 
 SPECTACULAR_SETTINGS = {
@@ -166,7 +263,30 @@ SIMPLE_JWT = {
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
     "ROTATE_REFRESH_TOKENS": False,
     "AUTH_HEADER_NAME": "HTTP_AUTHORIZE",
+    "TOKEN_OBTAIN_SERIALIZER": "user.serializers.TokenObtainPairWithClaimsSerializer",
+    "TOKEN_USER_CLASS": "user.authentication.ClaimsUser",
 }
 
+# Seconds a process trusts its copy of a user's token revocation time.
+# Revocations live in their own cache, so with the local memory cache
+# they only reach the process that made them.
+JWT_REVOCATION_CACHE_TTL = int(os.getenv("JWT_REVOCATION_CACHE_TTL", 5))
+JWT_REVOCATION_CACHE_ALIAS = "revocations"
+
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
 TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
+TELEGRAM_TRANSPORT = os.getenv(
+    "TELEGRAM_TRANSPORT", "telegram_helper.transports.TelegramTransport"
+)
+
+BORROWING_BULK_MAX_SIZE = 100
+
+OVERDUE_SCAN_BATCH_SIZE = 1000
+
+NOTIFICATION_BATCH_SIZE = 50
+NOTIFICATION_MAX_ATTEMPTS = 5
+NOTIFICATION_RETRY_BASE_DELAY = 30
+NOTIFICATION_RETRY_MAX_DELAY = 60 * 60
+# Seconds a dispatcher has to send its batch before the notifications it
+# claimed are handed to another one
+NOTIFICATION_LEASE_TIMEOUT = 5 * 60
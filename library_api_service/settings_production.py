@@ -0,0 +1,38 @@
+"""
+Production settings: the development settings without debugging aids.
+
+Select them with DJANGO_SETTINGS_MODULE=library_api_service.settings_production,
+see gunicorn.conf.py and entrypoint.sh for the server they are run under.
+"""
+import os
+
+from library_api_service.settings import *  # noqa: F401,F403
+from library_api_service.settings import DATABASES, INSTALLED_APPS, MIDDLEWARE
+
+DEBUG = False
+
+ALLOWED_HOSTS = os.getenv("DJANGO_ALLOWED_HOSTS", "localhost").split(",")
+
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app != "debug_toolbar"]
+
+MIDDLEWARE = [
+    middleware
+    for middleware in MIDDLEWARE
+    if middleware != "debug_toolbar.middleware.DebugToolbarMiddleware"
+]
+
+# Keep connections open across requests, one per worker thread, and check
+# them before reuse so a restarted database does not fail the next request.
+# With DB_POOL_SIZE they go back to the shared pool after each request.
+DATABASES = {
+    **DATABASES,
+    "default": {
+        **DATABASES["default"],
+        "CONN_MAX_AGE": int(
+            os.getenv("DB_CONN_MAX_AGE", 0 if "POOL" in DATABASES["default"] else 600)
+        ),
+        "CONN_HEALTH_CHECKS": True,
+    },
+}
+
+STATIC_ROOT = os.getenv("DJANGO_STATIC_ROOT", "/vol/web/static")
@@ -0,0 +1,194 @@
+"""Sparse fieldsets for list and retrieve: ``?fields=`` and ``?expand=``.
+
+``?fields=id,borrow_date`` keeps only the named fields of the response and
+``?expand=book`` nests the related object instead of its id, for the
+relations a view lists in ``expandable_fields``. The queryset then loads
+just the columns the remaining fields read with ``only()``, and joins a
+relation only when one of them goes through it.
+"""
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+SPARSE_ACTIONS = ("list", "retrieve")
+
+FIELDS_PARAMETER = OpenApiParameter(
+    "fields",
+    type=OpenApiTypes.STR,
+    description="Comma separated fields to return (ex. ?fields=id,title)",
+)
+EXPAND_PARAMETER = OpenApiParameter(
+    "expand",
+    type=OpenApiTypes.STR,
+    description="Comma separated relations to return as nested objects "
+    "(ex. ?expand=book)",
+)
+
+
+def split_names(value: str) -> tuple:
+    names = (name.strip() for name in value.split(","))
+    return tuple(dict.fromkeys(name for name in names if name))
+
+
+def select_fields(serializer, fields=None, expand=()):
+    """Keep the ``fields`` of the serializer and nest the ``expand`` ones"""
+    expanded = dict(expand)
+
+    for name, serializer_class in expanded.items():
+        serializer.fields[name] = serializer_class(read_only=True)
+
+    if fields is not None:
+        for name in list(serializer.fields):
+            if name not in fields and name not in expanded:
+                del serializer.fields[name]
+
+    return serializer
+
+
+@lru_cache(maxsize=None)
+def get_field_names(serializer_class) -> tuple:
+    return tuple(serializer_class().fields)
+
+
+def is_concrete(model, name: str) -> bool:
+    try:
+        return model._meta.get_field(name).concrete
+    except FieldDoesNotExist:
+        return False
+
+
+def get_columns(serializer, prefix: str = ""):
+    """Model fields and relations read by the serializer, None if unknown.
+
+    Properties are resolved through ``Meta.property_fields``, which maps
+    their names to the model fields they read.
+    """
+    model = serializer.Meta.model
+    property_fields = getattr(serializer.Meta, "property_fields", {})
+    columns = [prefix + model._meta.pk.name]
+    relations = []
+
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+
+        path = "__".join(field.source_attrs)
+
+        if field.source == "*" or isinstance(field, serializers.ListSerializer):
+            return None
+
+        if isinstance(field, serializers.BaseSerializer):
+            nested = get_columns(field, f"{prefix}{path}__")
+            if nested is None:
+                return None
+
+            columns += [prefix + path, *nested[0]]
+            relations += [prefix + path, *nested[1]]
+        elif field.source in property_fields:
+            columns += [prefix + name for name in property_fields[field.source]]
+        elif len(field.source_attrs) > 1:
+            relation = prefix + "__".join(field.source_attrs[:-1])
+            columns += [relation, prefix + path]
+            relations.append(relation)
+        elif is_concrete(model, path):
+            columns.append(prefix + path)
+        else:
+            return None
+
+    return columns, relations
+
+
+class SparseFieldsMixin:
+    """``?fields=`` and ``?expand=`` for the list and retrieve actions"""
+
+    expandable_fields = {}
+    selected_relations = None
+
+    def get_field_selection(self):
+        """The ``fields`` to keep (None for all) and ``(name, serializer)`` to expand"""
+        if self.action not in SPARSE_ACTIONS:
+            return None, ()
+
+        if not hasattr(self, "_field_selection"):
+            self._field_selection = self.parse_field_selection()
+        return self._field_selection
+
+    def parse_field_selection(self):
+        params = self.request.query_params
+        expand = split_names(params.get("expand", ""))
+
+        unknown = [name for name in expand if name not in self.expandable_fields]
+        if unknown:
+            raise ValidationError(
+                {
+                    "expand": f"Can't expand {unknown}, "
+                    f"choose from {sorted(self.expandable_fields)}."
+                }
+            )
+
+        fields = split_names(params.get("fields", "")) or None
+        if fields is not None:
+            available = {*get_field_names(self.get_serializer_class()), *expand}
+            unknown = [name for name in fields if name not in available]
+
+            if unknown:
+                choices = sorted(available | set(self.expandable_fields))
+                raise ValidationError(
+                    {"fields": f"Unknown fields {unknown}, choose from {choices}."}
+                )
+
+        return fields, tuple((name, self.expandable_fields[name]) for name in expand)
+
+    def is_sparse(self) -> bool:
+        return self.get_field_selection() != (None, ())
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+
+        if self.is_sparse():
+            select_fields(
+                getattr(serializer, "child", serializer), *self.get_field_selection()
+            )
+        return serializer
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+
+        if not self.is_sparse():
+            return queryset
+
+        columns = get_columns(self.get_serializer())
+        if columns is None:
+            return queryset
+
+        columns, self.selected_relations = columns
+        model = queryset.model
+        if self.paginator is not None and self.action == "list":
+            ordering = self.paginator.get_ordering(self.request, queryset, self)
+            columns += [
+                name
+                for name in (field.lstrip("-") for field in ordering)
+                if is_concrete(model, name)
+            ]
+
+        queryset = queryset.select_related(None)
+        if self.selected_relations:
+            queryset = queryset.select_related(*self.selected_relations)
+
+        return queryset.only(*dict.fromkeys(columns), *self.get_validator_fields())
+
+    def get_validator_fields(self) -> tuple:
+        """Validators of the selected relations only, when they are narrowed"""
+        fields = super().get_validator_fields()
+
+        if self.selected_relations is None:
+            return fields
+        return tuple(
+            field
+            for field in fields
+            if "__" not in field or field.rsplit("__", 1)[0] in self.selected_relations
+        )
@@ -0,0 +1,165 @@
+import threading
+from types import SimpleNamespace
+
+from django.db import connection, connections
+from django.test import SimpleTestCase
+from psycopg2.extensions import (
+    TRANSACTION_STATUS_IDLE,
+    TRANSACTION_STATUS_INTRANS,
+    TRANSACTION_STATUS_UNKNOWN,
+)
+
+from library_api_service.db.base import DatabaseWrapper
+from library_api_service.db.pool import (
+    ConnectionPool,
+    PoolTimeout,
+    pool_reclaimed,
+    pool_timeouts,
+    pools,
+)
+from library_api_service.metrics import registry
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = 0
+        self.rolled_back = False
+        self.info = SimpleNamespace(transaction_status=TRANSACTION_STATUS_IDLE)
+
+    def rollback(self):
+        self.rolled_back = True
+        self.info.transaction_status = TRANSACTION_STATUS_IDLE
+
+    def close(self):
+        self.closed = 1
+
+
+class ConnectionPoolTests(SimpleTestCase):
+    def setUp(self):
+        self.pool = ConnectionPool("test", max_size=2, timeout=0.05, max_idle=60)
+
+    def test_released_connection_is_reused(self):
+        first = self.pool.acquire(FakeConnection)
+        self.pool.release(first)
+
+        self.assertIs(self.pool.acquire(FakeConnection), first)
+        self.assertEqual(self.pool.in_use, 1)
+        self.assertEqual(self.pool.idle, 0)
+
+    def test_acquire_times_out_when_exhausted(self):
+        self.pool.acquire(FakeConnection)
+        self.pool.acquire(FakeConnection)
+        timeouts = pool_timeouts.get(alias="test")
+
+        with self.assertRaises(PoolTimeout):
+            self.pool.acquire(FakeConnection)
+
+        self.assertEqual(pool_timeouts.get(alias="test"), timeouts + 1)
+
+    def test_waiter_gets_released_connection(self):
+        held = [self.pool.acquire(FakeConnection) for _ in range(2)]
+        self.pool.timeout = 5
+        acquired = []
+
+        waiter = threading.Thread(
+            target=lambda: acquired.append(self.pool.acquire(FakeConnection))
+        )
+        waiter.start()
+        self.pool.release(held[0])
+        waiter.join()
+
+        self.assertEqual(acquired, [held[0]])
+
+    def test_connection_of_exited_thread_is_reclaimed(self):
+        leaked = []
+        owner = threading.Thread(
+            target=lambda: leaked.append(self.pool.acquire(FakeConnection))
+        )
+        owner.start()
+        owner.join()
+        self.pool.acquire(FakeConnection)
+        reclaimed = pool_reclaimed.get(alias="test")
+
+        self.assertIs(self.pool.acquire(FakeConnection), leaked[0])
+        self.assertEqual(self.pool.in_use, 2)
+        self.assertEqual(pool_reclaimed.get(alias="test"), reclaimed + 1)
+
+    def test_open_transaction_is_rolled_back(self):
+        pooled = self.pool.acquire(FakeConnection)
+        pooled.info.transaction_status = TRANSACTION_STATUS_INTRANS
+
+        self.pool.release(pooled)
+
+        self.assertTrue(pooled.rolled_back)
+        self.assertEqual(self.pool.idle, 1)
+
+    def test_broken_connection_is_discarded(self):
+        pooled = self.pool.acquire(FakeConnection)
+        pooled.info.transaction_status = TRANSACTION_STATUS_UNKNOWN
+
+        self.pool.release(pooled)
+
+        self.assertTrue(pooled.closed)
+        self.assertEqual(self.pool.idle, 0)
+        self.assertEqual(self.pool.in_use, 0)
+
+    def test_connection_idle_too_long_is_replaced(self):
+        stale = self.pool.acquire(FakeConnection)
+        self.pool.release(stale)
+        self.pool.max_idle = 0
+
+        self.assertIsNot(self.pool.acquire(FakeConnection), stale)
+        self.assertTrue(stale.closed)
+
+    def test_failed_connect_frees_the_slot(self):
+        def connect():
+            raise RuntimeError
+
+        for _ in range(3):
+            with self.assertRaises(RuntimeError):
+                self.pool.acquire(connect)
+
+        self.assertEqual(self.pool.in_use, 0)
+
+
+class PooledDatabaseWrapperTests(SimpleTestCase):
+    def setUp(self):
+        self.wrapper = DatabaseWrapper(
+            {**connection.settings_dict, "POOL": {"MAX_SIZE": 1, "TIMEOUT": 0.05}},
+            alias="pooled",
+        )
+        connections["pooled"] = self.wrapper
+
+    def tearDown(self):
+        self.wrapper.close()
+        del connections["pooled"]
+        for key in [key for key in pools if "'pooled'" in key]:
+            pools.pop(key).close_idle()
+
+    def test_connection_returns_to_the_pool_on_close(self):
+        with self.wrapper.cursor() as cursor:
+            cursor.execute("SELECT pg_backend_pid()")
+            pid = cursor.fetchone()[0]
+        self.wrapper.close()
+
+        self.assertEqual(self.wrapper.pool.idle, 1)
+        with self.wrapper.cursor() as cursor:
+            cursor.execute("SELECT pg_backend_pid()")
+            self.assertEqual(cursor.fetchone()[0], pid)
+
+    def test_pool_size_is_enforced(self):
+        self.wrapper.ensure_connection()
+        other = DatabaseWrapper(self.wrapper.settings_dict, alias="pooled")
+
+        with self.assertRaises(PoolTimeout):
+            other.ensure_connection()
+
+    def test_pool_metrics(self):
+        self.wrapper.ensure_connection()
+
+        metrics = registry.render()
+
+        self.assertIn('db_pool_size{alias="pooled"} 1', metrics)
+        self.assertIn('db_pool_connections{alias="pooled",state="in_use"} 1', metrics)
+        self.assertIn('db_pool_connections{alias="pooled",state="idle"} 0', metrics)
+        self.assertIn('db_pool_waiting{alias="pooled"} 0', metrics)
@@ -0,0 +1,165 @@
+import datetime
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.test import AsyncClient, TestCase, override_settings
+from django.urls import reverse
+from rest_framework import serializers
+from rest_framework.test import APIClient
+
+from book.models import Book
+from borrowing.models import Borrowing
+from borrowing.serializers import BorrowingDetailSerializer
+from library_api_service.fast_list import ValuesSerializer, get_values_serializer
+
+BOOK_URL = reverse("book:book-list")
+BORROWING_URL = reverse("borrowing:borrowing-list")
+ASYNC_BOOK_URL = reverse("async:book-list")
+
+
+def sample_book(**params):
+    defaults = {
+        "title": "Test Book",
+        "author": "Test author",
+        "cover": "hard",
+        "inventory": 5,
+        "daily_fee": 0.5,
+    }
+    defaults.update(params)
+
+    return Book.objects.create(**defaults)
+
+
+class FastListSerializationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = get_user_model().objects.create_user(
+            "admin@admin.com", "testpass", is_staff=True
+        )
+        self.user = get_user_model().objects.create_user("test@test.com", "testpass")
+        self.books = [
+            sample_book(
+                title=f"Book {number}",
+                author=f"Author {number % 2}",
+                cover=("hard", "soft")[number % 2],
+                daily_fee=("0.5", "12.25", "3")[number % 3],
+            )
+            for number in range(7)
+        ]
+
+        today = datetime.date.today()
+        for number, book in enumerate(self.books * 2):
+            Borrowing.objects.create(
+                book=book,
+                user=(self.admin, self.user)[number % 2],
+                borrow_date=today - datetime.timedelta(days=number // 3),
+                expected_return_date=today + datetime.timedelta(days=number),
+                actual_return_date=today if number % 4 == 0 else None,
+            )
+
+    def get_pages(self, url, params, fast):
+        """Content of every page, following the next links"""
+        pages = []
+        url = f"{url}?{'&'.join(f'{name}={value}' for name, value in params.items())}"
+
+        with override_settings(FAST_LIST_SERIALIZATION=fast):
+            while url:
+                cache.clear()
+                res = self.client.get(url)
+                self.assertEqual(res.status_code, 200)
+                pages.append(res.content)
+                url = res.json()["next"]
+
+        return pages
+
+    def assert_same_output(self, url, params):
+        self.assertEqual(
+            self.get_pages(url, params, fast=True),
+            self.get_pages(url, params, fast=False),
+        )
+
+    def test_book_list_is_byte_identical(self):
+        for params in (
+            {},
+            {"page_size": 3},
+            {"author": "author 1", "page_size": 2},
+            {"search": "book", "page_size": 2},
+            {"format": "json", "page_size": 4},
+        ):
+            with self.subTest(**params):
+                self.assert_same_output(BOOK_URL, params)
+
+    def test_borrowing_list_is_byte_identical(self):
+        for user in (self.admin, self.user):
+            self.client.force_authenticate(user)
+
+            for params in (
+                {},
+                {"page_size": 4},
+                {"is_active": "true", "page_size": 3},
+                {"user_id": self.user.id, "page_size": 2},
+                {"fields": "id,is_active", "page_size": 4},
+                {"expand": "book", "page_size": 4},
+                {"fields": "user", "expand": "book"},
+            ):
+                with self.subTest(user=user.email, **params):
+                    self.assert_same_output(BORROWING_URL, params)
+
+    def test_validators_match(self):
+        self.client.force_authenticate(self.admin)
+
+        with override_settings(FAST_LIST_SERIALIZATION=True):
+            fast = self.client.get(BORROWING_URL)
+        slow = self.client.get(BORROWING_URL)
+
+        self.assertEqual(fast["ETag"], slow["ETag"])
+        self.assertNotIn("Last-Modified", fast)
+
+    def test_borrowing_list_single_query(self):
+        self.client.force_authenticate(self.admin)
+
+        with override_settings(FAST_LIST_SERIALIZATION=True):
+            with self.assertNumQueries(1):
+                self.client.get(BORROWING_URL)
+
+    @override_settings(FAST_LIST_SERIALIZATION=True)
+    async def test_async_book_list_is_byte_identical(self):
+        params = {"page_size": 3, "author": "author 0"}
+
+        res = await AsyncClient().get(ASYNC_BOOK_URL, params)
+        await sync_to_async(cache.clear)()
+        with override_settings(FAST_LIST_SERIALIZATION=False):
+            expected = await AsyncClient().get(ASYNC_BOOK_URL, params)
+
+        self.assertEqual(res.content, expected.content)
+
+    def test_nested_serializer_from_joined_columns(self):
+        serializer = ValuesSerializer(BorrowingDetailSerializer)
+        queryset = Borrowing.objects.order_by("id")
+
+        self.assertEqual(
+            serializer.to_representation(serializer.values(queryset)),
+            BorrowingDetailSerializer(queryset, many=True).data,
+        )
+
+    def test_method_field_is_rejected(self):
+        class BorrowingMethodSerializer(BorrowingDetailSerializer):
+            fee = serializers.SerializerMethodField()
+
+            class Meta(BorrowingDetailSerializer.Meta):
+                fields = ("id", "fee")
+
+        with self.assertRaises(ImproperlyConfigured):
+            ValuesSerializer(BorrowingMethodSerializer)
+
+    def test_values_serializer_cached_per_set_of_fields(self):
+        serializer = get_values_serializer(
+            BorrowingDetailSerializer, ("is_active", "id")
+        )
+
+        self.assertIs(
+            get_values_serializer(BorrowingDetailSerializer, ("id", "is_active")),
+            serializer,
+        )
@@ -0,0 +1,104 @@
+import datetime
+import decimal
+import io
+import uuid
+from unittest import mock
+
+from django.test import SimpleTestCase
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ErrorDetail, ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.serializer_helpers import ReturnDict, ReturnList
+
+from library_api_service.parsers import ORJSONParser
+from library_api_service.renderers import ORJSONRenderer
+
+PAYLOAD = {
+    "next": "http://testserver/api/borrowings/?cursor=eyJwIjpbXX0%3D",
+    "previous": None,
+    "results": ReturnList(
+        [
+            ReturnDict(
+                {
+                    "id": 1,
+                    "title": 'Über «Bücher» – 本\u2028\u2029\x1f"\\',
+                    "daily_fee": decimal.Decimal("12.25"),
+                    "price": 0.1,
+                    "borrow_date": datetime.date(2024, 1, 31),
+                    "updated_at": datetime.datetime(
+                        2024, 1, 31, 10, 5, 7, 123456, tzinfo=datetime.timezone.utc
+                    ),
+                    "local": datetime.datetime(
+                        2024, 1, 31, 10, 5, tzinfo=timezone.get_fixed_timezone(120)
+                    ),
+                    "naive": datetime.datetime(2024, 1, 31, 10, 5, 7),
+                    "opens": datetime.time(9, 30),
+                    "period": datetime.timedelta(days=1, seconds=30),
+                    "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+                    "label": gettext_lazy("This field is required."),
+                    "error": ErrorDetail("Invalid.", code="invalid"),
+                    "blob": b"bytes",
+                    "tags": ("a", "b"),
+                    "is_active": True,
+                },
+                serializer=None,
+            )
+        ],
+        serializer=None,
+    ),
+    1: [{}, [], "", 0, -1, 2**62],
+}
+
+
+class ORJSONRendererTests(SimpleTestCase):
+    def assert_same_output(self, data, media_type=None, context=None):
+        expected = JSONRenderer().render(data, media_type, context)
+
+        self.assertEqual(ORJSONRenderer().render(data, media_type, context), expected)
+
+    def test_same_output_as_json_renderer(self):
+        self.assert_same_output(PAYLOAD)
+
+    def test_same_output_for_scalars(self):
+        for data in (None, "text", 1, 1.5, True, [], {}):
+            with self.subTest(data=data):
+                self.assert_same_output(data)
+
+    def test_indented_output(self):
+        self.assert_same_output(PAYLOAD, "application/json; indent=4")
+        self.assert_same_output(PAYLOAD, context={"indent": 2})
+
+    def test_stdlib_fallback(self):
+        with mock.patch("library_api_service.renderers.orjson", None):
+            self.assert_same_output(PAYLOAD)
+
+    def test_unknown_type_fails(self):
+        with self.assertRaises(TypeError):
+            ORJSONRenderer().render({"value": object()})
+
+
+class ORJSONParserTests(SimpleTestCase):
+    def parse(self, parser, content: bytes, encoding="utf-8"):
+        return parser.parse(io.BytesIO(content), parser_context={"encoding": encoding})
+
+    def assert_same_result(self, content: bytes, encoding="utf-8"):
+        expected = self.parse(JSONParser(), content, encoding)
+
+        self.assertEqual(self.parse(ORJSONParser(), content, encoding), expected)
+
+    def test_same_result_as_json_parser(self):
+        self.assert_same_result(JSONRenderer().render(PAYLOAD))
+        self.assert_same_result(b'{"big": 123456789012345678901234567890}')
+        self.assert_same_result('{"title": "Bücher"}'.encode("latin-1"), "latin-1")
+
+    def test_same_errors(self):
+        for content in (b"{", b'{"fee": NaN}', b"\xef\xbb\xbf{}"):
+            with self.subTest(content=content):
+                with self.assertRaises(ParseError) as expected:
+                    self.parse(JSONParser(), content)
+                with self.assertRaises(ParseError) as error:
+                    self.parse(ORJSONParser(), content)
+
+                self.assertEqual(str(error.exception), str(expected.exception))
@@ -0,0 +1,101 @@
+from django.conf import settings
+from django.test import AsyncClient, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from book.models import Book
+from library_api_service.metrics import (
+    Histogram,
+    db_queries,
+    registry,
+    request_duration,
+    requests_total,
+)
+
+BOOK_URL = reverse("book:book-list")
+METRICS_URL = reverse("metrics")
+
+
+class HistogramTests(TestCase):
+    def test_render_cumulative_buckets(self):
+        histogram = Histogram("test_seconds", "Test", ("view",), buckets=(1, 5))
+
+        for value in (0.5, 3, 3, 10):
+            histogram.observe(value, view="a")
+
+        self.assertEqual(
+            histogram.render(),
+            [
+                "# HELP test_seconds Test",
+                "# TYPE test_seconds histogram",
+                'test_seconds_bucket{view="a",le="1.0"} 1',
+                'test_seconds_bucket{view="a",le="5.0"} 3',
+                'test_seconds_bucket{view="a",le="+Inf"} 4',
+                'test_seconds_sum{view="a"} 16.5',
+                'test_seconds_count{view="a"} 4',
+            ],
+        )
+
+
+class RequestMetricsMiddlewareTests(TestCase):
+    def setUp(self):
+        registry.clear()
+        self.client = APIClient()
+
+    def test_request_recorded_by_view(self):
+        Book.objects.create(
+            title="Test Book",
+            author="Test author",
+            cover="hard",
+            inventory=5,
+            daily_fee=0.5,
+        )
+
+        self.client.get(BOOK_URL, {"search": "test"})
+
+        labels = {"view": "book:book-list", "method": "GET"}
+        self.assertEqual(request_duration.get_count(**labels), 1)
+        self.assertEqual(requests_total.get(**labels, status=200), 1)
+        self.assertEqual(db_queries.get_count(**labels), 1)
+        self.assertGreaterEqual(db_queries.get_sum(**labels), 1)
+
+    @override_settings(
+        MIDDLEWARE=[
+            middleware
+            for middleware in settings.MIDDLEWARE
+            if not middleware.startswith("debug_toolbar")
+        ]
+    )
+    async def test_async_request_recorded(self):
+        await AsyncClient().get(reverse("async:book-list"))
+
+        labels = {"view": "async:book-list", "method": "GET"}
+        self.assertEqual(requests_total.get(**labels, status=200), 1)
+        self.assertEqual(db_queries.get_sum(**labels), 1)
+
+    @override_settings(METRICS_SAMPLE_RATE=0)
+    def test_unsampled_requests_not_recorded(self):
+        self.client.get(BOOK_URL)
+
+        self.assertEqual(
+            request_duration.get_count(view="book:book-list", method="GET"), 0
+        )
+
+    def test_metrics_endpoint(self):
+        self.client.get(BOOK_URL)
+
+        res = self.client.get(METRICS_URL)
+        content = res.content.decode()
+
+        self.assertEqual(res.status_code, 200)
+        self.assertIn(
+            'http_request_duration_seconds_count{view="book:book-list",method="GET"} 1',
+            content,
+        )
+        self.assertIn("# TYPE book_cache_requests_total counter", content)
+
+    @override_settings(METRICS_ALLOWED_IPS=["10.0.0.1"])
+    def test_metrics_endpoint_restricted_by_ip(self):
+        res = self.client.get(METRICS_URL)
+
+        self.assertEqual(res.status_code, 403)
@@ -0,0 +1,310 @@
+"""
+Query budgets for every API route.
+
+Each endpoint is requested once against 1 and once against 100 seeded rows:
+the query count has to be the same for both and within the budget recorded
+in query_budgets.json. Set QUERY_BUDGET_REPORT to a path to get the measured
+counts as JSON, and QUERY_BUDGET_UPDATE=1 to rewrite the budgets file after
+an intentional change.
+"""
+import datetime
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Callable
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLResolver, get_resolver, reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from book.models import Book
+from borrowing.models import Borrowing
+from telegram_helper.transports import FakeTransport
+from user.authentication import clear_revocations
+from user.serializers import TokenObtainPairWithClaimsSerializer
+
+BUDGETS_PATH = Path(__file__).with_name("query_budgets.json")
+SCALES = (1, 100)
+EXCLUDED_NAMESPACES = ("admin", "djdt")
+EXCLUDED_ROUTES = ("schema", "swagger-ui")
+PASSWORD = "userpass"
+
+
+@dataclass(frozen=True)
+class Endpoint:
+    route: str
+    method: str = "get"
+    user: str = "user"
+    args: Callable = None
+    data: Callable = None
+    format: str = "json"
+    params: dict = field(default_factory=dict)
+
+    @property
+    def label(self):
+        query = "".join(f"?{key}={value}" for key, value in self.params.items())
+
+        return f"{self.method.upper()} {self.route}{query} [{self.user}]"
+
+
+def first_book(fixture):
+    return [fixture.books[0].id]
+
+
+def first_borrowing(fixture):
+    return [fixture.borrowings[0].id]
+
+
+def book_payload(fixture):
+    return {
+        "title": "New Book",
+        "author": "New author",
+        "cover": "soft",
+        "inventory": 3,
+        "daily_fee": "1.00",
+    }
+
+
+def import_file(fixture):
+    lines = ["title,author,cover,inventory,daily_fee"] + [
+        f"Imported {number},Author,hard,1,0.50" for number in range(fixture.size)
+    ]
+    content = "\n".join(lines).encode()
+
+    return {"file": SimpleUploadedFile("books.csv", content, "text/csv")}
+
+
+ENDPOINTS = (
+    Endpoint("book:api-root", user="anonymous"),
+    Endpoint("book:book-list", user="anonymous"),
+    Endpoint("book:book-list", user="anonymous", params={"search": "book"}),
+    Endpoint("book:book-list", "post", "admin", data=book_payload),
+    Endpoint("book:book-detail", user="anonymous", args=first_book),
+    Endpoint("book:book-detail", "put", "admin", first_book, book_payload),
+    Endpoint(
+        "book:book-detail", "patch", "admin", first_book, lambda f: {"inventory": 9}
+    ),
+    Endpoint("book:book-detail", "delete", "admin", first_book),
+    Endpoint("book:book-cache-stats", user="admin"),
+    Endpoint(
+        "book:book-import-books", "post", "admin", data=import_file, format="multipart"
+    ),
+    Endpoint("book:book-export-books", user="admin"),
+    Endpoint("book:book-top-borrowed", user="anonymous", params={"days": 30}),
+    Endpoint("book:book-daily-activity", user="anonymous", params={"days": 30}),
+    Endpoint("book:book-out-of-stock", user="anonymous"),
+    Endpoint("borrowing:api-root"),
+    Endpoint("borrowing:borrowing-list"),
+    Endpoint("borrowing:borrowing-list", user="admin"),
+    Endpoint(
+        "borrowing:borrowing-list",
+        "post",
+        data=lambda f: {
+            "book": f.books[0].id,
+            "expected_return_date": str(f.today + datetime.timedelta(days=7)),
+        },
+    ),
+    Endpoint("borrowing:borrowing-detail", args=first_borrowing),
+    Endpoint("borrowing:borrowing-return-borrowing", "post", args=first_borrowing),
+    Endpoint(
+        "borrowing:borrowing-bulk-create-borrowings",
+        "post",
+        data=lambda f: {
+            "books": [book.id for book in f.books],
+            "expected_return_date": str(f.today + datetime.timedelta(days=7)),
+        },
+    ),
+    Endpoint(
+        "borrowing:borrowing-bulk-return-borrowings",
+        "post",
+        data=lambda f: {"ids": [borrowing.id for borrowing in f.borrowings]},
+    ),
+    Endpoint(
+        "user:create",
+        "post",
+        "anonymous",
+        data=lambda f: {"email": "new@user.com", "password": PASSWORD},
+    ),
+    Endpoint(
+        "user:token_obtain_pair",
+        "post",
+        "anonymous",
+        data=lambda f: {"email": f.user.email, "password": PASSWORD},
+    ),
+    Endpoint(
+        "user:token_refresh",
+        "post",
+        "anonymous",
+        data=lambda f: {"refresh": str(RefreshToken.for_user(f.user))},
+    ),
+    Endpoint(
+        "user:token_verify",
+        "post",
+        "anonymous",
+        data=lambda f: {"token": str(AccessToken.for_user(f.user))},
+    ),
+    Endpoint("user:manage"),
+    Endpoint("user:manage", "patch", data=lambda f: {"password": "newpass"}),
+    Endpoint("user:manage-summary"),
+    Endpoint("user:summary", user="admin", args=lambda f: [f.user.id]),
+    Endpoint("async:book-list", user="anonymous"),
+    Endpoint("async:book-detail", user="anonymous", args=first_book),
+    Endpoint("async:borrowing-list"),
+    Endpoint("async:borrowing-list", user="admin"),
+    Endpoint("async:borrowing-detail", args=first_borrowing),
+    Endpoint("metrics", user="anonymous"),
+)
+
+
+def iter_route_names(patterns, namespace=None):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            nested = ":".join(filter(None, [namespace, pattern.namespace])) or None
+            yield from iter_route_names(pattern.url_patterns, nested)
+        elif pattern.name:
+            yield ":".join(filter(None, [namespace, pattern.name]))
+
+
+def api_routes():
+    return {
+        name
+        for name in iter_route_names(get_resolver().url_patterns)
+        if name.split(":")[0] not in EXCLUDED_NAMESPACES and name not in EXCLUDED_ROUTES
+    }
+
+
+def seed(size, user):
+    """Insert ``size`` books and active borrowings of ``user``"""
+    today = datetime.date.today()
+    books = Book.objects.bulk_create(
+        Book(
+            title=f"Budget book {number}",
+            author=f"Author {number}",
+            cover="hard",
+            inventory=5,
+            daily_fee="0.50",
+        )
+        for number in range(size)
+    )
+    borrowings = Borrowing.objects.bulk_create(
+        Borrowing(
+            expected_return_date=today + datetime.timedelta(days=7),
+            book=book,
+            user=user,
+        )
+        for book in books
+    )
+
+    return SimpleNamespace(
+        size=size, today=today, user=user, books=books, borrowings=borrowings
+    )
+
+
+@override_settings(TELEGRAM_TRANSPORT=FakeTransport)
+class QueryBudgetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = {
+            "user": get_user_model().objects.create_user(
+                email="user@user.com", password=PASSWORD
+            ),
+            "admin": get_user_model().objects.create_superuser(
+                email="admin@admin.com", password=PASSWORD
+            ),
+        }
+
+    def client_for(self, role):
+        client = APIClient()
+
+        if role in self.users:
+            token = TokenObtainPairWithClaimsSerializer.get_token(
+                self.users[role]
+            ).access_token
+            client.credentials(HTTP_AUTHORIZE=f"Bearer {token}")
+
+        return client
+
+    def count_queries(self, endpoint, size):
+        """Query count of one request, rolled back afterwards"""
+        with transaction.atomic():
+            fixture = seed(size, self.users["user"])
+            client = self.client_for(endpoint.user)
+            url = reverse(
+                endpoint.route, args=endpoint.args(fixture) if endpoint.args else None
+            )
+            data = endpoint.data(fixture) if endpoint.data else endpoint.params
+            cache.clear()
+            clear_revocations()
+
+            with CaptureQueriesContext(connection) as context:
+                response = getattr(client, endpoint.method)(
+                    url, data, format=endpoint.format
+                )
+                if response.streaming:
+                    b"".join(response.streaming_content)
+
+            if response.status_code >= 400:
+                self.fail(f"{endpoint.label} with {size} rows: {response.data}")
+            transaction.set_rollback(True)
+
+        return len(context.captured_queries)
+
+    def test_every_route_has_a_budget(self):
+        budgets = json.loads(BUDGETS_PATH.read_text())
+        covered = {endpoint.route for endpoint in ENDPOINTS}
+
+        self.assertEqual(api_routes() - covered, set(), "routes without endpoints")
+        self.assertEqual(
+            {endpoint.label for endpoint in ENDPOINTS} - budgets.keys(),
+            set(),
+            f"endpoints without a budget in {BUDGETS_PATH.name}",
+        )
+
+    def test_query_counts_constant_and_within_budget(self):
+        budgets = json.loads(BUDGETS_PATH.read_text())
+        report = {}
+
+        for endpoint in ENDPOINTS:
+            counts = {size: self.count_queries(endpoint, size) for size in SCALES}
+            report[endpoint.label] = {
+                "budget": budgets.get(endpoint.label),
+                "queries": counts,
+            }
+
+            with self.subTest(endpoint.label):
+                self.assertEqual(
+                    len(set(counts.values())),
+                    1,
+                    f"query count grows with the number of rows: {counts}",
+                )
+                if not os.getenv("QUERY_BUDGET_UPDATE"):
+                    self.assertLessEqual(
+                        max(counts.values()),
+                        budgets.get(endpoint.label, 0),
+                        "query budget exceeded",
+                    )
+
+        if os.getenv("QUERY_BUDGET_REPORT"):
+            Path(os.environ["QUERY_BUDGET_REPORT"]).write_text(
+                json.dumps(report, indent=2) + "\n"
+            )
+
+        if os.getenv("QUERY_BUDGET_UPDATE"):
+            BUDGETS_PATH.write_text(
+                json.dumps(
+                    {
+                        label: max(entry["queries"].values())
+                        for label, entry in report.items()
+                    },
+                    indent=2,
+                )
+                + "\n"
+            )
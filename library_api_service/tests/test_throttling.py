@@ -0,0 +1,182 @@
+import datetime
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from book.models import Book
+from library_api_service.throttling import SlidingWindowThrottle, throttle_rejections
+
+TOKEN_URL = reverse("user:token_obtain_pair")
+REGISTER_URL = reverse("user:create")
+BORROWING_URL = reverse("borrowing:borrowing-list")
+BULK_BORROWING_URL = reverse("borrowing:borrowing-bulk-create-borrowings")
+
+RATES = {
+    "token.user": "2/min",
+    "token.ip": "3/min",
+    "register.ip": "2/hour",
+    "borrowing_create.user": "2/min",
+    "borrowing_create.ip": "3/min",
+}
+
+
+def throttle_rates(**rates):
+    return override_settings(
+        DISABLE_THROTTLING=False,
+        REST_FRAMEWORK={
+            **settings.REST_FRAMEWORK,
+            "DEFAULT_THROTTLE_RATES": {**RATES, **rates},
+        },
+    )
+
+
+@throttle_rates()
+class ThrottlingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user("test@test.com", "testpass")
+        self.book = Book.objects.create(
+            title="Test Book",
+            author="Test author",
+            cover="hard",
+            inventory=10,
+            daily_fee=0.5,
+        )
+
+    def obtain_token(self, email, ip="10.0.0.1", **extra):
+        return self.client.post(
+            TOKEN_URL, {"email": email, "password": "wrong"}, REMOTE_ADDR=ip, **extra
+        )
+
+    def borrow(self, url=BORROWING_URL, ip="10.0.0.1"):
+        expected_return_date = str(datetime.date.today() + datetime.timedelta(days=3))
+        data = {"book": self.book.id, "expected_return_date": expected_return_date}
+        if url == BULK_BORROWING_URL:
+            data = {
+                "books": [self.book.id],
+                "expected_return_date": expected_return_date,
+            }
+
+        return self.client.post(url, data, format="json", REMOTE_ADDR=ip)
+
+    @throttle_rates(**{"token.ip": "10/min"})
+    def test_token_throttled_per_account(self):
+        for _ in range(2):
+            res = self.obtain_token("Test@test.com", ip="10.0.0.1")
+            self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        res = self.obtain_token(" test@TEST.com", ip="10.0.0.1")
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn("Retry-After", res)
+
+        res = self.obtain_token("other@test.com", ip="10.0.0.1")
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_token_account_not_locked_out_from_other_addresses(self):
+        for _ in range(3):
+            self.obtain_token("test@test.com", ip="10.0.0.1")
+
+        res = self.client.post(
+            TOKEN_URL,
+            {"email": "test@test.com", "password": "testpass"},
+            REMOTE_ADDR="10.0.0.2",
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_token_throttled_per_address(self):
+        for number in range(3):
+            res = self.obtain_token(f"user{number}@test.com")
+            self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        # Forwarded addresses are not trusted without NUM_PROXIES
+        res = self.obtain_token("user3@test.com", HTTP_X_FORWARDED_FOR="10.0.0.9")
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+        res = self.obtain_token("user3@test.com", ip="10.0.0.2")
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_register_throttled_per_address(self):
+        for number in range(2):
+            res = self.client.post(
+                REGISTER_URL,
+                {"email": f"user{number}@test.com", "password": "testpass"},
+                REMOTE_ADDR="10.0.0.1",
+            )
+            self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+        res = self.client.post(
+            REGISTER_URL,
+            {"email": "user2@test.com", "password": "testpass"},
+            REMOTE_ADDR="10.0.0.1",
+        )
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertFalse(get_user_model().objects.filter(email="user2@test.com"))
+
+    def test_borrowing_creation_throttled_per_user(self):
+        self.client.force_authenticate(self.user)
+
+        self.assertEqual(self.borrow().status_code, status.HTTP_201_CREATED)
+        res = self.borrow(BULK_BORROWING_URL, ip="10.0.0.2")
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+        res = self.borrow(ip="10.0.0.3")
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(self.client.get(BORROWING_URL).status_code, status.HTTP_200_OK)
+
+    def test_borrowing_creation_throttled_per_address(self):
+        for number in range(3):
+            user = get_user_model().objects.create_user(
+                f"user{number}@test.com", "testpass"
+            )
+            self.client.force_authenticate(user)
+            self.assertEqual(self.borrow().status_code, status.HTTP_201_CREATED)
+
+        self.client.force_authenticate(self.user)
+        res = self.borrow()
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    @override_settings(DISABLE_THROTTLING=True)
+    def test_disabled(self):
+        for _ in range(3):
+            res = self.obtain_token("test@test.com")
+            self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_rejections_counted(self):
+        before = throttle_rejections.get(scope="token", kind="user")
+
+        for _ in range(4):
+            self.obtain_token("test@test.com", ip="10.0.0.1")
+
+        self.assertEqual(
+            throttle_rejections.get(scope="token", kind="user"), before + 2
+        )
+
+    @throttle_rates(**{"token.user": "4/min", "token.ip": None})
+    def test_sliding_window(self):
+        now = mock.Mock(return_value=30)
+
+        with mock.patch.object(SlidingWindowThrottle, "timer", now):
+            for _ in range(4):
+                res = self.obtain_token("test@test.com")
+                self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+            # A quarter of the way into the next window, 3/4 of the previous
+            # one still counts
+            now.return_value = 75
+            res = self.obtain_token("test@test.com")
+            self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+            res = self.obtain_token("test@test.com")
+            self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+            self.assertEqual(res["Retry-After"], "15")
+
+            now.return_value = 90
+            res = self.obtain_token("test@test.com")
+            self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,162 @@
+"""Sliding window rate limits for token issuance, registration and borrowing.
+
+Every client gets one counter per fixed window of the rate's duration in
+the throttle cache, incremented with ``add()`` and ``incr()`` so that
+concurrent threads, and worker processes sharing Redis, never lose a
+request. The rate over the last ``duration`` seconds is estimated from
+the current window's count plus the previous window's count weighted by
+the part of it still inside the sliding window, which avoids the double
+burst a fixed window lets through at its edges.
+
+Views set ``throttle_scope`` and the rates are read from
+``DEFAULT_THROTTLE_RATES`` as ``<scope>.user`` and ``<scope>.ip``; a
+scope without a rate is not throttled.
+"""
+import hashlib
+from collections.abc import Mapping
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+from library_api_service.metrics import registry
+
+throttle_rejections = registry.counter(
+    "throttle_rejections_total",
+    "Requests rejected by a throttle by scope and kind of client key",
+    ("scope", "kind"),
+)
+
+
+def get_cache():
+    return caches[settings.THROTTLE_CACHE_ALIAS]
+
+
+def increment(key: str, timeout: int) -> int:
+    cache = get_cache()
+    cache.add(key, 0, timeout=timeout)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # The key expired between add() and incr()
+        cache.set(key, 1, timeout=timeout)
+        return 1
+
+
+def decrement(key: str):
+    try:
+        get_cache().decr(key)
+    except ValueError:
+        pass
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+    kind = None
+    cache_format = "throttle:%(scope)s:%(kind)s:%(ident)s"
+
+    def __init__(self):
+        # The rate depends on the view's scope, known in allow_request()
+        pass
+
+    def get_rate(self):
+        return api_settings.DEFAULT_THROTTLE_RATES.get(f"{self.scope}.{self.kind}")
+
+    def get_ident_key(self, request, view):
+        raise NotImplementedError(".get_ident_key() must be overridden")
+
+    def get_cache_key(self, request, view):
+        ident = self.get_ident_key(request, view)
+        if ident is None:
+            return None
+
+        return self.cache_format % {
+            "scope": self.scope,
+            "kind": self.kind,
+            "ident": ident,
+        }
+
+    def allow_request(self, request, view):
+        if settings.DISABLE_THROTTLING:
+            return True
+
+        self.scope = getattr(view, "throttle_scope", None)
+        self.rate = self.get_rate()
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        window, offset = divmod(self.timer(), self.duration)
+        current_key = f"{self.key}:{int(window)}"
+
+        # Counted before reading the estimate, so concurrent requests can't
+        # all pass on the same count
+        self.current = increment(current_key, timeout=self.duration * 2)
+        self.previous = get_cache().get(f"{self.key}:{int(window) - 1}", 0)
+        self.weight = 1 - offset / self.duration
+
+        if self.previous * self.weight + self.current <= self.num_requests:
+            return True
+
+        # Rejected requests don't count, a client retrying too early is
+        # held to the rate instead of being locked out
+        decrement(current_key)
+        self.current -= 1
+        throttle_rejections.inc(scope=self.scope, kind=self.kind)
+        return False
+
+    def wait(self):
+        """Seconds until a new request fits in the sliding window"""
+        allowed = self.num_requests - 1
+
+        if self.current <= allowed:
+            excess = self.previous * self.weight + self.current - allowed
+            return self.duration * excess / self.previous
+
+        if not self.current:
+            # A zero rate never lets anything through
+            return None
+
+        # Past the end of this window, when its own count has decayed enough
+        return self.duration * (self.weight + 1 - allowed / self.current)
+
+
+class UserSlidingWindowThrottle(SlidingWindowThrottle):
+    """Per authenticated user, or per account and address for anonymous ones.
+
+    Views set ``throttle_user_field`` to the request field with the
+    account, e.g. the email sent for a token. The client address is part of
+    the key, otherwise anyone could lock an account's owner out by sending
+    requests that name it; guesses spread over many addresses are left to
+    the per address throttle.
+    """
+
+    kind = "user"
+
+    def get_ident_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            return f"id:{request.user.pk}"
+
+        field = getattr(view, "throttle_user_field", None)
+        if field is None or not isinstance(request.data, Mapping):
+            return None
+
+        value = request.data.get(field)
+        if not isinstance(value, str) or not value.strip():
+            return None
+
+        name = f"{self.get_ident(request)}:{value.strip().lower()}"
+        return "name:" + hashlib.md5(name.encode()).hexdigest()
+
+
+class IPSlidingWindowThrottle(SlidingWindowThrottle):
+    """Per client address, X-Forwarded-For is trusted as far as ``NUM_PROXIES``"""
+
+    kind = "ip"
+
+    def get_ident_key(self, request, view):
+        return self.get_ident(request)
@@ -14,20 +14,36 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path, include
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 
+from book.views import AsyncBookView
+from borrowing.views import AsyncBorrowingView
+from library_api_service.views import metrics_view
+
+async_urlpatterns = [
+    path("books/", AsyncBookView.as_view(), name="book-list"),
+    path("books/<int:pk>/", AsyncBookView.as_view(), name="book-detail"),
+    path("borrowings/", AsyncBorrowingView.as_view(), name="borrowing-list"),
+    path("borrowings/<int:pk>/", AsyncBorrowingView.as_view(), name="borrowing-detail"),
+]
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/books/", include("book.urls", namespace="book")),
     path("api/users/", include("user.urls", namespace="user")),
     path("api/borrowings/", include("borrowing.urls", namespace="borrowing")),
+    path("api/async/", include((async_urlpatterns, "async"))),
     path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
     path(
         "api/doc/swagger/",
         SpectacularSwaggerView.as_view(url_name="schema"),
         name="swagger-ui",
     ),
-    path("__debug__/", include("debug_toolbar.urls")),
+    path("metrics", metrics_view, name="metrics"),
 ]
+
+if "debug_toolbar" in settings.INSTALLED_APPS:
+    urlpatterns.append(path("__debug__/", include("debug_toolbar.urls")))
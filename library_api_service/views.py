@@ -0,0 +1,16 @@
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+
+from library_api_service.metrics import registry
+
+
+def metrics_view(request):
+    """Expose the metrics of this worker in the Prometheus text format"""
+    allowed_ips = settings.METRICS_ALLOWED_IPS
+
+    if allowed_ips and request.META.get("REMOTE_ADDR") not in allowed_ips:
+        return HttpResponseForbidden()
+
+    return HttpResponse(
+        registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
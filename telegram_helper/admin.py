@@ -0,0 +1,19 @@
+from django.contrib import admin
+from django.utils import timezone
+
+from telegram_helper.models import Notification
+
+
+@admin.register(Notification)
+class NotificationAdmin(admin.ModelAdmin):
+    list_display = ("id", "status", "attempts", "next_attempt_at", "created_at")
+    list_filter = ("status",)
+    actions = ("requeue",)
+
+    @admin.action(description="Requeue selected notifications")
+    def requeue(self, request, queryset):
+        queryset.update(
+            status=Notification.StatusChoices.PENDING,
+            attempts=0,
+            next_attempt_at=timezone.now(),
+        )
@@ -0,0 +1,41 @@
+import time
+
+from django.core.management import BaseCommand
+
+from telegram_helper.outbox import dispatch_pending
+
+
+class Command(BaseCommand):
+    """Django command to deliver pending Telegram notifications"""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep polling the outbox instead of exiting when it is drained",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5,
+            help="Seconds to sleep between polls when the outbox is empty",
+        )
+        parser.add_argument("--batch-size", type=int, default=None)
+
+    def handle(self, *args, **options):
+        while True:
+            result = dispatch_pending(batch_size=options["batch_size"])
+
+            if result.processed:
+                self.stdout.write(
+                    f"Sent: {result.sent}, retried: {result.retried}, "
+                    f"dead: {result.dead}"
+                )
+                continue
+
+            if not options["loop"]:
+                break
+
+            time.sleep(options["interval"])
+
+        self.stdout.write(self.style.SUCCESS("Outbox drained"))
@@ -0,0 +1,122 @@
+import datetime
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from telegram_helper.models import Notification
+from telegram_helper.transports import BaseTransport, get_transport
+
+
+@dataclass
+class DispatchResult:
+    sent: int = 0
+    retried: int = 0
+    dead: int = 0
+
+    @property
+    def processed(self) -> int:
+        return self.sent + self.retried + self.dead
+
+
+def enqueue_notification(message: str) -> Notification:
+    """Store a message in the outbox as part of the current transaction.
+
+    Nothing is sent here: the row becomes visible to the dispatcher only
+    after the surrounding transaction commits.
+    """
+    return Notification.objects.create(message=message)
+
+
+def get_retry_delay(attempts: int) -> datetime.timedelta:
+    delay = settings.NOTIFICATION_RETRY_BASE_DELAY * 2 ** (attempts - 1)
+    return datetime.timedelta(seconds=min(delay, settings.NOTIFICATION_RETRY_MAX_DELAY))
+
+
+def claim_batch(batch_size: int) -> list[Notification]:
+    """Lease a batch of due notifications to this dispatcher.
+
+    The rows are locked with SKIP LOCKED only for the length of this short
+    transaction: each claim counts as an attempt and pushes
+    ``next_attempt_at`` past the lease, so other dispatchers leave them
+    alone while they are sent, and pick them up again if this one dies.
+    """
+    with transaction.atomic():
+        now = timezone.now()
+        batch = list(
+            Notification.objects.select_for_update(skip_locked=True)
+            .filter(
+                status=Notification.StatusChoices.PENDING,
+                next_attempt_at__lte=now,
+            )
+            .order_by("next_attempt_at", "id")[:batch_size]
+        )
+
+        lease_expires_at = now + datetime.timedelta(
+            seconds=settings.NOTIFICATION_LEASE_TIMEOUT
+        )
+        for notification in batch:
+            notification.attempts += 1
+            notification.next_attempt_at = lease_expires_at
+
+        Notification.objects.bulk_update(batch, fields=["attempts", "next_attempt_at"])
+
+    return batch
+
+
+def record_result(notification: Notification, **fields) -> bool:
+    """Save the outcome of a claimed notification.
+
+    Nothing is written when the lease ran out and another dispatcher has
+    claimed the row since, its attempt is the one that counts.
+    """
+    return bool(
+        Notification.objects.filter(
+            pk=notification.pk,
+            status=Notification.StatusChoices.PENDING,
+            attempts=notification.attempts,
+        ).update(**fields)
+    )
+
+
+def dispatch_pending(
+    transport: BaseTransport = None, batch_size: int = None
+) -> DispatchResult:
+    """Deliver one batch of due notifications.
+
+    The batch is claimed in its own transaction and sent outside of it, so
+    no row lock or connection is held during the calls to Telegram, and
+    every result is saved as soon as it is known.
+    """
+    transport = transport or get_transport()
+    batch_size = batch_size or settings.NOTIFICATION_BATCH_SIZE
+    result = DispatchResult()
+
+    for notification in claim_batch(batch_size):
+        try:
+            transport.send(notification.message)
+        except Exception as error:
+            if notification.attempts >= settings.NOTIFICATION_MAX_ATTEMPTS:
+                if record_result(
+                    notification,
+                    status=Notification.StatusChoices.DEAD,
+                    last_error=repr(error),
+                ):
+                    result.dead += 1
+            elif record_result(
+                notification,
+                next_attempt_at=timezone.now() + get_retry_delay(notification.attempts),
+                last_error=repr(error),
+            ):
+                result.retried += 1
+        else:
+            if record_result(
+                notification,
+                status=Notification.StatusChoices.SENT,
+                sent_at=timezone.now(),
+                last_error="",
+            ):
+                result.sent += 1
+
+    return result
@@ -0,0 +1,149 @@
+import datetime
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from book.models import Book
+from telegram_helper.models import Notification
+from telegram_helper.outbox import dispatch_pending, enqueue_notification
+from telegram_helper.transports import BaseTransport, FakeTransport
+
+BORROWING_URL = reverse("borrowing:borrowing-list")
+
+
+class FailingTransport(BaseTransport):
+    def send(self, message: str) -> None:
+        raise ConnectionError("Telegram is unavailable")
+
+
+@override_settings(
+    TELEGRAM_TRANSPORT="telegram_helper.transports.FakeTransport",
+    NOTIFICATION_MAX_ATTEMPTS=3,
+)
+class NotificationOutboxTests(TestCase):
+    def setUp(self):
+        FakeTransport.messages.clear()
+
+    def test_create_borrowing_enqueues_notification_without_sending(self):
+        client = APIClient()
+        user = get_user_model().objects.create_user("test@test.com", "testpass")
+        client.force_authenticate(user)
+        book = Book.objects.create(
+            title="Test Book",
+            author="Test author",
+            cover="hard",
+            inventory=5,
+            daily_fee=0.5,
+        )
+
+        expected_return_date = datetime.date.today() + datetime.timedelta(days=3)
+        client.post(
+            BORROWING_URL,
+            {"expected_return_date": str(expected_return_date), "book": book.id},
+        )
+
+        notification = Notification.objects.get()
+        self.assertIn("Book Title: Test Book", notification.message)
+        self.assertEqual(notification.status, Notification.StatusChoices.PENDING)
+        self.assertEqual(FakeTransport.messages, [])
+
+    def test_dispatch_sends_pending_notifications(self):
+        enqueue_notification("first")
+        enqueue_notification("second")
+
+        result = dispatch_pending()
+
+        self.assertEqual(result.sent, 2)
+        self.assertEqual(FakeTransport.messages, ["first", "second"])
+        self.assertFalse(
+            Notification.objects.exclude(
+                status=Notification.StatusChoices.SENT
+            ).exists()
+        )
+
+    def test_dispatch_respects_batch_size(self):
+        for number in range(3):
+            enqueue_notification(f"message {number}")
+
+        result = dispatch_pending(batch_size=2)
+
+        self.assertEqual(result.sent, 2)
+        self.assertEqual(
+            Notification.objects.filter(
+                status=Notification.StatusChoices.PENDING
+            ).count(),
+            1,
+        )
+
+    def test_failed_delivery_is_retried_with_backoff(self):
+        notification = enqueue_notification("message")
+
+        result = dispatch_pending(transport=FailingTransport())
+
+        notification.refresh_from_db()
+        self.assertEqual(result.retried, 1)
+        self.assertEqual(notification.status, Notification.StatusChoices.PENDING)
+        self.assertEqual(notification.attempts, 1)
+        self.assertGreater(notification.next_attempt_at, timezone.now())
+        self.assertIn("Telegram is unavailable", notification.last_error)
+
+        self.assertEqual(dispatch_pending().processed, 0)
+
+    def test_notification_is_dead_lettered_after_max_attempts(self):
+        notification = enqueue_notification("message")
+
+        for _ in range(3):
+            Notification.objects.update(next_attempt_at=timezone.now())
+            dispatch_pending(transport=FailingTransport())
+
+        notification.refresh_from_db()
+        self.assertEqual(notification.status, Notification.StatusChoices.DEAD)
+        self.assertEqual(notification.attempts, 3)
+
+    def test_dispatch_command_drains_outbox(self):
+        enqueue_notification("message")
+        Notification.objects.create(
+            message="scheduled",
+            next_attempt_at=timezone.now() + datetime.timedelta(hours=1),
+        )
+
+        call_command("dispatch_notifications", stdout=StringIO())
+
+        self.assertEqual(FakeTransport.messages, ["message"])
+
+    def test_claimed_notifications_are_not_dispatched_twice(self):
+        notification = enqueue_notification("message")
+        dispatched = []
+
+        class ReentrantTransport(BaseTransport):
+            def send(self, message: str) -> None:
+                # Another dispatcher polling while this one sends
+                dispatched.append(dispatch_pending(transport=FakeTransport()))
+
+        dispatch_pending(transport=ReentrantTransport())
+
+        notification.refresh_from_db()
+        self.assertEqual(dispatched[0].processed, 0)
+        self.assertEqual(notification.status, Notification.StatusChoices.SENT)
+        self.assertEqual(notification.attempts, 1)
+
+    def test_result_of_an_expired_lease_is_discarded(self):
+        notification = enqueue_notification("message")
+
+        class SlowTransport(BaseTransport):
+            def send(self, message: str) -> None:
+                # The lease runs out and another dispatcher claims the row
+                Notification.objects.update(next_attempt_at=timezone.now())
+                dispatch_pending(transport=FailingTransport())
+
+        result = dispatch_pending(transport=SlowTransport())
+
+        notification.refresh_from_db()
+        self.assertEqual(result.sent, 0)
+        self.assertEqual(notification.status, Notification.StatusChoices.PENDING)
+        self.assertEqual(notification.attempts, 2)
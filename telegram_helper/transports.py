@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+class BaseTransport:
+    """Deliver a single text message, raise an exception on failure"""
+
+    def send(self, message: str) -> None:
+        raise NotImplementedError
+
+
+class TelegramTransport(BaseTransport):
+    def send(self, message: str) -> None:
+        from telegram_helper.bot import send_create_notification
+
+        send_create_notification(message)
+
+
+class FakeTransport(BaseTransport):
+    """Keep delivered messages in memory, for local development and tests"""
+
+    messages = []
+
+    def send(self, message: str) -> None:
+        FakeTransport.messages.append(message)
+
+
+def get_transport() -> BaseTransport:
+    return import_string(settings.TELEGRAM_TRANSPORT)()
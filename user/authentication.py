@@ -0,0 +1,153 @@
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import (
+    JWTAuthentication,
+    JWTStatelessUserAuthentication,
+)
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+USER_CLAIMS = ("is_staff", "is_active")
+REVOKED_KEY = "auth:revoked:{}"
+
+# user id -> (checked at, revoked at), saves a cache round trip per request
+_revocations = {}
+_REVOCATIONS_MAX_SIZE = 10_000
+
+
+def get_cache():
+    return caches[settings.JWT_REVOCATION_CACHE_ALIAS]
+
+
+def revoke_tokens(user_id):
+    """Reject every token of the user issued before the current second.
+
+    Token ``iat`` claims are whole seconds, so tokens issued later in the
+    same second, e.g. right after a password change, stay valid.
+    """
+    revoked_at = int(time.time())
+    get_cache().set(
+        REVOKED_KEY.format(user_id),
+        revoked_at,
+        api_settings.REFRESH_TOKEN_LIFETIME.total_seconds(),
+    )
+    _revocations[user_id] = (time.monotonic(), revoked_at)
+
+
+def revocation_unavailable() -> AuthenticationFailed:
+    # Failing closed, a token can't be trusted without knowing it's not revoked
+    return AuthenticationFailed(
+        _("Token revocation could not be checked"), code="revocation_unavailable"
+    )
+
+
+def get_revoked_at(user_id):
+    """Time of the last revocation, cached in-process for a few seconds"""
+    now = time.monotonic()
+    checked_at, revoked_at = _revocations.get(user_id, (None, None))
+
+    if checked_at is None or now - checked_at > settings.JWT_REVOCATION_CACHE_TTL:
+        if len(_revocations) >= _REVOCATIONS_MAX_SIZE:
+            _revocations.clear()
+
+        try:
+            revoked_at = get_cache().get(REVOKED_KEY.format(user_id))
+        except Exception as error:
+            raise revocation_unavailable() from error
+        _revocations[user_id] = (now, revoked_at)
+
+    return revoked_at
+
+
+async def aget_revoked_at(user_id):
+    """get_revoked_at() for async code, awaiting the cache on a miss"""
+    now = time.monotonic()
+    checked_at, revoked_at = _revocations.get(user_id, (None, None))
+
+    if checked_at is None or now - checked_at > settings.JWT_REVOCATION_CACHE_TTL:
+        if len(_revocations) >= _REVOCATIONS_MAX_SIZE:
+            _revocations.clear()
+
+        try:
+            revoked_at = await get_cache().aget(REVOKED_KEY.format(user_id))
+        except Exception as error:
+            raise revocation_unavailable() from error
+        _revocations[user_id] = (now, revoked_at)
+
+    return revoked_at
+
+
+def clear_revocations():
+    _revocations.clear()
+    get_cache().clear()
+
+
+class ClaimsUser(TokenUser):
+    """Token user whose is_staff and is_active come from the token claims"""
+
+    @property
+    def is_active(self) -> bool:
+        return self.token.get("is_active", False)
+
+
+class StatelessJWTAuthentication(JWTStatelessUserAuthentication):
+    """
+    JWT authentication building the user from the token claims,
+    so authenticated requests don't query the user table.
+
+    Tokens issued without the claims fall back to the database lookup.
+    """
+
+    def get_user(self, validated_token):
+        if not self.has_user_claims(validated_token):
+            user = JWTAuthentication.get_user(self, validated_token)
+        else:
+            user = self.get_claims_user(validated_token)
+
+        self.check_revoked(validated_token, get_revoked_at(user.pk))
+        return user
+
+    async def aauthenticate(self, request):
+        """authenticate() for async views, without blocking on the database"""
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        if not self.has_user_claims(validated_token):
+            user = await sync_to_async(JWTAuthentication.get_user)(
+                self, validated_token
+            )
+        else:
+            user = self.get_claims_user(validated_token)
+
+        self.check_revoked(validated_token, await aget_revoked_at(user.pk))
+        return user
+
+    def has_user_claims(self, validated_token) -> bool:
+        return all(claim in validated_token for claim in USER_CLAIMS)
+
+    def get_claims_user(self, validated_token):
+        user = super().get_user(validated_token)
+
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user
+
+    def check_revoked(self, validated_token, revoked_at):
+        if revoked_at is not None and validated_token.get("iat", 0) < revoked_at:
+            raise AuthenticationFailed(
+                _("Token has been revoked"), code="token_revoked"
+            )
@@ -2,15 +2,40 @@ from django.contrib.auth.models import (
     AbstractUser,
     BaseUserManager,
 )
-from django.db import models
+from django.db import models, transaction
 from django.utils.translation import gettext as _
 
 
+class UserQuerySet(models.QuerySet):
+    def update(self, **kwargs):
+        """Revoke the tokens of the users whose auth fields are updated.
+
+        Queryset updates, bulk_update() included, skip the post_save
+        signal that revokes them on save().
+        """
+        if not set(kwargs) & set(self.model.AUTH_FIELDS):
+            return super().update(**kwargs)
+
+        from user.authentication import revoke_tokens
+
+        with transaction.atomic(using=self.db):
+            user_ids = list(self.select_for_update().values_list("pk", flat=True))
+            updated = super().update(**kwargs)
+
+            for user_id in user_ids:
+                revoke_tokens(user_id)
+
+        return updated
+
+
 class UserManager(BaseUserManager):
     """Define a model manager for User model with no username field."""
 
     use_in_migrations = True
 
+    def get_queryset(self):
+        return UserQuerySet(self.model, using=self._db)
+
     def _create_user(self, email, password, **extra_fields):
         """Create and save a User with the given email and password."""
         if not email:
@@ -48,3 +73,19 @@ class User(AbstractUser):
     REQUIRED_FIELDS = []
 
     objects = UserManager()
+
+    # Changing any of these revokes the tokens issued to the user
+    AUTH_FIELDS = ("password", "is_staff", "is_active")
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_auth_state = instance.get_auth_state()
+        return instance
+
+    def get_auth_state(self):
+        return tuple(self.__dict__.get(field) for field in self.AUTH_FIELDS)
+
+    def auth_state_changed(self) -> bool:
+        loaded = getattr(self, "_loaded_auth_state", None)
+        return loaded is None or loaded != self.get_auth_state()
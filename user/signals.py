@@ -0,0 +1,17 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from user.authentication import revoke_tokens
+
+
+@receiver(post_save, sender="user.User")
+def revoke_tokens_on_auth_change(sender, instance, created, **kwargs):
+    if not created and instance.auth_state_changed():
+        revoke_tokens(instance.pk)
+
+    instance._loaded_auth_state = instance.get_auth_state()
+
+
+@receiver(post_delete, sender="user.User")
+def revoke_tokens_on_delete(sender, instance, **kwargs):
+    revoke_tokens(instance.pk)
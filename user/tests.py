@@ -1,3 +1,154 @@
-from django.test import TestCase
+import time
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from user.authentication import clear_revocations, get_cache
+from user.serializers import TokenObtainPairWithClaimsSerializer
+
+TOKEN_URL = reverse("user:token_obtain_pair")
+ME_URL = reverse("user:manage")
+BORROWING_URL = reverse("borrowing:borrowing-list")
+
+
+def claims_token(user):
+    return TokenObtainPairWithClaimsSerializer.get_token(user).access_token
+
+
+def issued_earlier(token):
+    """Revocations cover whole seconds before the current one"""
+    token["iat"] -= 1
+    return token
+
+
+class StatelessJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        clear_revocations()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="user@user.com", password="userpass"
+        )
+
+    def authorize(self, token):
+        self.client.credentials(HTTP_AUTHORIZE=f"Bearer {token}")
+
+    def test_token_contains_user_claims(self):
+        res = self.client.post(
+            TOKEN_URL, {"email": "user@user.com", "password": "userpass"}
+        )
+
+        token = AccessToken(res.data["access"])
+
+        self.assertEqual(token["is_staff"], False)
+        self.assertEqual(token["is_active"], True)
+
+    def test_authenticated_request_does_not_query_user(self):
+        self.authorize(claims_token(self.user))
+
+        with self.assertNumQueries(1):
+            res = self.client.get(BORROWING_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_token_without_claims_falls_back_to_database(self):
+        self.authorize(AccessToken.for_user(self.user))
+
+        with self.assertNumQueries(2):
+            res = self.client.get(BORROWING_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_inactive_claim_rejected(self):
+        token = claims_token(self.user)
+        token["is_active"] = False
+        self.authorize(token)
+
+        res = self.client.get(BORROWING_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_password_change_revokes_tokens(self):
+        self.authorize(issued_earlier(claims_token(self.user)))
+
+        self.user.set_password("newpass")
+        self.user.save()
+        res = self.client.get(BORROWING_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deactivation_revokes_tokens(self):
+        self.authorize(issued_earlier(claims_token(self.user)))
+
+        self.user.is_active = False
+        self.user.save()
+        res = self.client.get(BORROWING_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_queryset_update_revokes_tokens(self):
+        self.authorize(issued_earlier(claims_token(self.user)))
+
+        get_user_model().objects.filter(pk=self.user.pk).update(is_staff=True)
+        res = self.client.get(BORROWING_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_bulk_update_revokes_tokens(self):
+        self.authorize(issued_earlier(claims_token(self.user)))
+
+        self.user.is_active = False
+        get_user_model().objects.bulk_update([self.user], ["is_active"])
+        res = self.client.get(BORROWING_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(JWT_REVOCATION_CACHE_TTL=-1)
+    def test_revocation_outlives_default_cache(self):
+        self.authorize(issued_earlier(claims_token(self.user)))
+
+        self.user.set_password("newpass")
+        self.user.save()
+        cache.clear()
+        res = self.client.get(BORROWING_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_unreadable_revocation_rejects_token(self):
+        self.authorize(claims_token(self.user))
+
+        with mock.patch.object(get_cache(), "get", side_effect=ConnectionError):
+            res = self.client.get(BORROWING_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(res.data["code"], "revocation_unavailable")
+
+    def test_login_right_after_password_change(self):
+        self.authorize(claims_token(self.user))
+        # Late in the second the new token will be issued in
+        with mock.patch("time.time", return_value=int(time.time()) + 0.999):
+            self.client.patch(ME_URL, {"password": "newpass"})
+
+        res = self.client.post(
+            TOKEN_URL, {"email": "user@user.com", "password": "newpass"}
+        )
+        self.authorize(res.data["access"])
+        res_with_new_token = self.client.get(ME_URL)
+
+        self.assertEqual(res_with_new_token.status_code, status.HTTP_200_OK)
+
+    def test_profile_update_keeps_tokens(self):
+        self.authorize(claims_token(self.user))
+
+        res = self.client.patch(ME_URL, {"first_name": "Test"})
+        res_after_update = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res_after_update.status_code, status.HTTP_200_OK)
+        self.assertEqual(res_after_update.data["first_name"], "Test")
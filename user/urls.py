@@ -1,18 +1,25 @@
 from django.urls import path
 from rest_framework_simplejwt.views import (
-    TokenObtainPairView,
     TokenRefreshView,
     TokenVerifyView,
 )
 
-from user.views import CreateUserView, ManageUserView
+from user.views import (
+    CreateTokenView,
+    CreateUserView,
+    ManageUserView,
+    ManageUserSummaryView,
+    UserSummaryView,
+)
 
 app_name = "user"
 
 urlpatterns = [
     path("register/", CreateUserView.as_view(), name="create"),
-    path("token/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
+    path("token/", CreateTokenView.as_view(), name="token_obtain_pair"),
     path("token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
     path("token/verify/", TokenVerifyView.as_view(), name="token_verify"),
     path("me/", ManageUserView.as_view(), name="manage"),
+    path("me/summary/", ManageUserSummaryView.as_view(), name="manage-summary"),
+    path("<int:pk>/summary/", UserSummaryView.as_view(), name="summary"),
 ]
@@ -1,19 +1,71 @@
+from django.contrib.auth import get_user_model
+from django.shortcuts import get_object_or_404
 from rest_framework import generics
-from rest_framework.permissions import IsAuthenticated, AllowAny
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework.permissions import IsAuthenticated, AllowAny, IsAdminUser
+from rest_framework_simplejwt.views import TokenObtainPairView
 
+from borrowing.models import UserBorrowingSummary
+from borrowing.serializers import UserBorrowingSummarySerializer
+from library_api_service.throttling import (
+    IPSlidingWindowThrottle,
+    UserSlidingWindowThrottle,
+)
+from user.authentication import StatelessJWTAuthentication
 from user.serializers import UserSerializer
 
 
 class CreateUserView(generics.CreateAPIView):
     serializer_class = UserSerializer
     permission_classes = (AllowAny,)
+    throttle_classes = (IPSlidingWindowThrottle,)
+    throttle_scope = "register"
+
+
+class CreateTokenView(TokenObtainPairView):
+    """Token pair for the credentials, throttled per account and per address"""
+
+    throttle_classes = (UserSlidingWindowThrottle, IPSlidingWindowThrottle)
+    throttle_scope = "token"
+    throttle_user_field = get_user_model().USERNAME_FIELD
 
 
 class ManageUserView(generics.RetrieveUpdateAPIView):
     serializer_class = UserSerializer
-    authentication_classes = (JWTAuthentication,)
+    authentication_classes = (StatelessJWTAuthentication,)
     permission_classes = (IsAuthenticated,)
 
     def get_object(self):
-        return self.request.user
+        user = self.request.user
+        if isinstance(user, get_user_model()):
+            return user
+
+        return get_user_model().objects.get(pk=user.pk)
+
+
+class ManageUserSummaryView(generics.RetrieveAPIView):
+    serializer_class = UserBorrowingSummarySerializer
+    permission_classes = (IsAuthenticated,)
+
+    def get_user_id(self):
+        return self.request.user.id
+
+    def get_object(self):
+        """Single-row read, users who never borrowed get empty counters"""
+        user_id = self.get_user_id()
+        summary = UserBorrowingSummary.objects.filter(user_id=user_id).first()
+
+        return summary or UserBorrowingSummary(user_id=user_id)
+
+
+class UserSummaryView(ManageUserSummaryView):
+    permission_classes = (IsAdminUser,)
+
+    def get_user_id(self):
+        return self.kwargs["pk"]
+
+    def get_object(self):
+        summary = super().get_object()
+        if summary._state.adding:
+            get_object_or_404(get_user_model(), pk=summary.user_id)
+
+        return summary